@@ -0,0 +1,62 @@
+# ===================================================================
+#        ai_models.py (Gemini SDK / 모델 객체 지연 로드)
+# ===================================================================
+# google.generativeai 는 import 에만 0.8초 가까이 걸립니다. (grpc, protobuf 타입, IPython 등)
+# 모듈 로드 시점에 SDK 를 import 하고 모델을 만들면 로그인/대시보드만 처리하는 워커도
+# 매번 그 비용을 치르므로, GeminiModels 는 첫 generate_content 호출(또는 warm_up) 때
+# 한 번만(스레드 안전) SDK 를 import 하고 모델 객체를 만듭니다.
+# lazy(name) 이 돌려주는 LazyModel 은 GenerativeModel 처럼 generate_content 를 제공하므로
+# 기존 코드(요약, 연관 키워드, map-reduce 요약)는 그대로 사용할 수 있습니다.
+import threading
+
+
+class LazyModel:
+    def __init__(self, models, name):
+        self._models = models
+        self.name = name
+
+    def generate_content(self, *args, **kwargs):
+        return self._models.get(self.name).generate_content(*args, **kwargs)
+
+
+class GeminiModels:
+    def __init__(self, api_key, model_names, generation_config):
+        self.api_key = api_key
+        self.model_names = tuple(model_names)
+        self.generation_config = generation_config
+        self._models = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        import google.generativeai as genai
+        from google.generativeai.types import HarmCategory, HarmBlockThreshold
+
+        genai.configure(api_key=self.api_key)
+        safety_settings = {
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+        }
+        # GenerativeModel 은 첫 호출 때 grpc 클라이언트를 만들므로, fork 전에 만들어 두어도 안전합니다.
+        return {name: genai.GenerativeModel(name, generation_config=self.generation_config, safety_settings=safety_settings)
+                for name in self.model_names}
+
+    def get(self, name):
+        if self._models is None:
+            with self._lock:
+                if self._models is None:
+                    self._models = self._load()
+                    print("--- DEBUGGING AI --- Gemini AI 모델이 성공적으로 로드되었습니다.")
+        return self._models[name]
+
+    def lazy(self, name):
+        if name not in self.model_names: raise ValueError(f"알 수 없는 모델입니다: {name}")
+        return LazyModel(self, name)
+
+    def warm_up(self):
+        # 실패해도 앱은 뜨도록 로그만 남깁니다. (다음 호출 때 다시 시도)
+        try:
+            self.get(self.model_names[0])
+        except Exception as e:
+            print(f"--- DEBUGGING AI --- Gemini 모델 로드 실패: {e}")
@@ -6,24 +6,48 @@ load_dotenv(verbose=True, override=True)
 
 import os
 import json
+import functools
 import hashlib
+import hmac
 import re
+import tempfile
+import threading
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime, timezone, timedelta
 
-import isodate
-import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
-from flask import Flask, request, jsonify, render_template, redirect, url_for
+import click
+from cachetools import TTLCache
+from flask import Flask, Response, request, jsonify, render_template, redirect, url_for, has_request_context, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_login import LoginManager, UserMixin, login_user, logout_user, current_user, login_required
 from flask_migrate import Migrate
+from sqlalchemy import and_, event, or_
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only, make_transient_to_detached
+
+from ai_models import GeminiModels
+from cache_store import EntityStore, KeyValueCache, chunked
+from channel_sync import ChannelSyncer
+from job_queue import JobQueue, JobLimitExceeded
+from json_codec import CompressedJSONText, FastJSONProvider, JSONBody, dumps_bytes, loads as json_loads
+from keywords import KEYWORD_CACHE_VERSION, build_keyword_prompt, normalize_query, parse_keyword_response
+from metrics import COUNT_BUCKETS, DEFAULT_METRICS_DIR, Metrics
+from search_metrics import apply_search_filters
+from project_refresh import ProjectRefresher
+from quota import QuotaLedger, QuotaScheduler, quota_cost
+from single_flight import SingleFlight, default_lock_dir
+from summarizer import IncrementalSummaryHtml, MapReduceSummarizer
+from view_sampler import ViewSampler
+from youtube_client import YouTubeClientManager
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # ▼▼▼ [신규] jsonify / get_json 에 orjson 사용 ▼▼▼
 CORS(app)
 
 # ==========================================================
@@ -51,12 +75,25 @@ def unauthorized():
 # 블록 2: 데이터베이스 모델
 # ==========================================================
 class Project(db.Model):
+    # ▼▼▼ [신규] 대시보드 목록의 키셋 페이지네이션용 (user_id, created_at) 인덱스 ▼▼▼
+    __table_args__ = (db.Index('ix_project_user_id_created_at', 'user_id', 'created_at'),)
     id = db.Column(db.Integer, primary_key=True)
     project_name = db.Column(db.String(100), nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
-    search_params_json = db.Column(db.Text, nullable=False)
+    # ▼▼▼ [수정] JSON 컬럼은 바이너리로 저장하고 gzip 압축 (1KB 미만은 압축하지 않음, 읽고 쓰는 값은 그대로 JSON 문자열) ▼▼▼
+    search_params_json = db.Column(CompressedJSONText, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    search_results_json = db.Column(db.Text, nullable=True)
+    search_results_json = db.Column(CompressedJSONText, nullable=True)
+    # ▼▼▼ [신규] 통계만 새로고침한 시각과 새로고침마다 남는 변화량 스냅샷 ▼▼▼
+    refreshed_at = db.Column(db.DateTime, nullable=True)
+    snapshots = db.relationship('ProjectSnapshot', backref='project', lazy='dynamic', cascade="all, delete-orphan")
+
+class ProjectSnapshot(db.Model):
+    __table_args__ = (db.Index('ix_project_snapshot_project_id_created_at', 'project_id', 'created_at'),)
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    delta_json = db.Column(CompressedJSONText, nullable=False)  # 직전 값과의 차이 (project_refresh.py 참고)
 
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
@@ -68,51 +105,518 @@ class User(db.Model, UserMixin):
 class SearchCache(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     search_hash = db.Column(db.String(64), unique=True, nullable=False, index=True)
-    results_json = db.Column(db.Text, nullable=False)
+    results_json = db.Column(CompressedJSONText, nullable=False)  # ▼▼▼ [수정] gzip 압축 저장 ▼▼▼
     created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
 
 class VideoViewStats(db.Model):
+    # ▼▼▼ [수정] 영상별 시계열 조회가 대부분이므로 (video_id, timestamp) 복합 인덱스 사용 ▼▼▼
+    __table_args__ = (db.Index('ix_video_view_stats_video_id_timestamp', 'video_id', 'timestamp'),)
     id = db.Column(db.Integer, primary_key=True)
-    video_id = db.Column(db.String(20), nullable=False, index=True)
+    video_id = db.Column(db.String(20), nullable=False)
     timestamp = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     view_count = db.Column(db.BigInteger)
 
+# ▼▼▼ [신규] 조회수 표본 수집 대상 (검색 결과 / 저장된 프로젝트에 등장한 영상) ▼▼▼
+class TrackedVideo(db.Model):
+    video_id = db.Column(db.String(20), primary_key=True)
+    source = db.Column(db.String(10), nullable=False, default='search')  # 'search' 또는 'project'
+    first_seen_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    last_seen_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+    last_sampled_at = db.Column(db.DateTime, nullable=True, index=True)
+
+# ▼▼▼ [신규] 영상/채널 단위 메타데이터 캐시 (EntityStore 가 사용) ▼▼▼
+class VideoDetailsCache(db.Model):
+    entity_id = db.Column(db.String(20), primary_key=True)  # videoId
+    payload_json = db.Column(db.Text, nullable=False)
+    fetched_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+class ChannelStatsCache(db.Model):
+    entity_id = db.Column(db.String(40), primary_key=True)  # channelId
+    payload_json = db.Column(db.Text, nullable=False)
+    fetched_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+# ▼▼▼ [신규] YouTube API 쿼터 사용 장부 (호출 1건당 1행) ▼▼▼
+class QuotaUsage(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True, index=True)
+    endpoint = db.Column(db.String(40), nullable=False)
+    units = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+
+# ▼▼▼ [신규] Gemini 요약 결과 캐시 (전처리된 스크립트 + 프롬프트 + 모델 이름의 해시를 키로 사용) ▼▼▼
+class SummaryCache(db.Model):
+    cache_key = db.Column(db.String(64), primary_key=True)
+    payload_json = db.Column(CompressedJSONText, nullable=False)
+    size_bytes = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+    accessed_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+
+# ▼▼▼ [신규] 연관 키워드 결과 캐시 ((정규화된 검색어, 대상 언어)의 해시를 키로 사용) ▼▼▼
+class KeywordCache(db.Model):
+    cache_key = db.Column(db.String(64), primary_key=True)
+    payload_json = db.Column(CompressedJSONText, nullable=False)
+    size_bytes = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+    accessed_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+
+# ▼▼▼ [신규] 채널 모드: 입력(핸들/채널명)→채널 ID 변환 결과와 채널별 업로드 동기화 커서 (ChannelSyncer 가 사용) ▼▼▼
+class ChannelAlias(db.Model):
+    alias = db.Column(db.String(200), primary_key=True)  # 'handle:@name' 또는 'name:채널명'
+    channel_id = db.Column(db.String(40), nullable=False)
+    resolved_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+class ChannelUploads(db.Model):
+    channel_id = db.Column(db.String(40), primary_key=True)
+    uploads_playlist_id = db.Column(db.String(40), nullable=False)
+    items_json = db.Column(CompressedJSONText, nullable=False)  # 최신순 업로드 목록 (search.list 항목 모양)
+    latest_video_id = db.Column(db.String(20), nullable=True)  # 커서: 마지막 동기화 때 가장 최근 업로드
+    backfill_page_token = db.Column(db.String(100), nullable=True)  # 더 오래된 업로드를 이어 읽을 위치
+    history_complete = db.Column(db.Boolean, nullable=False, default=False)
+    synced_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+    requested_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+
+# ▼▼▼ [수정] 로그인 사용자 정보는 짧은 TTL 로 프로세스 메모리에 캐시 (API 요청마다 User 를 SELECT 하지 않음) ▼▼▼
+# 요청 안에서는 Flask-Login 이 current_user 를 한 번만 만들어 g 에 두므로, 여기서는 요청 간 캐시만 둡니다.
+# 캐시에는 id/username/email 값만 두고, 요청마다 그 값으로 만든 User 를 현재 세션에 조회 없이 붙입니다(merge, load=False).
+# 그래서 current_user.projects 같은 관계나 캐시에 없는 컬럼도 평소처럼 (필요할 때 조회해서) 읽을 수 있습니다.
+# 로그아웃하거나 User 행이 수정/삭제되면(ORM 변경과 update()/delete() 문 모두) 이 프로세스의 캐시는 바로 지우고,
+# 다른 워커는 TTL 안에 반영됩니다.
+USER_IDENTITY_FIELDS = ('id', 'username', 'email')
+user_identity_cache = TTLCache(maxsize=10000, ttl=int(os.environ.get('USER_CACHE_SECONDS', 60)))
+user_identity_lock = threading.Lock()
+
+def forget_user_identity(user_id):
+    with user_identity_lock:
+        user_identity_cache.pop(int(user_id), None)
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_user_identity(mapper, connection, target):
+    forget_user_identity(target.id)
+
+@event.listens_for(Session, 'do_orm_execute')
+def invalidate_user_identities_on_bulk_write(orm_execute_state):
+    # User.query.filter(...).update(...) 처럼 객체를 거치지 않는 변경은 어떤 행인지 모르므로 전부 지웁니다.
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper is User.__mapper__:
+        with user_identity_lock:
+            user_identity_cache.clear()
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    with user_identity_lock:
+        identity = user_identity_cache.get(user_id)
+    if identity is None:
+        user = db.session.get(User, user_id)
+        if user is not None:
+            with user_identity_lock:
+                user_identity_cache[user_id] = {field: getattr(user, field) for field in USER_IDENTITY_FIELDS}
+        return user
+    user = User(**identity)
+    make_transient_to_detached(user)  # 조회 없이 "이미 읽어 온" 상태로 표시
+    return db.session.merge(user, load=False)  # 현재 세션에 붙여 관계(projects 등)도 지연 로딩되도록
 
 # ==========================================================
 # 블록 3: API 키 및 AI 모델 설정
 # ==========================================================
 YOUTUBE_API_KEY = os.environ.get('YOUTUBE_API_KEY')
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
-gemini_pro_model = None
-gemini_flash_model = None
+# ▼▼▼ [수정] Gemini SDK import 와 모델 생성은 첫 호출 때 한 번만 (워커 기동 시간 단축, ai_models.py 참고) ▼▼▼
+gemini_models = GeminiModels(GEMINI_API_KEY, ('gemini-pro-latest', 'gemini-flash-latest'), generation_config={"temperature": 0.7})
+generation_config = gemini_models.generation_config if GEMINI_API_KEY else None
+gemini_pro_model = gemini_models.lazy('gemini-pro-latest') if GEMINI_API_KEY else None
+gemini_flash_model = gemini_models.lazy('gemini-flash-latest') if GEMINI_API_KEY else None
 
-if GEMINI_API_KEY:
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        generation_config = {"temperature": 0.7}
-        safety_settings = {
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-        }
-        # ▼▼▼ [수정] 사용 가능한 모델 목록에 있는 'gemini-pro-latest'와 'gemini-flash-latest'로 지정 ▼▼▼
-        gemini_pro_model = genai.GenerativeModel("gemini-pro-latest", generation_config=generation_config, safety_settings=safety_settings)
-        gemini_flash_model = genai.GenerativeModel("gemini-flash-latest", generation_config=generation_config, safety_settings=safety_settings)
-        print("--- DEBUGGING AI --- Gemini AI 모델이 성공적으로 로드되었습니다.")
-    except Exception as e:
-        print(f"--- DEBUGGING AI --- Gemini 모델 로드 실패: {e}")
+# ▼▼▼ [신규] YouTube 서비스 객체는 프로세스당 한 번만 만들고, 커넥션은 스레드별로 재사용 ▼▼▼
+youtube_clients = YouTubeClientManager(
+    YOUTUBE_API_KEY,
+    max_workers=int(os.environ.get('YOUTUBE_MAX_WORKERS', 8)),
+    call_timeout=float(os.environ.get('YOUTUBE_CALL_TIMEOUT', 15)),
+)
+
+# ▼▼▼ [신규] 조회수는 빨리 변하고 구독자 수는 천천히 변하므로 TTL 을 따로 둡니다. ▼▼▼
+video_details_store = EntityStore(db, VideoDetailsCache, ttl_seconds=int(os.environ.get('VIDEO_DETAILS_TTL_MINUTES', 20)) * 60)
+channel_stats_store = EntityStore(db, ChannelStatsCache, ttl_seconds=int(os.environ.get('CHANNEL_STATS_TTL_HOURS', 24)) * 3600)
+
+# ▼▼▼ [신규] 같은 영상 스크립트를 같은 프롬프트/모델로 다시 요약하면 캐시된 결과를 사용 ▼▼▼
+summary_cache = KeyValueCache(
+    db, SummaryCache,
+    ttl_seconds=int(os.environ.get('SUMMARY_CACHE_TTL_DAYS', 30)) * 86400,
+    lru_bytes=int(os.environ.get('SUMMARY_CACHE_LRU_MB', 16)) * 1024 * 1024,
+    max_db_bytes=int(os.environ.get('SUMMARY_CACHE_MAX_MB', 256)) * 1024 * 1024,
+)
+
+# ▼▼▼ [신규] 인기 검색어의 연관 키워드는 하루 동안 재사용, 번역 결과는 프로세스 안에서 더 오래 기억 ▼▼▼
+keyword_cache = KeyValueCache(
+    db, KeywordCache,
+    ttl_seconds=int(os.environ.get('KEYWORD_CACHE_TTL_HOURS', 24)) * 3600,
+    lru_bytes=4 * 1024 * 1024, max_db_bytes=64 * 1024 * 1024,
+)
+translation_memo = TTLCache(maxsize=5000, ttl=7 * 86400)
+translation_memo_lock = threading.Lock()
+
+# ▼▼▼ [신규] 동일 검색 동시 요청 병합 (워커 간에는 파일 잠금 사용) ▼▼▼
+search_flights = SingleFlight(lock_dir=default_lock_dir())
+
+# ▼▼▼ [신규] YouTube 쿼터 장부와 예산 스케줄러 (기본값은 프로젝트 기본 할당량 10,000 units/일) ▼▼▼
+quota_ledger = QuotaLedger(db, QuotaUsage)
+quota_scheduler = QuotaScheduler(
+    quota_ledger,
+    daily_budget=int(os.environ.get('YOUTUBE_DAILY_QUOTA', 10000)),
+    user_daily_budget=int(os.environ.get('YOUTUBE_USER_DAILY_QUOTA', 2000)),
+    processes=int(os.environ.get('WEB_CONCURRENCY', 1)),  # gunicorn 워커 수 (토큰 버킷은 워커마다 따로 있음)
+)
+
+# ▼▼▼ [신규] 채널 모드 증분 동기화 (업로드 재생목록을 playlistItems.list 로 읽음, 페이지당 1 unit) ▼▼▼
+channel_syncer = ChannelSyncer(
+    db, ChannelAlias, ChannelUploads, youtube_clients,
+    min_sync_interval=int(os.environ.get('CHANNEL_SYNC_INTERVAL_MINUTES', 10)) * 60,
+    initial_items=int(os.environ.get('CHANNEL_SYNC_INITIAL_ITEMS', 200)),
+    max_items=int(os.environ.get('CHANNEL_SYNC_MAX_ITEMS', 1000)),
+)
+
+# ▼▼▼ [신규] 저장된 프로젝트의 통계만 새로고침 (검색을 다시 하지 않고 videos/channels.list 만, 50개당 1 unit) ▼▼▼
+project_refresher = ProjectRefresher(
+    db, Project, ProjectSnapshot, youtube_clients, channel_stats_store=channel_stats_store,
+    batch_size=int(os.environ.get('PROJECT_REFRESH_BATCH_SIZE', 50)),
+)
+
+# ▼▼▼ [신규] 조회수 표본 수집기 (`flask sample-views` 또는 VIEW_SAMPLER_ENABLED=1 로 실행) ▼▼▼
+view_sampler = ViewSampler(
+    app, db, VideoViewStats, TrackedVideo, youtube_clients, quota_scheduler,
+    interval_seconds=int(os.environ.get('VIEW_SAMPLER_INTERVAL_MINUTES', 30)) * 60,
+)
+project_refresher.on_view_counts = view_sampler.record_samples  # 새로고침으로 받은 조회수도 표본으로 남김
+
+# ▼▼▼ [신규] 긴 스크립트는 flash 모델로 구간별 요약(map)을 먼저 만들고, 구간 요약은 summary_cache 에 함께 저장 ▼▼▼
+summary_map_reduce = MapReduceSummarizer(
+    gemini_flash_model, 'gemini-flash-latest', chunk_cache=summary_cache,
+    chunk_tokens=int(os.environ.get('SUMMARY_CHUNK_TOKENS', 8000)),
+    max_workers=int(os.environ.get('SUMMARY_MAP_WORKERS', 4)),
+)
+
+# ▼▼▼ [신규] AI 작업 큐 (같은 서버의 워커들이 로컬 SQLite 파일을 브로커로 공유) ▼▼▼
+job_queue = JobQueue(
+    os.environ.get('JOB_QUEUE_PATH', os.path.join(tempfile.gettempdir(), 'benchly-jobs.db')),
+    context_factory=app.app_context,
+    max_workers=int(os.environ.get('JOB_WORKERS', 4)),
+    max_active_per_user=int(os.environ.get('JOB_MAX_ACTIVE_PER_USER', 5)),
+    max_running_per_user=int(os.environ.get('JOB_MAX_RUNNING_PER_USER', 2)),
+)
+# 롱폴링은 기다리는 동안 요청 스레드를 붙잡으므로 짧게만 허용하고, 브라우저가 간격을 늘려 가며 다시 조회합니다.
+JOB_MAX_WAIT_SECONDS = 2
+
+# ▼▼▼ [신규] 지표: 단계별 시간 / 캐시 적중 / 쿼터 / 오류 (워커마다 METRICS_DIR 에 파일로 남기고 /metrics 에서 합산) ▼▼▼
+# 배포할 때 `flask reset-metrics` 로 이전 실행의 파일을 지웁니다.
+metrics = Metrics(
+    os.environ.get('METRICS_DIR', DEFAULT_METRICS_DIR),
+    flush_interval=int(os.environ.get('METRICS_FLUSH_SECONDS', 5)),
+)
+metrics.describe('benchly_requests_total', '응답 수 (route, method, status 별)')
+metrics.describe('benchly_request_seconds', '요청 처리 시간(초)')
+metrics.describe('benchly_stage_seconds', '요청 안의 단계별 처리 시간(초): 캐시 조회, YouTube/Gemini 호출, 후처리, commit')
+metrics.describe('benchly_db_queries_per_request', '요청 하나가 실행한 SQL 문 수', buckets=COUNT_BUCKETS)
+metrics.describe('benchly_cache_requests_total', '캐시 조회 수 (cache, result=hit|miss 별)')
+metrics.describe('benchly_youtube_quota_units_total', '사용한 YouTube API 쿼터 (endpoint 별)')
+metrics.describe('benchly_errors_total', '오류 수 (kind 별)')
+SLOW_REQUEST_SECONDS = float(os.environ.get('SLOW_REQUEST_SECONDS', 2))
+
+event.listen(Engine, 'before_cursor_execute', metrics.count_query)
+youtube_clients.on_timing = metrics.record_stage  # 'youtube.search.list' 같은 methodId 가 단계 이름
         
 # ==========================================================
 # 블록 4: 헬퍼 함수
 # ==========================================================
+# ▼▼▼ [수정] YouTube API 로 전달되는 조건만 캐시 키에 포함 (minViews 등 필터는 제외) ▼▼▼
+SEARCH_API_PARAM_KEYS = ('searchType', 'query', 'region', 'maxResults', 'sortOrder', 'language', 'period')
+SEARCH_CACHE_VERSION = 2  # 캐시에 필터 적용 전 원본 목록을 저장하도록 바뀐 버전
+
 def create_search_hash(params):
-    sorted_params_string = json.dumps(params, sort_keys=True)
+    api_params = {key: params.get(key) for key in SEARCH_API_PARAM_KEYS}
+    api_params['_v'] = SEARCH_CACHE_VERSION
+    sorted_params_string = json.dumps(api_params, sort_keys=True)
     return hashlib.sha256(sorted_params_string.encode('utf-8')).hexdigest()
 
+# ▼▼▼ [신규] videos.list 와 channels.list 를 동시에 실행하는 보강(enrichment) 단계 ▼▼▼
+# 채널 ID 는 검색 스니펫에 이미 들어 있으므로 영상 상세 응답을 기다리지 않고 바로 요청합니다.
+# 영상/채널 캐시에 없거나 TTL 이 지난 ID 만 50개씩 묶어서 API 로 조회합니다.
+def slim_video_details(item):
+    # 캐시에 저장할 필드만 남깁니다. (description 등 큰 필드 제외)
+    snippet = item.get('snippet', {})
+    return {
+        'snippet': {'channelId': snippet.get('channelId'), 'thumbnails': snippet.get('thumbnails', {})},
+        'statistics': item.get('statistics', {}),
+        'contentDetails': {key: value for key, value in item.get('contentDetails', {}).items() if key in ('duration', 'caption')},
+        'status': {'madeForKids': item.get('status', {}).get('madeForKids', False)},
+    }
+
+def start_channel_stats_fetch(youtube, channel_ids):
+    cached, missing = channel_stats_store.get_many(channel_ids)
+    futures = [youtube_clients.submit(youtube.channels().list(part='statistics', id=','.join(batch)))
+               for batch in chunked(missing)]
+    return list(channel_ids), cached, futures
+
+def finish_channel_stats_fetch(pending_channel_stats):
+    _, channel_stats, futures = pending_channel_stats
+    fetched = {}
+    for future in futures:
+        fetched.update({item['id']: item['statistics'] for item in youtube_clients.result(future).get('items', [])})
+    channel_stats_store.put_many(fetched)
+    return {**channel_stats, **fetched}
+
+def fetch_enrichment(youtube, search_items, pending_channel_stats=None):
+    video_ids = [item['id']['videoId'] for item in search_items if 'videoId' in item.get('id', {})]
+    if pending_channel_stats is None:
+        known_channel_ids = dict.fromkeys(item['snippet']['channelId'] for item in search_items if 'videoId' in item.get('id', {}))
+        pending_channel_stats = start_channel_stats_fetch(youtube, known_channel_ids)
+
+    video_details, missing_video_ids = video_details_store.get_many(video_ids)
+    video_futures = [youtube_clients.submit(youtube.videos().list(part='statistics,contentDetails,status,snippet', id=','.join(batch)))
+                     for batch in chunked(missing_video_ids)]
+
+    fetched_videos = {}
+    for future in video_futures:
+        fetched_videos.update({item['id']: slim_video_details(item) for item in youtube_clients.result(future).get('items', [])})
+    video_details_store.put_many(fetched_videos)
+    video_details.update(fetched_videos)
+    # 새로 받아온 조회수는 추가 쿼터 없이 그대로 조회수 표본으로 남깁니다.
+    view_sampler.record_samples({video_id: details['statistics'].get('viewCount', 0) for video_id, details in fetched_videos.items()})
+    channel_stats = finish_channel_stats_fetch(pending_channel_stats)
+
+    # 스니펫과 상세 정보의 채널이 다른 드문 경우에만 한 번 더 조회합니다.
+    missing_channel_ids = {details['snippet']['channelId'] for details in video_details.values()} - set(pending_channel_stats[0])
+    if missing_channel_ids:
+        channel_stats.update(finish_channel_stats_fetch(start_channel_stats_fetch(youtube, missing_channel_ids)))
+    return video_details, channel_stats
+
+# ▼▼▼ [신규] YouTube 호출마다 쿼터 장부에 기록 (요청 스레드에서 호출됨) ▼▼▼
+def record_youtube_call(method_id):
+    endpoint, units = quota_cost(method_id)
+    metrics.inc('benchly_youtube_quota_units_total', units, endpoint=endpoint)
+    user_id = current_user.get_id() if has_request_context() and current_user.is_authenticated else None
+    quota_ledger.record(int(user_id) if user_id else None, endpoint, units)
+
+youtube_clients.on_call = record_youtube_call
+
+# 요청뿐 아니라 CLI 명령(sample-views, sync-channels 등), 백그라운드 작업/표본 수집 스레드도
+# 모두 app context 안에서 실행되므로, app context 가 끝날 때 장부를 DB 에 기록합니다.
+@app.teardown_appcontext
+def flush_quota_ledger(exc):
+    quota_ledger.flush()
+
+def consume_youtube_quota(user_id, units):
+    return quota_scheduler.try_consume(user_id, units)
+
+def requested_max_results(params):
+    # search.list 와 같은 범위(1~50, 기본 5)로 맞춥니다.
+    try:
+        return min(max(int(params.get('maxResults') or 5), 1), 50)
+    except (ValueError, TypeError):
+        return 5
+
+def estimate_search_cost(params):
+    # search.list 1회(100) + videos/channels.list(각 1)
+    # ▼▼▼ [수정] 채널 모드는 채널 ID 변환(처음 한 번) + 업로드 재생목록 페이지 수만큼 (보통 한 자릿수) ▼▼▼
+    if params.get('searchType') == 'channel':
+        return channel_syncer.estimate_cost(params.get('query'), requested_max_results(params))
+    return 102
+
+# ▼▼▼ [신규] 검색 캐시 조회/저장 ▼▼▼
+SEARCH_CACHE_DURATION = timedelta(hours=1)
+SEARCH_STALE_MAX_AGE = timedelta(hours=int(os.environ.get('SEARCH_STALE_MAX_AGE_HOURS', 24)))
+
+def load_cached_search_data(search_hash, max_age=SEARCH_CACHE_DURATION):
+    cached_result = SearchCache.query.filter_by(search_hash=search_hash).first()
+    if cached_result and (datetime.now(timezone.utc) - cached_result.created_at.replace(tzinfo=timezone.utc) < max_age):
+        return json_loads(cached_result.results_json)
+    return None
+
+def load_cached_search(search_hash, max_age=SEARCH_CACHE_DURATION):
+    cached_data = load_cached_search_data(search_hash, max_age)
+    return cached_data['items'] if cached_data is not None else None
+
+def store_search_cache(search_hash, raw_items, **extra):
+    # extra: 여러 페이지 검색의 nextPageToken 처럼 목록과 함께 저장할 값
+    results_json = dumps_bytes({'items': raw_items, **extra})
+    cached_result = SearchCache.query.filter_by(search_hash=search_hash).first()
+    if cached_result:
+        cached_result.results_json = results_json
+        cached_result.created_at = datetime.now(timezone.utc)
+    else:
+        db.session.add(SearchCache(search_hash=search_hash, results_json=results_json))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # 잠금을 공유하지 않는 다른 서버가 먼저 넣은 경우: 그 행을 갱신합니다.
+        db.session.rollback()
+        cached_result = SearchCache.query.filter_by(search_hash=search_hash).first()
+        cached_result.results_json = results_json
+        cached_result.created_at = datetime.now(timezone.utc)
+        db.session.commit()
+
+def load_or_fetch_search(search_hash, params, fetched=None):
+    # 잠금을 기다리는 동안 다른 워커가 캐시를 채웠을 수 있으므로 새 트랜잭션에서 다시 확인합니다.
+    # fetched(list) 를 넘기면 실제로 YouTube 를 호출했을 때 True 를 넣어 줍니다. (쿼터 정산용)
+    db.session.rollback()
+    raw_items = load_cached_search(search_hash)
+    if raw_items is not None: return raw_items
+    if fetched is not None: fetched.append(True)
+    raw_items = fetch_raw_search_items(params)
+    # 결과가 없는 검색도 저장해 둡니다. (잠금을 기다린 다른 워커가 같은 검색으로 쿼터를 다시 쓰지 않도록)
+    with metrics.stage('search.commit'):
+        if raw_items: view_sampler.track([raw['videoId'] for raw in raw_items], source='search')
+        store_search_cache(search_hash, raw_items)
+    return raw_items
+
+# ▼▼▼ [신규] 직렬화된 JSON 바이트를 그대로 응답 (클라이언트가 지원하면 gzip) ▼▼▼
+# 같은 조건(필터 포함)의 검색 응답은 짧은 시간 동안 직렬화된 바이트째로 재사용합니다.
+RESPONSE_GZIP_MIN_BYTES = 1024
+RESPONSE_CACHE_SECONDS = int(os.environ.get('RESPONSE_CACHE_SECONDS', 60))
+response_cache = TTLCache(maxsize=256, ttl=RESPONSE_CACHE_SECONDS)
+response_cache_lock = threading.Lock()
+
+def send_json(body, status=200):
+    if not isinstance(body, JSONBody): body = JSONBody(body if isinstance(body, bytes) else dumps_bytes(body))
+    use_gzip = len(body.raw) >= RESPONSE_GZIP_MIN_BYTES and request.accept_encodings['gzip'] > 0
+    response = app.response_class(body.gzip() if use_gzip else body.raw, status=status, mimetype='application/json')
+    if use_gzip: response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def create_response_key(params):
+    return hashlib.sha256(dumps_bytes({'params': params, '_v': SEARCH_CACHE_VERSION})).hexdigest()
+
+def get_cached_response(response_key):
+    with response_cache_lock:
+        return response_cache.get(response_key)
+
+def cache_response(response_key, data):
+    body = JSONBody(dumps_bytes(data))
+    with response_cache_lock:
+        response_cache[response_key] = body
+    return body
+
+# ▼▼▼ [신규] 필터 적용 후, 통과한 영상에 대해서만 최근 조회수 증가량(1h/24h/7d)을 붙입니다 ▼▼▼
+VELOCITY_FILTERS = (('minViews1h', 'views1h'), ('minViews24h', 'views24h'), ('minViews7d', 'views7d'))
+
+def build_search_results(raw_items, params, velocity=None):
+    # velocity 를 넘기면(배치 검색에서 한 번에 조회한 값) 다시 조회하지 않습니다.
+    results = apply_search_filters(raw_items, params)
+    if not results: return results
+    if velocity is None:
+        velocity = view_sampler.velocity([video['videoId'] for video in results])
+    empty_velocity = {'views1h': None, 'views24h': None, 'views7d': None, 'acceleration': None}
+    for video in results:
+        video.update(velocity.get(video['videoId'], empty_velocity))
+
+    for param_key, field in VELOCITY_FILTERS:
+        try:
+            minimum = int(params.get(param_key) or 0)
+        except (ValueError, TypeError):
+            continue
+        # 표본이 아직 없는 영상(None)은 판단할 수 없으므로 제외하지 않습니다.
+        if minimum > 0:
+            results = [video for video in results if video[field] is None or video[field] >= minimum]
+    return results
+
+# ▼▼▼ [신규] YouTube API 호출 + 보강까지만 수행하고, 필터를 적용하지 않은 원본 목록을 반환 ▼▼▼
+def build_search_api_params(params):
+    search_api_params = {
+        'part': 'snippet', 'type': 'video',
+        'regionCode': params.get('region'), 'maxResults': params.get('maxResults'),
+        'order': params.get('sortOrder', 'relevance'),
+        'relevanceLanguage': params.get('language', 'ko')
+    }
+    if params.get('searchType') != 'channel':
+        search_api_params['q'] = params.get('query')
+        if params.get('period'):
+            try:
+                days = int(params.get('period'))
+                if days > 0:
+                    search_api_params['publishedAfter'] = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+            except (ValueError, TypeError): pass 
+    return search_api_params
+
+def fetch_raw_search_items(params):
+    youtube = youtube_clients.get_service()
+
+    pending_channel_stats = None
+
+    if params.get('searchType') == 'channel':
+        # ▼▼▼ [수정] search.list(order=date) 대신 저장된 채널 ID 와 업로드 재생목록의 새 업로드만 사용 ▼▼▼
+        target_channel_id = channel_syncer.resolve(params.get('query'))
+        if not target_channel_id: return []
+        # 채널 통계는 업로드 목록을 기다릴 필요가 없으므로 동시에 요청
+        pending_channel_stats = start_channel_stats_fetch(youtube, [target_channel_id])
+        max_results = requested_max_results(params)
+        search_items = channel_syncer.sync(target_channel_id, min_items=max_results)[:max_results]
+    else:
+        search_response = youtube_clients.execute(youtube.search().list(**build_search_api_params(params)))
+        search_items = [item for item in search_response.get('items', []) if 'videoId' in item.get('id', {})]
+    if not search_items: return []
+
+    video_details, channel_stats = fetch_enrichment(youtube, search_items, pending_channel_stats)
+    return build_raw_items(search_items, video_details, channel_stats)
+
+# ▼▼▼ [신규] 여러 검색어를 한 번에: search.list 는 동시에, 보강은 전체 영상/채널 ID 를 합쳐 최소 배치로 ▼▼▼
+def fetch_raw_search_batch(query_params):
+    # {검색어: params} → {검색어: 필터 적용 전 원본 목록}
+    youtube = youtube_clients.get_service()
+    futures = {query: youtube_clients.submit(youtube.search().list(**build_search_api_params(params)))
+               for query, params in query_params.items()}
+    search_items_by_query = {}
+    for query, future in futures.items():
+        search_items_by_query[query] = [item for item in youtube_clients.result(future).get('items', []) if 'videoId' in item.get('id', {})]
+
+    all_search_items = [item for search_items in search_items_by_query.values() for item in search_items]
+    if not all_search_items: return {query: [] for query in query_params}
+    # fetch_enrichment 는 중복 ID 를 한 번만 조회하므로 여러 검색어에 겹친 영상/채널도 한 번씩만 요청됩니다.
+    video_details, channel_stats = fetch_enrichment(youtube, all_search_items)
+    return {query: build_raw_items(search_items, video_details, channel_stats) for query, search_items in search_items_by_query.items()}
+
+def merge_batch_results(results_by_query):
+    # 여러 검색어 결과를 videoId 로 합치고, 더 많은 검색어에 나온 영상 → ratio 높은 영상 순으로 정렬합니다.
+    merged = {}
+    for query, results in results_by_query.items():
+        for video in results:
+            entry = merged.get(video['videoId'])
+            if entry is None:
+                entry = merged[video['videoId']] = {**video, 'matchedQueries': []}
+            entry['matchedQueries'].append(query)
+    return sorted(merged.values(), key=lambda video: (len(video['matchedQueries']), video['ratio']), reverse=True)
+
+def build_raw_items(search_items, video_details, channel_stats):
+    raw_items = []
+    for item in search_items:
+        video_id = item['id']['videoId']
+        if video_id not in video_details: continue
+        channel_id = item['snippet']['channelId']
+        details = video_details[video_id]
+        stats = details.get('statistics', {})
+        content_details = details.get('contentDetails', {})
+        thumbnails = details.get('snippet', {}).get('thumbnails', {})
+        raw_items.append({
+            'videoId': video_id, 'channelId': channel_id, 'title': item['snippet']['title'],
+            'channelTitle': item['snippet']['channelTitle'], 'publishedAt': item['snippet']['publishedAt'],
+            'thumbnail': thumbnails.get('high', thumbnails.get('medium', thumbnails.get('default', {}))).get('url', ''),
+            'viewCount': int(stats.get('viewCount', 0)), 'likeCount': int(stats.get('likeCount', 0)),
+            'subscriberCount': int(channel_stats.get(channel_id, {}).get('subscriberCount', 0)),
+            'madeForKids': details.get('status', {}).get('madeForKids', False),
+            'duration': content_details.get('duration', 'PT0S'),
+            'captionAvailable': content_details.get('caption', 'false') == 'true'
+        })
+    return raw_items
+
+# ▼▼▼ [신규] 대시보드 키셋 페이지네이션 커서 ("created_at ISO 문자열_id") ▼▼▼
+DASHBOARD_PAGE_SIZE = int(os.environ.get('DASHBOARD_PAGE_SIZE', 20))
+
+def encode_project_cursor(project):
+    return f"{project.created_at.isoformat()}_{project.id}"
+
+def decode_project_cursor(cursor):
+    created_at, project_id = cursor.rsplit('_', 1)
+    return datetime.fromisoformat(created_at), int(project_id)
+
 def preprocess_script(script_text):
     if not script_text: return ""
     processed_text = re.sub(r'\[\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?\]', ' ', script_text)
@@ -120,6 +624,106 @@ def preprocess_script(script_text):
     processed_text = re.sub(r'</?.*?>', '', processed_text)
     return re.sub(r'\s+', ' ', processed_text).strip()
 
+# ▼▼▼ [신규] /api/get_summary 와 스트리밍 버전이 함께 쓰는 요청 검증/프롬프트 ▼▼▼
+ALLOWED_SUMMARY_MODELS = ('gemini-flash-latest', 'gemini-pro-latest')
+
+def parse_summary_request():
+    # ((전처리된 스크립트, 프롬프트, 모델 이름), None) 또는 (None, 오류 응답)
+    if not generation_config:
+        return None, (jsonify({"success": False, "error": "AI 모델 공용 설정이 로드되지 않았습니다."}), 500)
+
+    data = request.get_json()
+    transcript = data.get('transcript')
+    user_prompt = data.get('prompt')
+    selected_model = data.get('model')
+
+    if not transcript or not user_prompt or not selected_model:
+        return None, (jsonify({"success": False, "error": "스크립트, 프롬프트, 모델 이름이 모두 필요합니다."}), 400)
+    if selected_model not in ALLOWED_SUMMARY_MODELS:
+        return None, (jsonify({"success": False, "error": f"허용되지 않은 모델입니다. 전송된 값: {selected_model}"}), 400)
+    return (preprocess_script(transcript), user_prompt, selected_model), None
+
+def summary_model(selected_model):
+    return gemini_flash_model if selected_model == 'gemini-flash-latest' else gemini_pro_model
+
+def build_summary_prompt(user_prompt, cleaned_script):
+    # ▼▼▼ [신규] 토큰 예산을 넘는 스크립트는 구간 요약들로 최종(reduce) 프롬프트를 구성 ▼▼▼
+    if summary_map_reduce.map_model is not None and summary_map_reduce.needs_map_reduce(cleaned_script):
+        reduce_prompt = summary_map_reduce.prepare_prompt(cleaned_script, user_prompt)
+        db.session.commit()  # 최종 요약이 실패해도 구간 요약 캐시는 남김
+        return reduce_prompt
+    return f"{user_prompt}\n\n--- 분석할 스크립트 시작 ---\n{cleaned_script}\n--- 분석할 스크립트 끝 ---"
+
+SUMMARY_CACHE_VERSION = 1  # HTML 변환 방식 등 결과 형식이 바뀌면 올립니다.
+
+def create_summary_key(cleaned_script, user_prompt, model_name):
+    key_source = '\0'.join((str(SUMMARY_CACHE_VERSION), model_name, user_prompt, cleaned_script))
+    return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+# ▼▼▼ [신규] 요약 생성 (작업 큐의 summary 작업) → (summary_html, 캐시 사용 여부) ▼▼▼
+# 스트리밍으로 생성하면서, on_progress 를 넘기면 지금까지 만든 HTML 을 SUMMARY_PROGRESS_INTERVAL 마다 전달합니다.
+SUMMARY_PROGRESS_INTERVAL = 0.5
+
+def generate_summary(cleaned_script, user_prompt, selected_model, on_progress=None):
+    # 같은 스크립트/프롬프트/모델 조합이면 Gemini 를 다시 호출하지 않음
+    summary_key = create_summary_key(cleaned_script, user_prompt, selected_model)
+    cached_summary = summary_cache.get(summary_key)
+    metrics.cache_result('summary', cached_summary is not None)
+    if cached_summary is not None:
+        db.session.commit()  # accessed_at 갱신
+        print("✅ [Summary Cache Hit!] 저장된 AI 분석 결과를 반환합니다.")
+        return cached_summary['summary_html'], True
+
+    with metrics.stage('summary.prompt'):  # 긴 스크립트는 구간 요약(map) Gemini 호출 포함
+        prompt = build_summary_prompt(user_prompt, cleaned_script)
+    with metrics.stage(f'gemini.summary.{selected_model}'):
+        converter, last_report = IncrementalSummaryHtml(), time.monotonic()
+        for chunk in summary_model(selected_model).generate_content(prompt, stream=True):
+            converter.feed(stream_chunk_text(chunk))
+            if on_progress is not None and time.monotonic() - last_report >= SUMMARY_PROGRESS_INTERVAL:
+                last_report = time.monotonic()
+                on_progress(converter.html)
+        converter.close()
+        html_response = converter.html
+    if html_response.strip():
+        summary_cache.put(summary_key, {'summary_html': html_response})
+        db.session.commit()
+    return html_response, False
+
+# ▼▼▼ [수정] 연관 키워드 생성: 번역 + 키워드를 JSON 응답 한 번으로 받고, 결과는 keyword_cache 에 저장 ▼▼▼
+# (/api/get_related_keywords 와 작업 큐가 함께 사용)
+KEYWORD_GENERATION_CONFIG = {"temperature": 0.7, "response_mime_type": "application/json"}
+
+def create_keyword_key(query, target_lang):
+    key_source = f"{KEYWORD_CACHE_VERSION}\0{target_lang}\0{normalize_query(query)}"
+    return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+def generate_related_keywords(query, target_lang):
+    cache_key = create_keyword_key(query, target_lang)
+    cached_keywords = keyword_cache.get(cache_key)
+    metrics.cache_result('keywords', cached_keywords is not None)
+    if cached_keywords is not None:
+        db.session.commit()  # accessed_at 갱신
+        print(f"✅ [Keyword Cache Hit!] '{query}' ({target_lang}) 연관 키워드를 캐시에서 반환합니다.")
+        return {**cached_keywords, "cached": True}
+
+    memo_key = (target_lang, normalize_query(query))
+    with translation_memo_lock:
+        known_translation = translation_memo.get(memo_key)
+    with metrics.stage('gemini.keywords'):
+        response = gemini_flash_model.generate_content(build_keyword_prompt(query, target_lang, known_translation),
+                                                       generation_config=KEYWORD_GENERATION_CONFIG)
+    parsed = parse_keyword_response(response.text, fallback_query=known_translation or query)
+    translated_query = query if target_lang == 'ko' else parsed['translated_query']
+    with translation_memo_lock:
+        translation_memo[memo_key] = translated_query
+    print(f"--- AI 번역 --- 원본: {query} -> 번역({target_lang}): {translated_query}")
+
+    result = {"data": {"keywords": parsed['keywords']}, "translated_query": translated_query}
+    keyword_cache.put(cache_key, result)
+    db.session.commit()
+    return {**result, "cached": False}
+
 # ==========================================================
 # 블록 5: 핵심 라우트 (페이지) - 수정됨
 # ==========================================================
@@ -134,11 +738,24 @@ def home():
 @login_required 
 def dashboard():
     extension_id = os.environ.get('EXTENSION_ID')
-    projects = Project.query.filter_by(owner=current_user).order_by(Project.created_at.desc()).all()
+    cursor = request.args.get('cursor')
+    # ▼▼▼ [수정] 목록에는 이름/날짜만 필요하므로 큰 JSON 컬럼은 읽지 않고, 키셋 방식으로 페이지를 나눕니다. ▼▼▼
+    query = Project.query.options(load_only(Project.id, Project.project_name, Project.created_at, Project.refreshed_at)) \
+        .filter(Project.user_id == current_user.id)
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_project_cursor(cursor)
+            query = query.filter(or_(Project.created_at < cursor_created_at,
+                                     and_(Project.created_at == cursor_created_at, Project.id < cursor_id)))
+        except (ValueError, TypeError):
+            return redirect(url_for('dashboard'))
+    projects = query.order_by(Project.created_at.desc(), Project.id.desc()).limit(DASHBOARD_PAGE_SIZE + 1).all()
+    next_cursor = encode_project_cursor(projects[DASHBOARD_PAGE_SIZE - 1]) if len(projects) > DASHBOARD_PAGE_SIZE else None
+    projects = projects[:DASHBOARD_PAGE_SIZE]
     # 저장된 프로젝트가 없다면, 검색 페이지로 보냅니다.
-    if not projects:
+    if not projects and not cursor:
         return redirect(url_for('home'))
-    return render_template('dashboard.html', projects=projects, extension_id=extension_id)
+    return render_template('dashboard.html', projects=projects, extension_id=extension_id, next_cursor=next_cursor)
 
 @app.route('/login')
 def login_page():
@@ -155,6 +772,7 @@ def register_page():
 @app.route('/logout')
 @login_required 
 def logout():
+    forget_user_identity(current_user.id)
     logout_user()
     # ▼▼▼ [수정] 로그아웃 후 검색 페이지로 보냅니다. ▼▼▼
     return redirect(url_for('home'))
@@ -204,9 +822,11 @@ def save_project():
         project_name, search_params, search_results = data.get('projectName'), data.get('searchParams'), data.get('searchResults')
         if not project_name or not search_params or search_results is None:
             return jsonify({"success": False, "error": "프로젝트 이름, 검색 조건, 검색 결과가 모두 필요합니다."}), 400
-        search_params_string, search_results_string = json.dumps(search_params), json.dumps(search_results) 
-        new_project = Project(project_name=project_name, search_params_json=search_params_string, search_results_json=search_results_string, owner=current_user)
-        db.session.add(new_project); db.session.commit()
+        search_params_string, search_results_string = dumps_bytes(search_params), dumps_bytes(search_results)
+        new_project = Project(project_name=project_name, search_params_json=search_params_string, search_results_json=search_results_string, user_id=current_user.id)
+        db.session.add(new_project)
+        view_sampler.track([video.get('videoId') for video in search_results if isinstance(video, dict)], source='project')
+        db.session.commit()
         return jsonify({"success": True, "message": f"'{project_name}' 프로젝트가 저장되었습니다."})
     except Exception as e:
         db.session.rollback(); print(f"❌ /api/project/save Error: {e}")
@@ -216,10 +836,14 @@ def save_project():
 @login_required
 def get_project(project_id):
     try:
-        project = Project.query.get_or_404(project_id)
-        if project.owner.id != current_user.id:
-            return jsonify({"success": False, "error": "권한이 없습니다."}), 403
-        return jsonify({"success": True, "search_params_json": project.search_params_json, "search_results_json": project.search_results_json})
+        # ▼▼▼ [수정] 소유자 확인을 조회 조건에 포함 (owner 관계를 따로 읽지 않음, 남의 프로젝트는 없는 것과 같게 404) ▼▼▼
+        project = Project.query.filter_by(id=project_id, user_id=current_user.id).first()
+        if project is None:
+            return jsonify({"success": False, "error": "프로젝트를 찾을 수 없습니다."}), 404
+        # ▼▼▼ [수정] 저장된 JSON 문자열을 다시 감싸지 않고, 응답 본문에 그대로 이어 붙여 전송 ▼▼▼
+        body = b''.join((b'{"success":true,"search_params":', project.search_params_json.encode('utf-8'),
+                         b',"search_results":', (project.search_results_json or 'null').encode('utf-8'), b'}'))
+        return send_json(body)
     except Exception as e:
         print(f"❌ /api/project/get Error: {e}"); return jsonify({"success": False, "error": "프로젝트 로드 중 서버 오류 발생"}), 500
 
@@ -227,9 +851,9 @@ def get_project(project_id):
 @login_required
 def delete_project(project_id):
     try:
-        project_to_delete = Project.query.get_or_404(project_id)
-        if project_to_delete.owner.id != current_user.id:
-            return jsonify({"success": False, "error": "삭제 권한이 없습니다."}), 403 
+        project_to_delete = Project.query.filter_by(id=project_id, user_id=current_user.id).first()
+        if project_to_delete is None:
+            return jsonify({"success": False, "error": "프로젝트를 찾을 수 없습니다."}), 404
         db.session.delete(project_to_delete); db.session.commit()
         return jsonify({"success": True, "message": "프로젝트가 삭제되었습니다."})
     except Exception as e:
@@ -239,176 +863,322 @@ def delete_project(project_id):
 @app.route('/api/search', methods=['POST'])
 @login_required 
 def search():
-    results = []
     try:
         params = request.get_json()
         if not params or not params.get('query'):
             return jsonify({"error": "검색어가 필요합니다."}), 400
 
+        # ▼▼▼ [신규] 방금 같은 조건으로 만든 응답이 있으면 직렬화된 바이트를 그대로 반환 ▼▼▼
+        response_key = create_response_key(params)
+        # ▼▼▼ [수정] 캐시 키는 YouTube API 로 전달되는 조건만으로 만들고, 필터는 매번 로컬에서 적용 ▼▼▼
         search_hash = create_search_hash(params)
-        cache_duration = timedelta(hours=1)
-        cached_result = SearchCache.query.filter_by(search_hash=search_hash).first()
+        with metrics.stage('search.cache_lookup'):
+            cached_body = get_cached_response(response_key)
+            raw_items = load_cached_search(search_hash) if cached_body is None else None
+        metrics.cache_result('search_response', cached_body is not None)
+        if cached_body is not None: return send_json(cached_body)
+        metrics.cache_result('search', raw_items is not None)
 
-        if cached_result and (datetime.now(timezone.utc) - cached_result.created_at.replace(tzinfo=timezone.utc) < cache_duration):
-            print("✅ [Cache Hit!] DB에 저장된 캐시된 결과를 반환합니다.")
-            return jsonify(json.loads(cached_result.results_json))
+        if raw_items is not None:
+            print("✅ [Cache Hit!] DB에 저장된 원본 결과에 필터만 다시 적용합니다.")
+            with metrics.stage('search.postprocess'):
+                body = cache_response(response_key, {'items': build_search_results(raw_items, params)})
+            return send_json(body)
 
-        youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+        # ▼▼▼ [신규] 쿼터가 빠듯하면 새 search.list 대신 오래된(stale) 캐시를 우선 사용 ▼▼▼
+        user_id = current_user.id
+        search_cost = estimate_search_cost(params)
+        quota_status = quota_scheduler.status(user_id, search_cost)
+        if quota_status != QuotaScheduler.OK:
+            stale_items = load_cached_search(search_hash, max_age=SEARCH_STALE_MAX_AGE)
+            if stale_items is not None:
+                print(f"⚠️ [Quota {quota_status}] 새 API 호출 대신 오래된 캐시 결과를 반환합니다.")
+                metrics.cache_result('search_stale', True)
+                return send_json({'items': build_search_results(stale_items, params), 'stale': True, 'quota': quota_scheduler.remaining(user_id)})
+        if quota_status == QuotaScheduler.EXHAUSTED or not quota_scheduler.consume(user_id, search_cost):
+            metrics.inc('benchly_errors_total', kind='quota_exhausted')
+            return jsonify({"error": "YouTube API 사용량 한도에 도달했습니다. 잠시 후 다시 시도해주세요.", "quota": quota_scheduler.remaining(user_id)}), 429
 
-        search_api_params = {
-            'part': 'snippet', 'type': 'video',
-            'regionCode': params.get('region'), 'maxResults': params.get('maxResults'),
-            'order': params.get('sortOrder', 'relevance'),
-            'relevanceLanguage': params.get('language', 'ko')
-        }
-        search_type = params.get('searchType')
+        # ▼▼▼ [수정] 같은 검색이 동시에 들어오면 한 요청만 YouTube 를 호출하고 나머지는 결과를 공유 ▼▼▼
+        # 이 요청이 직접 YouTube 를 호출한 경우에만 차감을 유지합니다. (병합/잠금 대기 후 캐시 사용, 호출 실패는 환불)
+        fetched = []
+        try:
+            raw_items, shared = search_flights.do(search_hash, lambda: load_or_fetch_search(search_hash, params, fetched))
+        except Exception:
+            quota_scheduler.refund(user_id, search_cost)
+            raise
+        metrics.cache_result('search_single_flight', shared)
+        if shared: print("✅ [Single-flight] 진행 중이던 동일 검색의 결과를 공유받았습니다.")
+        if not fetched: quota_scheduler.refund(user_id, search_cost)
+        if not raw_items: return jsonify({'items': []})
+        with metrics.stage('search.postprocess'):
+            response_data = {'items': build_search_results(raw_items, params)}
+        if quota_status == QuotaScheduler.TIGHT:
+            response_data['quota'] = quota_scheduler.remaining(user_id)
+            return send_json(response_data)
+        return send_json(cache_response(response_key, response_data))
+    except HttpError as e:
+        error_content = json.loads(e.content.decode('utf-8'))
+        error_message = error_content.get('error', {}).get('message', 'YouTube API Error')
+        print(f"❌ YouTube API Error: {error_message}")
+        metrics.inc('benchly_errors_total', kind='youtube_http')
+        return jsonify({"error": error_message}), e.resp.status
+    except FuturesTimeoutError:
+        print("❌ YouTube API Timeout: 보강(enrichment) 호출이 제한 시간을 넘었습니다.")
+        metrics.inc('benchly_errors_total', kind='youtube_timeout')
+        return jsonify({"error": "YouTube API 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."}), 504
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ /api/search Error: {e}")
+        metrics.inc('benchly_errors_total', kind='search')
+        return jsonify({"error": str(e)}), 500
+    
+# ▼▼▼ [신규] 배치 검색: {"queries": [...], 나머지는 /api/search 와 같은 조건} (키워드 검색만 지원) ▼▼▼
+SEARCH_BATCH_MAX_QUERIES = 10
 
-        if search_type == 'channel':
-            channel_search_query = params.get('query')
-            channel_search_response = youtube.search().list(part='snippet', q=channel_search_query, type='channel', maxResults=1).execute()
+@app.route('/api/search/batch', methods=['POST'])
+@login_required
+def search_batch():
+    try:
+        params = request.get_json() or {}
+        queries = list(dict.fromkeys(query.strip() for query in params.get('queries') or [] if isinstance(query, str) and query.strip()))
+        if not queries:
+            return jsonify({"error": "검색어 목록이 필요합니다."}), 400
+        if len(queries) > SEARCH_BATCH_MAX_QUERIES:
+            return jsonify({"error": f"한 번에 최대 {SEARCH_BATCH_MAX_QUERIES}개의 검색어까지 검색할 수 있습니다."}), 400
 
-            if not channel_search_response.get('items'): return jsonify({'items': []}) 
+        base_params = {key: value for key, value in params.items() if key != 'queries'}
+        query_params = {query: {**base_params, 'query': query, 'searchType': 'keyword'} for query in queries}
+        search_hashes = {query: create_search_hash(query_params[query]) for query in queries}
+        raw_by_query = {query: load_cached_search(search_hashes[query]) for query in queries}
+        missing = [query for query in queries if raw_by_query[query] is None]
+        response_data = {}
 
-            target_channel_id = channel_search_response['items'][0]['snippet']['channelId']
-            search_api_params['channelId'] = target_channel_id
-            search_api_params['order'] = 'date'
-            if 'q' in search_api_params: del search_api_params['q']
-        else:
-            search_api_params['q'] = params.get('query')
-            if params.get('period'):
+        if missing:
+            # ▼▼▼ 쿼터가 빠듯하면 오래된 캐시로 채울 수 있는 검색어는 API 호출에서 뺍니다 ▼▼▼
+            user_id = current_user.id
+            quota_status = quota_scheduler.status(user_id, sum(estimate_search_cost(query_params[query]) for query in missing))
+            if quota_status != QuotaScheduler.OK:
+                for query in list(missing):
+                    stale_items = load_cached_search(search_hashes[query], max_age=SEARCH_STALE_MAX_AGE)
+                    if stale_items is not None:
+                        raw_by_query[query] = stale_items
+                        missing.remove(query)
+                        response_data['stale'] = True
+            search_cost = sum(estimate_search_cost(query_params[query]) for query in missing)
+            if missing and (quota_status == QuotaScheduler.EXHAUSTED or not quota_scheduler.consume(user_id, search_cost)):
+                if len(missing) == len(queries):
+                    return jsonify({"error": "YouTube API 사용량 한도에 도달했습니다. 잠시 후 다시 시도해주세요.", "quota": quota_scheduler.remaining(user_id)}), 429
+                response_data['skipped'] = missing  # 캐시에 없는 검색어는 이번에는 건너뜀
+                missing = []
+            if missing:
                 try:
-                    days = int(params.get('period'))
-                    if days > 0:
-                        search_api_params['publishedAfter'] = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
-                except (ValueError, TypeError): pass 
-
-        search_response = youtube.search().list(**search_api_params).execute()
-
-        video_ids = [item['id']['videoId'] for item in search_response.get('items', []) if 'videoId' in item.get('id', {})]
-        if not video_ids: return jsonify({'items': []})
-
-        video_stats_response = youtube.videos().list(part='statistics,contentDetails,status,snippet', id=','.join(video_ids)).execute()
-        video_details = {item['id']: item for item in video_stats_response.get('items', [])}
-
-        channel_ids = {item['snippet']['channelId'] for item in video_stats_response.get('items', [])}
-        channel_stats = {}
-        if channel_ids:
-            channel_stats_response = youtube.channels().list(part='statistics', id=','.join(list(channel_ids))).execute()
-            channel_stats = {item['id']: item['statistics'] for item in channel_stats_response.get('items', [])}
-
-        videos_base_info = [
-            {'videoId': item['id']['videoId'], 'channelId': item['snippet']['channelId'], 'title': item['snippet']['title'],
-             'channelTitle': item['snippet']['channelTitle'], 'publishedAt': item['snippet']['publishedAt']}
-            for item in search_response.get('items', []) if 'videoId' in item.get('id', {})
-        ]
-
-        for video in videos_base_info:
-            video_id = video['videoId']
-            channel_id = video['channelId']
-
-            if video_id not in video_details: continue
-
-            stats = video_details[video_id].get('statistics', {})
-            content_details = video_details[video_id].get('contentDetails', {})
-            status = video_details[video_id].get('status', {})
-            full_snippet = video_details[video_id].get('snippet', {})
-            channel_stat_data = channel_stats.get(channel_id, {})
-
-            if params.get('excludeKids') and status.get('madeForKids', False): continue
-
-            views = int(stats.get('viewCount', 0))
-            if views < int(params.get('minViews', 0)): continue
-
-            published_time = datetime.fromisoformat(video['publishedAt'].replace('Z', '+00:00'))
-            now_time = datetime.now(timezone.utc)
-            diff_hours = (now_time - published_time).total_seconds() / 3600
-            vph = round(views / diff_hours) if diff_hours >= 1 else views
-            if params.get('useVPH') and vph < int(params.get('minVPH', 0)): continue
-
-            duration_iso = content_details.get('duration', 'PT0S')
-            duration_seconds = isodate.parse_duration(duration_iso).total_seconds()
-            length_filter = params.get('videoLength')
-            if length_filter == 'short' and duration_seconds >= 240: continue
-            if length_filter == 'medium' and (duration_seconds < 240 or duration_seconds > 1200): continue
-            if length_filter == 'long' and duration_seconds <= 1200: continue
-
-            likes = int(stats.get('likeCount', 0))
-            subscribers = int(channel_stat_data.get('subscriberCount', 0))
-            ratio = round((views / subscribers) * 100, 2) if subscribers > 0 else 0
-            like_ratio = round((likes / views) * 100, 2) if views > 0 else 0
-            thumbnails = full_snippet.get('thumbnails', {})
-
-            video.update({
-                'thumbnail': thumbnails.get('high', thumbnails.get('medium', thumbnails.get('default', {}))).get('url', ''),
-                'viewCount': views, 'likeCount': likes, 'subscriberCount': subscribers,
-                'ratio': ratio, 'likeRatio': like_ratio, 'vph': vph,
-                'publishedAt_timestamp': published_time.timestamp(),
-                # ▼▼▼ 이 부분이 문제의 핵심! 이 줄이 포함된 버전으로 교체해야 해 ▼▼▼
-                'publishedAt_formatted': published_time.strftime('%y-%m-%d'),
-                'duration_seconds': duration_seconds,
-                'duration_formatted': str(timedelta(seconds=int(duration_seconds))),
-                'captionAvailable': content_details.get('caption', 'false') == 'true'
-            })
-            results.append(video)
-
-        final_response_data = {'items': results}
-
-        if cached_result:
-            cached_result.results_json = json.dumps(final_response_data)
-            cached_result.created_at = datetime.now(timezone.utc)
-        else:
-            new_cache = SearchCache(search_hash=search_hash, results_json=json.dumps(final_response_data))
-            db.session.add(new_cache)
+                    fetched = fetch_raw_search_batch({query: query_params[query] for query in missing})
+                except Exception:
+                    quota_scheduler.refund(user_id, search_cost)  # 호출이 실패하면 차감했던 토큰을 돌려줌
+                    raise
+                for query, raw_items in fetched.items():
+                    raw_by_query[query] = raw_items
+                    if raw_items: view_sampler.track([raw['videoId'] for raw in raw_items], source='search')
+                    store_search_cache(search_hashes[query], raw_items)  # 빈 결과도 캐시
+            if quota_status != QuotaScheduler.OK: response_data['quota'] = quota_scheduler.remaining(user_id)
 
-        db.session.commit()
-        return jsonify(final_response_data) 
+        # 조회수 증가량은 모든 검색어의 영상에 대해 한 번에 조회합니다.
+        all_video_ids = [raw['videoId'] for raw_items in raw_by_query.values() if raw_items for raw in raw_items]
+        velocity = view_sampler.velocity(all_video_ids)
+        results_by_query = {query: build_search_results(raw_by_query[query] or [], query_params[query], velocity) for query in queries}
+        response_data['results'] = [{'query': query, 'items': results_by_query[query]} for query in queries]
+        response_data['merged'] = merge_batch_results(results_by_query)
+        return send_json(response_data)
     except HttpError as e:
         error_content = json.loads(e.content.decode('utf-8'))
         error_message = error_content.get('error', {}).get('message', 'YouTube API Error')
         print(f"❌ YouTube API Error: {error_message}")
         return jsonify({"error": error_message}), e.resp.status
+    except FuturesTimeoutError:
+        print("❌ YouTube API Timeout: 배치 검색 호출이 제한 시간을 넘었습니다.")
+        return jsonify({"error": "YouTube API 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."}), 504
     except Exception as e:
         db.session.rollback()
-        print(f"❌ /api/search Error: {e}")
+        print(f"❌ /api/search/batch Error: {e}")
         return jsonify({"error": str(e)}), 500
-    
+
+# ▼▼▼ [신규] 여러 페이지 검색: 필터를 통과한 영상이 targetResults 개가 될 때까지 nextPageToken 을 따라가며 NDJSON 으로 전송 ▼▼▼
+# 한 줄에 JSON 하나: {"items": [...], "page": n} 이 페이지마다, 마지막에 {"done": true, "stopReason": ...}
+# stopReason: 'target'(목표 개수 도달) / 'no_more_pages' / 'max_pages' / 'quota'(쿼터 부족)
+SEARCH_PAGE_SIZE = 50
+SEARCH_PAGE_COST = 102  # search.list(100) + videos/channels.list
+SEARCH_STREAM_MAX_PAGES = int(os.environ.get('SEARCH_STREAM_MAX_PAGES', 10))
+SEARCH_STREAM_MAX_TARGET = 500
+
+def ndjson_line(data):
+    return dumps_bytes(data) + b'\n'
+
+def create_search_page_hash(params, page):
+    # 페이지 크기는 항상 50 이므로 maxResults 와 관계없이 같은 검색어/조건이면 같은 페이지 캐시를 씁니다.
+    page_source = f"{create_search_hash({**params, 'maxResults': SEARCH_PAGE_SIZE})}:page:{page}"
+    return hashlib.sha256(page_source.encode('utf-8')).hexdigest()
+
+def start_search_page(youtube, params, page, page_token, user_id):
+    # 캐시된 페이지는 보강까지 끝난 원본 목록을, 아니면 쿼터를 차감하고 search.list 를 스레드 풀에서 시작합니다.
+    # 쿼터가 부족하면 None.
+    cached_data = load_cached_search_data(create_search_page_hash(params, page))
+    if cached_data is not None:
+        return {'page': page, 'raw_items': cached_data['items'], 'next_token': cached_data.get('nextPageToken')}
+    if not consume_youtube_quota(user_id, SEARCH_PAGE_COST): return None
+    api_params = {**build_search_api_params(params), 'maxResults': SEARCH_PAGE_SIZE}
+    if page_token: api_params['pageToken'] = page_token
+    return {'page': page, 'user_id': user_id, 'future': youtube_clients.submit(youtube.search().list(**api_params))}
+
+def receive_search_page(pending):
+    # search.list 응답을 기다려 (검색 항목, 다음 페이지 토큰) 을 채웁니다. 캐시된 페이지는 그대로.
+    if 'future' in pending:
+        try:
+            search_response = youtube_clients.result(pending.pop('future'))
+        except Exception:
+            quota_scheduler.refund(pending['user_id'], SEARCH_PAGE_COST)  # 호출이 실패하면 차감했던 토큰을 돌려줌
+            raise
+        pending['search_items'] = [item for item in search_response.get('items', []) if 'videoId' in item.get('id', {})]
+        pending['next_token'] = search_response.get('nextPageToken')
+    return pending
+
+def enrich_search_page(youtube, params, pending):
+    if 'raw_items' in pending: return pending['raw_items']
+    search_items = pending['search_items']
+    raw_items = build_raw_items(search_items, *fetch_enrichment(youtube, search_items)) if search_items else []
+    view_sampler.track([raw['videoId'] for raw in raw_items], source='search')
+    store_search_cache(create_search_page_hash(params, pending['page']), raw_items, nextPageToken=pending['next_token'])
+    return raw_items
+
+@app.route('/api/search/stream', methods=['POST'])
+@login_required
+def search_stream():
+    params = request.get_json() or {}
+    if not params.get('query'):
+        return jsonify({"error": "검색어가 필요합니다."}), 400
+    if params.get('searchType') == 'channel':
+        return jsonify({"error": "여러 페이지 검색은 키워드 검색만 지원합니다."}), 400
+    try:
+        target = min(max(int(params.get('targetResults') or SEARCH_PAGE_SIZE), 1), SEARCH_STREAM_MAX_TARGET)
+        max_pages = min(max(int(params.get('maxPages') or SEARCH_STREAM_MAX_PAGES), 1), SEARCH_STREAM_MAX_PAGES)
+    except (ValueError, TypeError):
+        return jsonify({"error": "targetResults / maxPages 는 숫자여야 합니다."}), 400
+    user_id = current_user.id
+
+    def generate():
+        youtube = youtube_clients.get_service()
+        seen_ids, scanned, passed = set(), 0, 0
+        stop_reason = 'max_pages'
+        try:
+            pending = start_search_page(youtube, params, 0, None, user_id)
+            if pending is None: stop_reason = 'quota'
+            while pending is not None:
+                current, pending = receive_search_page(pending), None
+                has_next = bool(current['next_token']) and current['page'] + 1 < max_pages
+                if not current['next_token']: stop_reason = 'no_more_pages'
+                # 다음 페이지 search.list 는 이번 페이지를 보강하는 동안 미리 시작합니다.
+                # 단, 지금까지의 필터 통과율로 보아 이번 페이지만으로 목표에 닿을 것 같으면 쿼터를 아끼기 위해 기다립니다.
+                pass_rate = passed / scanned if scanned else 1.0
+                page_size = len(current.get('search_items') or current.get('raw_items') or [])
+                if has_next and passed + page_size * pass_rate < target:
+                    pending = start_search_page(youtube, params, current['page'] + 1, current['next_token'], user_id)
+                    if pending is None: has_next, stop_reason = False, 'quota'
+
+                # 페이지 사이에 겹쳐 나온 영상은 한 번만 보냅니다.
+                raw_items = [raw for raw in enrich_search_page(youtube, params, current) if raw['videoId'] not in seen_ids]
+                seen_ids.update(raw['videoId'] for raw in raw_items)
+                results = build_search_results(raw_items, params)[:target - passed]
+                scanned, passed = scanned + len(raw_items), passed + len(results)
+                if results: yield ndjson_line({'page': current['page'], 'items': results})
+
+                if passed >= target:
+                    stop_reason = 'target'
+                    break
+                if pending is None and has_next:
+                    pending = start_search_page(youtube, params, current['page'] + 1, current['next_token'], user_id)
+                    if pending is None: stop_reason = 'quota'
+            done = {'done': True, 'stopReason': stop_reason, 'total': passed, 'scanned': scanned}
+            if quota_scheduler.status(user_id, SEARCH_PAGE_COST) != QuotaScheduler.OK:
+                done['quota'] = quota_scheduler.remaining(user_id)
+            yield ndjson_line(done)
+        except HttpError as e:
+            error_content = json.loads(e.content.decode('utf-8'))
+            error_message = error_content.get('error', {}).get('message', 'YouTube API Error')
+            print(f"❌ YouTube API Error: {error_message}")
+            yield ndjson_line({'done': True, 'error': error_message})
+        except FuturesTimeoutError:
+            print("❌ YouTube API Timeout: 여러 페이지 검색 호출이 제한 시간을 넘었습니다.")
+            yield ndjson_line({'done': True, 'error': "YouTube API 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."})
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ /api/search/stream Error: {e}")
+            yield ndjson_line({'done': True, 'error': str(e)})
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers=headers)
+
+# ▼▼▼ [신규] 남은 YouTube 쿼터 조회 (UI 경고 표시용) ▼▼▼
+@app.route('/api/quota', methods=['GET'])
+@login_required
+def get_quota():
+    try:
+        return jsonify({"success": True, "quota": quota_scheduler.remaining(current_user.id)})
+    except Exception as e:
+        print(f"❌ /api/quota Error: {e}"); return jsonify({"success": False, "error": "쿼터 조회 중 서버 오류 발생"}), 500
+
 # ...
+# ▼▼▼ [수정] 요약은 작업 큐에서 생성합니다. JOB_MAX_WAIT_SECONDS 안에 끝나면(캐시 적중 등) 이전과 같은 응답,
+# 아니면 202 와 작업을 돌려주고 클라이언트는 /api/jobs/<id> 로 결과를 조회합니다. ▼▼▼
 @app.route('/api/get_summary', methods=['POST'])
 @login_required
 def get_summary():
-    if not generation_config or not safety_settings:
-        return jsonify({"success": False, "error": "AI 모델 공용 설정이 로드되지 않았습니다."}), 500
+    summary_args, error_response = parse_summary_request()
+    if error_response: return error_response
+    return run_job_with_wait('summary', summary_job_payload(*summary_args), create_summary_key(*summary_args), "AI 분석 중 오류 발생")
 
-    data = request.get_json()
-    transcript = data.get('transcript')
-    user_prompt = data.get('prompt')
-    selected_model = data.get('model')
+# ▼▼▼ [신규] 요약을 생성되는 대로 Server-Sent Events 로 전송 ▼▼▼
+# 각 이벤트의 data 는 /api/get_summary 응답과 같은 모양({"success", "summary_html" 조각})이고,
+# 마지막 이벤트에 "done": true 와 "cached" 가 붙습니다. 실패하면 {"success": false, "error"} 로 끝납니다.
+# ▼▼▼ [수정] Gemini 호출은 작업 큐(summary 작업)에서 실행하고, 이 응답은 작업의 progress 를 조각으로 나눠 보냅니다 ▼▼▼
+# (브라우저는 /api/jobs/summary 폴링을 사용합니다. 이 엔드포인트는 SSE 를 쓰는 클라이언트용으로 유지)
+def sse_event(data):
+    return b'data: ' + dumps_bytes(data) + b'\n\n'
 
-    # ▼▼▼ [수정] 허용 모델 리스트를 초기화한 모델 이름과 정확히 일치시킴 ▼▼▼
-    allowed_models = ['gemini-flash-latest', 'gemini-pro-latest']
-    if not transcript or not user_prompt or not selected_model:
-        return jsonify({"success": False, "error": "스크립트, 프롬프트, 모델 이름이 모두 필요합니다."}), 400
-    if selected_model not in allowed_models:
-        return jsonify({"success": False, "error": f"허용되지 않은 모델입니다. 전송된 값: {selected_model}"}), 400
+def stream_chunk_text(chunk):
+    try:
+        return chunk.text
+    except ValueError:  # 안전 필터 등으로 text 가 없는 조각
+        return ''
 
+@app.route('/api/get_summary/stream', methods=['POST'])
+@login_required
+def get_summary_stream():
+    summary_args, error_response = parse_summary_request()
+    if error_response: return error_response
     try:
-        cleaned_script = preprocess_script(transcript)
-        
-        # ▼▼▼ [수정] 분기 처리할 모델 이름을 정확히 일치시킴 ▼▼▼
-        model_to_use = gemini_flash_model if selected_model == 'gemini-flash-latest' else gemini_pro_model
-        
-        final_prompt = f"{user_prompt}\n\n--- 분석할 스크립트 시작 ---\n{cleaned_script}\n--- 분석할 스크립트 끝 ---"
+        job, _ = enqueue_job('summary', summary_job_payload(*summary_args), create_summary_key(*summary_args))
+    except JobLimitExceeded as e:
+        return jsonify({"success": False, "error": str(e)}), 429
 
-        response = model_to_use.generate_content(final_prompt)
-        
-        html_response = response.text.replace('\n', '<br>')
-        html_response = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html_response)
-        
-        return jsonify({ "success": True, "summary_html": html_response })
+    def generate():
+        sent = ''  # progress 와 최종 결과는 앞부분이 같은 HTML 이므로 새로 늘어난 부분만 보냅니다.
+        current = job
+        while current is not None and current['status'] in ('queued', 'running'):
+            html = (current['progress'] or {}).get('summary_html', '')
+            if len(html) > len(sent):
+                yield sse_event({"success": True, "summary_html": html[len(sent):]})
+                sent = html
+            current = job_queue.wait(job['id'], SUMMARY_PROGRESS_INTERVAL)
+        if current is None or current['status'] == 'failed':
+            error = current['error'] if current else '작업을 찾을 수 없습니다.'
+            yield sse_event({"success": False, "error": f"AI 분석 중 오류 발생: {error}"})
+            return
+        summary_html = current['result']['summary_html']
+        yield sse_event({"success": True, "summary_html": summary_html[len(sent):], "done": True, "cached": current['result']['cached']})
 
-    except Exception as e:
-        print(f"❌ /api/get_summary Error: {e}")
-        return jsonify({"success": False, "error": f"AI 분석 중 오류 발생: {e}"}), 500
+    # 프록시(nginx 등)가 응답을 모아 두지 않도록 버퍼링을 끕니다.
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers=headers)
 
 
 @app.route('/api/get_related_keywords', methods=['POST'])
@@ -423,62 +1193,269 @@ def get_related_keywords():
 
     if not query:
         return jsonify({"success": False, "error": "키워드가 없습니다."}), 400
+    # ▼▼▼ [수정] 요약과 같이 작업 큐에서 생성 (JOB_MAX_WAIT_SECONDS 안에 끝나지 않으면 202 + 작업) ▼▼▼
+    return run_job_with_wait('related_keywords', {'query': query, 'target_lang': target_lang},
+                             create_keyword_key(query, target_lang), "AI 응답 처리 중 오류 발생")
+
+# ▼▼▼ [신규] AI 작업 큐 API: 제출하면 작업 ID 를 바로 돌려주고, 결과는 /api/jobs/<id> 로 조회 ▼▼▼
+# ▼▼▼ [수정] 같은 사용자가 같은 입력으로 다시 제출한 작업만 하나로 합치고(dedup_key), 작업은 제출한 사용자만 조회할 수 있습니다.
+# (다른 사용자의 같은 요청은 별도 작업이지만, 먼저 끝난 결과가 요약/키워드 캐시에 남으므로 Gemini 를 다시 호출하지 않음) ▼▼▼
+def summary_job_payload(cleaned_script, user_prompt, selected_model):
+    return {'cleaned_script': cleaned_script, 'prompt': user_prompt, 'model': selected_model}
 
+def run_summary_job(payload):
     try:
-        language_map = {'ko': 'Korean', 'en': 'English', 'ja': 'Japanese'}
-        target_language_name = language_map.get(target_lang, 'Korean')
-        translated_query = query
-        if target_lang != 'ko' and query:
-            translation_prompt = f"Translate the following text to {target_language_name}. Return only the translated text, without any additional explanations or quotation marks.\n\n{query}"
-            translated_query_response = gemini_flash_model.generate_content(translation_prompt)
-            translated_query = translated_query_response.text.strip().replace('"', '')
-        
-        print(f"--- AI 번역 --- 원본: {query} -> 번역({target_lang}): {translated_query}")
-        
-        keyword_prompt_template = """
-        You are an expert in analyzing YouTube content trends and generating search keywords for a specific language market. Your user is a YouTube creator looking for their next content idea.
-        Your task is to take the user's search query and generate a total of 10 related keywords. These keywords must be divided into two distinct categories:
-        1.  **Directly Related Keywords (5 keywords):** Generate 5 keywords that are specific variations or synonyms of the user's full search query. For example, if the query is "쿠팡꿀템", suggestions could be "쿠팡 추천템", "쿠팡 가성비 제품", "로켓배송 꿀템".
-        2.  **Expansion Keywords (5 keywords):** Identify the core concept in the user's query (e.g., in "쿠팡꿀템", the core concept is "꿀템"). Generate 5 keywords by combining this core concept with other popular, related subjects. For "쿠팡꿀템", this could lead to "살림꿀템", "주방꿀템", "알리익스프레스 꿀템".
-        The user's translated search query is: "{translated_query}"
-        The target language for the output keywords is: **{target_language_name}**
-        **CRUCIAL INSTRUCTION: You MUST generate the "original" keywords strictly in the specified target language: **{target_language_name}**. Do NOT output keywords in English unless the target language is "English".**
-        After generating all 10 keywords in {target_language_name}, you must also provide the Korean translation for each keyword.
-        You MUST return the results ONLY in a single, raw JSON object format. The JSON object must contain a single key named "keywords" which holds an array of all 10 generated objects. Each object must have two keys: "original" (the keyword in {target_language_name}) and "korean" (the Korean translation).
-        """
-        
-        final_prompt = keyword_prompt_template.format(
-            target_language_name=target_language_name,
-            translated_query=translated_query
-        )
+        summary_html, cached = generate_summary(payload['cleaned_script'], payload['prompt'], payload['model'],
+                                                on_progress=lambda html: job_queue.report_progress({"summary_html": html}))
+    except Exception:
+        db.session.rollback()
+        metrics.inc('benchly_errors_total', kind='summary')
+        raise
+    return {"summary_html": summary_html, "cached": cached}
 
-        response = gemini_flash_model.generate_content(final_prompt)
-        ai_response_text = response.text
-        
-        json_string = ai_response_text[ai_response_text.find('{'):ai_response_text.rfind('}')+1]
-        
-        if not json_string: raise Exception("AI 응답에서 JSON 객체를 찾을 수 없습니다.")
+def run_related_keywords_job(payload):
+    try:
+        return generate_related_keywords(payload['query'], payload['target_lang'])
+    except Exception:
+        db.session.rollback()
+        metrics.inc('benchly_errors_total', kind='related_keywords')
+        raise
 
-        parsed_json = json.loads(json_string)
-        
-        final_data = None
-        if isinstance(parsed_json, dict):
-            for key, value in parsed_json.items():
-                if isinstance(value, list):
-                    final_data = {'keywords': value}
-                    break
-        
-        if final_data is None: raise Exception("AI가 반환한 JSON에서 키워드 리스트를 찾을 수 없습니다.")
+def run_refresh_projects_job(payload):
+    # 쿼터는 실제로 새로고침하는 배치마다 요청한 사용자의 예산에서 차감합니다.
+    user_id = payload['user_id']
+    return project_refresher.refresh_many(payload['project_ids'], consume_quota=lambda units: consume_youtube_quota(user_id, units),
+                                          refund_quota=lambda units: quota_scheduler.refund(user_id, units))
 
-        return jsonify({"success": True, "data": final_data, "translated_query": translated_query})
+job_queue.register('summary', run_summary_job)
+job_queue.register('related_keywords', run_related_keywords_job)
+job_queue.register('refresh_projects', run_refresh_projects_job)
 
-    except Exception as e:
-        print(f"❌ AI 키워드 추천 에러: {e}")
-        return jsonify({"success": False, "error": f"AI 응답 처리 중 오류 발생: {e}"}), 500
+def job_response(job, **extra):
+    status_code = 200 if job['status'] in ('done', 'failed') else 202
+    job = {key: job[key] for key in ('id', 'name', 'status', 'result', 'progress', 'error')}
+    return jsonify({"success": True, "job": job, **extra}), status_code
+
+def enqueue_job(name, payload, dedup_source):
+    # (작업, 새로 만들었는지 여부). 사용자별 한도를 넘으면 JobLimitExceeded
+    dedup_key = hashlib.sha256(f"{name}\0{current_user.id}\0{dedup_source}".encode('utf-8')).hexdigest()
+    return job_queue.submit(name, payload, user_id=current_user.id, dedup_key=dedup_key)
+
+def submit_job(name, payload, dedup_source):
+    try:
+        job, created = enqueue_job(name, payload, dedup_source)
+    except JobLimitExceeded as e:
+        return jsonify({"success": False, "error": str(e)}), 429
+    return job_response(job, deduplicated=not created)
+
+def run_job_with_wait(name, payload, dedup_source, error_message):
+    # 기존 동기 API 용: 작업 큐에 넣고 JOB_MAX_WAIT_SECONDS 동안만 기다립니다.
+    try:
+        job, _ = enqueue_job(name, payload, dedup_source)
+    except JobLimitExceeded as e:
+        return jsonify({"success": False, "error": str(e)}), 429
+    job = job_queue.wait(job['id'], JOB_MAX_WAIT_SECONDS)
+    if job['status'] == 'done': return jsonify({"success": True, **job['result']})
+    if job['status'] == 'failed': return jsonify({"success": False, "error": f"{error_message}: {job['error']}"}), 500
+    return job_response(job)
+
+@app.route('/api/jobs/summary', methods=['POST'])
+@login_required
+def submit_summary_job():
+    summary_args, error_response = parse_summary_request()
+    if error_response: return error_response
+    return submit_job('summary', summary_job_payload(*summary_args), create_summary_key(*summary_args))
+
+@app.route('/api/jobs/related_keywords', methods=['POST'])
+@login_required
+def submit_related_keywords_job():
+    if not gemini_flash_model:
+        return jsonify({"success": False, "error": "AI 모델이 설정되지 않았습니다."}), 500
+    data = request.get_json()
+    query, target_lang = data.get('query'), data.get('target_lang', 'ko')
+    if not query:
+        return jsonify({"success": False, "error": "키워드가 없습니다."}), 400
+    return submit_job('related_keywords', {'query': query, 'target_lang': target_lang}, create_keyword_key(query, target_lang))
+
+# ▼▼▼ [신규] 저장된 프로젝트 통계 새로고침: {"projectIds": [...]} 또는 {"all": true} (내 프로젝트 전체) ▼▼▼
+PROJECT_REFRESH_MAX_PROJECTS = int(os.environ.get('PROJECT_REFRESH_MAX_PROJECTS', 1000))
+
+@app.route('/api/jobs/refresh_projects', methods=['POST'])
+@login_required
+def submit_refresh_projects_job():
+    data = request.get_json() or {}
+    query = db.session.query(Project.id).filter(Project.user_id == current_user.id)
+    if not data.get('all'):
+        try:
+            requested_ids = [int(project_id) for project_id in data.get('projectIds') or []]
+        except (ValueError, TypeError):
+            return jsonify({"success": False, "error": "프로젝트 ID 가 올바르지 않습니다."}), 400
+        if not requested_ids:
+            return jsonify({"success": False, "error": "새로고침할 프로젝트를 선택해주세요."}), 400
+        query = query.filter(Project.id.in_(requested_ids))
+    # 다른 사용자의 프로젝트 ID 는 조용히 제외됩니다.
+    project_ids = sorted(row[0] for row in query.order_by(Project.id).limit(PROJECT_REFRESH_MAX_PROJECTS))
+    if not project_ids:
+        return jsonify({"success": False, "error": "새로고침할 프로젝트가 없습니다."}), 404
+    payload = {'user_id': current_user.id, 'project_ids': project_ids}
+    return submit_job('refresh_projects', payload, f"{current_user.id}:{','.join(map(str, project_ids))}")
+
+@app.route('/api/project/<int:project_id>/snapshots', methods=['GET'])
+@login_required
+def get_project_snapshots(project_id):
+    # 새로고침할 때마다 남긴 변화량 목록 (최신순)
+    project = Project.query.options(load_only(Project.id, Project.user_id, Project.refreshed_at)).filter_by(id=project_id, user_id=current_user.id).first()
+    if project is None:
+        return jsonify({"success": False, "error": "프로젝트를 찾을 수 없습니다."}), 404
+    limit = min(request.args.get('limit', 30, type=int), 200)
+    snapshots = project.snapshots.order_by(ProjectSnapshot.created_at.desc()).limit(limit).all()
+    return jsonify({"success": True, "refreshed_at": project.refreshed_at,
+                    "snapshots": [{"created_at": snapshot.created_at, "delta": json_loads(snapshot.delta_json)} for snapshot in snapshots]})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+@login_required
+def get_job(job_id):
+    # ?wait=초 를 주면 작업이 끝날 때까지(최대 JOB_MAX_WAIT_SECONDS) 기다렸다가 응답합니다.
+    try:
+        wait_seconds = min(max(float(request.args.get('wait', 0)), 0), JOB_MAX_WAIT_SECONDS)
+    except ValueError:
+        wait_seconds = 0
+    job = job_queue.wait(job_id, wait_seconds) if wait_seconds else job_queue.get(job_id)
+    if job is None or job['user_id'] != current_user.id:  # 다른 사용자의 작업은 없는 것과 같이 응답
+        return jsonify({"success": False, "error": "작업을 찾을 수 없습니다."}), 404
+    return job_response(job)
+
+# ▼▼▼ [신규] 요청별 지표: 처리 시간 / SQL 문 수, 느린 요청은 단계별 시간과 함께 로그 ▼▼▼
+@app.before_request
+def start_request_metrics():
+    metrics.begin_request()
+
+@app.after_request
+def record_request_metrics(response):
+    if metrics.current_trace() is None: return response
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    finish = functools.partial(finish_request_metrics, route, request.method, request.path, response.status_code)
+    if response.is_streamed:
+        # NDJSON/SSE 응답은 본문(생성기)을 다 보낸 뒤에 기록합니다. (생성기 안의 단계 시간과 전체 시간까지 포함)
+        response.call_on_close(finish)
+    else:
+        finish()
+    return response
+
+def finish_request_metrics(route, method, path, status_code):
+    trace = metrics.end_request()
+    if trace is None: return
+    elapsed = trace.elapsed()
+    metrics.inc('benchly_requests_total', route=route, method=method, status=status_code)
+    metrics.observe('benchly_request_seconds', elapsed, route=route)
+    metrics.observe('benchly_db_queries_per_request', trace.queries, route=route)
+    if elapsed >= SLOW_REQUEST_SECONDS:
+        stages = ', '.join(f"{name} {total * 1000:.0f}ms" + (f" x{count}" if count > 1 else '') for name, total, count in trace.breakdown())
+        print(f"⚠️ [Slow Request] {method} {path} → {status_code} {elapsed:.2f}s (SQL {trace.queries}회)" + (f" {stages}" if stages else ''))
+    metrics.maybe_flush()
+
+# ▼▼▼ [신규] Prometheus 수집 엔드포인트 ▼▼▼
+# METRICS_TOKEN 을 설정하면 Authorization: Bearer 토큰이 필요하고, 설정하지 않으면 같은 서버(loopback)에서
+# 프록시를 거치지 않고 직접 온 요청만 허용합니다. (기본은 외부에 공개하지 않음)
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    token = os.environ.get('METRICS_TOKEN')
+    if token:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            return jsonify({"success": False, "error": "인증이 필요합니다."}), 401
+    elif request.remote_addr not in ('127.0.0.1', '::1') or 'X-Forwarded-For' in request.headers:
+        return jsonify({"success": False, "error": "METRICS_TOKEN 을 설정해야 외부에서 조회할 수 있습니다."}), 403
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+# ==========================================================
+# 블록 7: 관리용 CLI 명령
+# ==========================================================
+@app.cli.command('sample-views')
+@click.option('--loop', is_flag=True, help='한 번만 수집하지 않고 주기적으로 계속 수집합니다.')
+def sample_views_command(loop):
+    """추적 중인 영상의 조회수 표본을 수집하고 오래된 표본을 정리합니다."""
+    if loop:
+        view_sampler.run_forever()
+        return
+    print(f"✅ 조회수 표본 {view_sampler.sample_once()}개 기록, 오래된 표본 {view_sampler.compact()}개 정리")
+
+# ▼▼▼ [신규] 최근 검색된 채널들의 새 업로드만 동기화 (cron 등으로 주기 실행, 채널당 보통 1 unit) ▼▼▼
+@app.cli.command('sync-channels')
+@click.option('--days', default=7, show_default=True, help='최근 며칠 안에 검색된 채널을 동기화할지')
+@click.option('--limit', default=500, show_default=True, help='한 번에 동기화할 최대 채널 수')
+def sync_channels_command(days, limit):
+    """최근 채널 모드로 검색된 채널들의 새 업로드를 미리 동기화합니다."""
+    synced = channel_syncer.sync_due(active_within=timedelta(days=days), limit=limit, quota_scheduler=quota_scheduler)
+    print(f"✅ 채널 {synced}개 동기화 완료")
+
+# ▼▼▼ [신규] 오래 새로고침하지 않은 저장 프로젝트들의 통계를 일괄 새로고침 (cron 등으로 주기 실행) ▼▼▼
+@app.cli.command('refresh-projects')
+@click.option('--older-than-hours', default=24, show_default=True, help='마지막 새로고침(또는 저장) 후 이 시간이 지난 프로젝트만')
+@click.option('--limit', default=1000, show_default=True, help='한 번에 새로고침할 최대 프로젝트 수')
+def refresh_projects_command(older_than_hours, limit):
+    """저장된 프로젝트들의 조회수/좋아요/구독자 수만 다시 조회하고 변화량을 기록합니다."""
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=older_than_hours)
+    last_refreshed = db.func.coalesce(Project.refreshed_at, Project.created_at)
+    project_ids = [row[0] for row in db.session.query(Project.id).filter(last_refreshed < cutoff).order_by(last_refreshed).limit(limit)]
+    result = project_refresher.refresh_many(project_ids, consume_quota=lambda units: consume_youtube_quota(None, units),
+                                            refund_quota=lambda units: quota_scheduler.refund(None, units))
+    quota_ledger.flush()  # 명령이 끝나기 전에 사용량을 기록 (결과를 출력한 뒤 멈춰도 빠지지 않도록)
+    print(f"✅ 프로젝트 {len(result['refreshed'])}개 새로고침, 쿼터 부족으로 {len(result['skipped'])}개 건너뜀")
+
+@app.cli.command('reset-metrics')
+def reset_metrics_command():
+    """이전 실행의 워커별 지표 파일을 지웁니다. (배포 직후, 워커를 띄우기 전에 실행)"""
+    print(f"✅ 지표 파일 {metrics.clear_files()}개 삭제")
+
+# ▼▼▼ [수정] 백그라운드 스레드(작업 큐 실행기, 조회수 표본 수집)는 import 시점이 아니라 워커의 첫 요청 때 시작합니다 ▼▼▼
+# GUNICORN_PRELOAD=1 이면 master 가 app 을 import 하므로, import 시점에 시작하면 스레드가 master 에서만 돌게 됩니다.
+# (flask CLI 명령도 app 을 import 하지만 요청을 처리하지 않으므로 스레드를 띄우지 않음)
+background_lock = threading.Lock()
+background_started = False
+
+@app.before_request
+def start_background_work():
+    global background_started
+    if background_started: return
+    with background_lock:
+        if background_started: return
+        background_started = True
+        job_queue.start()  # 재시작 전 워커가 남긴 대기 작업도 바로 처리
+        if os.environ.get('VIEW_SAMPLER_ENABLED') == '1':
+            view_sampler.start_background(lock_dir=default_lock_dir())
 
 # ==========================================================
 # 블록 8: 앱 실행
 # ==========================================================
+# ▼▼▼ [신규] WSGI 진입점: gunicorn -c gunicorn.conf.py (또는 gunicorn "app:get_app()") ▼▼▼
+# 무거운 SDK(google.generativeai, googleapiclient.discovery)는 처음 쓸 때 불러옵니다.
+# GUNICORN_PRELOAD=1 이면 master 가 get_app(warm=True) 로 미리 불러 두고, 워커는 fork 로 그대로 물려받습니다.
+def warm_up():
+    if GEMINI_API_KEY: gemini_models.warm_up()
+    if YOUTUBE_API_KEY: youtube_clients.get_service()  # discovery 문서 파싱까지 (네트워크 호출 없음)
+
+def after_fork():
+    # master 에서 만든 DB 커넥션/스레드 풀/잠금 상태는 자식 프로세스에서 쓰지 않습니다. (YouTube 서비스 객체는 유지)
+    global background_started
+    youtube_clients.after_fork()
+    job_queue.reset()
+    summary_map_reduce.reset()
+    search_flights.reset()
+    view_sampler.reset()
+    background_started = False
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+warmed_up = False
+
+def get_app(warm=False):
+    """모듈 전역 app 을 돌려줍니다. (팩토리가 아니므로 몇 번을 불러도 같은 인스턴스이고, warm_up 은 한 번만 실행)"""
+    global warmed_up
+    if warm and not warmed_up:
+        warm_up()
+        warmed_up = True
+    return app
+
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
@@ -0,0 +1,75 @@
+# ===================================================================
+#   benchmarks/bench_import_time.py (app.py import 시간: 즉시 로드 vs 지연 로드)
+# ===================================================================
+# 사용법: python -m benchmarks.bench_import_time [반복횟수]
+# 매번 새 파이썬 프로세스에서 측정합니다. (가짜 API 키를 쓰며 네트워크 호출은 없음)
+#   before: import app + warm_up()  → 예전처럼 모듈 로드 시점에 Gemini SDK / 모델 / discovery 문서를 모두 준비
+#   after : import app              → 로그인/대시보드만 처리하는 워커의 기동 비용
+#   first use: after 상태에서 처음 AI/YouTube 를 쓸 때 한 번 드는 비용 (warm_up)
+# 마지막에 -X importtime 으로 after 경로에서 오래 걸리는 모듈 상위 목록을 출력합니다.
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+MEASURE = """
+import time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+if {warm}: app.warm_up()
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def run_python(code, env, extra_args=()):
+    result = subprocess.run([sys.executable, *extra_args, '-c', code], env=env, capture_output=True, text=True, check=True)
+    return result
+
+
+def measure(env, warm, iterations):
+    import_times, warm_times = [], []
+    for _ in range(iterations):
+        output = run_python(MEASURE.format(warm=warm), env).stdout.strip().splitlines()[-1]
+        import_time, warm_time = map(float, output.split())
+        import_times.append(import_time * 1000)
+        warm_times.append(warm_time * 1000)
+    return import_times, warm_times
+
+
+def top_imports(env, count=10):
+    # -X importtime 출력(stderr)에서 최상위(app 바로 아래) 모듈을 누적 시간 순으로 정렬
+    stderr = run_python('import app', env, ('-X', 'importtime')).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line: continue
+        _, cumulative, name = line.split('|')
+        if name.startswith('   ') and not name.startswith('    '):  # 들여쓰기 한 단계 = app 이 직접 import 한 모듈
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = {**os.environ, 'DATABASE_URL': f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+               'GEMINI_API_KEY': 'offline-bench', 'YOUTUBE_API_KEY': 'offline-bench',
+               'PYTHONPATH': os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')]))}
+        env.pop('VIEW_SAMPLER_ENABLED', None)
+        eager_import, eager_warm = measure(env, True, iterations)
+        lazy_import, _ = measure(env, False, iterations)
+        eager_total = [a + b for a, b in zip(eager_import, eager_warm)]
+
+        print(f"app.py 기동 시간 ({iterations}회, 새 프로세스)")
+        print(f"before: import + 즉시 로드  mean {statistics.mean(eager_total):7.0f}ms  min {min(eager_total):7.0f}ms")
+        print(f"after : import (지연 로드)   mean {statistics.mean(lazy_import):7.0f}ms  min {min(lazy_import):7.0f}ms")
+        print(f"first use (warm_up 1회)      mean {statistics.mean(eager_warm):7.0f}ms")
+        print(f"워커 기동 절감: {statistics.mean(eager_total) - statistics.mean(lazy_import):.0f}ms")
+        print("\nafter 경로에서 오래 걸리는 import (누적):")
+        for cumulative, name in top_imports(env):
+            print(f"  {cumulative / 1000:7.0f}ms  {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+# ===================================================================
+#   benchmarks/bench_json_response.py (parse → jsonify vs 직렬화된 바이트 응답)
+# ===================================================================
+# 사용법: python -m benchmarks.bench_json_response
+# 캐시 적중 시 응답을 만드는 세 가지 경로를 비교합니다.
+#   before : json.loads(저장된 문자열) → jsonify (표준 json)
+#   miss   : orjson.loads → orjson.dumps (FastJSONProvider 와 같은 인코더)
+#   hit    : 응답 캐시에 있는 바이트를 그대로 전송
+import json
+from datetime import datetime, timezone
+
+from flask import Flask, jsonify
+
+from benchmarks.bench_search_metrics import _best_of, make_raw_items
+from json_codec import JSONBody, dumps_bytes, loads
+from search_metrics import apply_search_filters
+
+
+def main():
+    now_time = datetime.now(timezone.utc)
+    app = Flask(__name__)
+    for count in (50, 500):
+        stored_text = json.dumps({'items': apply_search_filters(make_raw_items(count), {}, now_time)})
+        cached_body = JSONBody(dumps_bytes(loads(stored_text)))
+        with app.app_context():
+            before = _best_of(lambda: jsonify(json.loads(stored_text)).get_data(), 50)
+            miss = _best_of(lambda: app.response_class(dumps_bytes(loads(stored_text))).get_data(), 50)
+            hit = _best_of(lambda: app.response_class(cached_body.raw).get_data(), 50)
+        print(f"{count:>4}개 영상   before {before * 1000:7.2f}ms   miss {miss * 1000:7.2f}ms   hit {hit * 1000:7.3f}ms   "
+              f"본문 {len(cached_body.raw) / 1024:6.1f}KB → gzip {len(cached_body.gzip()) / 1024:5.1f}KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# ===================================================================
+#   benchmarks/bench_keywords.py (번역+키워드 2회 호출 vs 1회 호출 vs 캐시)
+# ===================================================================
+# 사용법: python -m benchmarks.bench_keywords
+# 가짜 Gemini 모델(호출당 고정 지연)로 비영어권(en) 연관 키워드 요청 한 건의 지연을 비교합니다.
+#   before : 번역 호출 → 키워드 호출 (순차 2회, find('{')/rfind('}') 파싱)
+#   miss   : 번역을 포함한 JSON 응답 1회 (keywords.parse_keyword_response)
+#   hit    : 메모리 캐시에서 바로 반환 (keyword_cache 의 LRU 단계에 해당)
+import json
+import time
+
+from benchmarks.fakes import FakeGeminiModel
+from keywords import build_keyword_prompt, parse_keyword_response
+
+JSON_CONFIG = {'response_mime_type': 'application/json'}
+
+
+def legacy(model, query):
+    translated = model.generate_content(f"Translate the following text to English.\n\n{query}").text.strip()
+    text = model.generate_content(build_keyword_prompt(translated, 'en', translated), generation_config=JSON_CONFIG).text
+    return json.loads(text[text.find('{'):text.rfind('}') + 1])
+
+
+def single(model, query):
+    return parse_keyword_response(model.generate_content(build_keyword_prompt(query, 'en'), generation_config=JSON_CONFIG).text, query)
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    model = FakeGeminiModel(base_latency=0.6)  # flash 모델 왕복 지연을 대략 흉내
+    cache = {}
+    before = timed(lambda: legacy(model, '쿠팡꿀템'))
+    miss = timed(lambda: cache.setdefault(('en', '쿠팡꿀템'), single(model, '쿠팡꿀템')))
+    hit = timed(lambda: cache[('en', '쿠팡꿀템')])
+    print(f"before {before * 1000:7.0f}ms (호출 2회)   miss {miss * 1000:7.0f}ms (호출 1회)   hit {hit * 1000:7.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# ===================================================================
+#   benchmarks/bench_search_metrics.py (행 단위 루프 vs 열 단위 후처리)
+# ===================================================================
+# 사용법: python -m benchmarks.bench_search_metrics
+# 기존 search() 의 영상별 루프(isodate + datetime.fromisoformat)와
+# search_metrics.apply_search_filters 를 같은 입력으로 비교하고,
+# 두 결과가 완전히 같은지도 함께 확인합니다.
+import time
+from datetime import datetime, timezone, timedelta
+
+import isodate
+
+from benchmarks.fakes import FakeYouTubeBackend
+from search_metrics import apply_search_filters, parse_iso_duration
+
+PARAMS = {'minViews': '10000', 'useVPH': True, 'minVPH': '100', 'videoLength': 'medium', 'excludeKids': True}
+
+
+def legacy_apply_search_filters(raw_items, params, now_time):
+    # 열 단위 처리 이전의 search() 루프를 그대로 옮긴 기준 구현
+    results = []
+    for raw in raw_items:
+        if params.get('excludeKids') and raw['madeForKids']: continue
+
+        views = raw['viewCount']
+        if views < int(params.get('minViews', 0)): continue
+
+        published_time = datetime.fromisoformat(raw['publishedAt'].replace('Z', '+00:00'))
+        diff_hours = (now_time - published_time).total_seconds() / 3600
+        vph = round(views / diff_hours) if diff_hours >= 1 else views
+        if params.get('useVPH') and vph < int(params.get('minVPH', 0)): continue
+
+        duration_seconds = isodate.parse_duration(raw['duration']).total_seconds()
+        length_filter = params.get('videoLength')
+        if length_filter == 'short' and duration_seconds >= 240: continue
+        if length_filter == 'medium' and (duration_seconds < 240 or duration_seconds > 1200): continue
+        if length_filter == 'long' and duration_seconds <= 1200: continue
+
+        likes = raw['likeCount']
+        subscribers = raw['subscriberCount']
+        ratio = round((views / subscribers) * 100, 2) if subscribers > 0 else 0
+        like_ratio = round((likes / views) * 100, 2) if views > 0 else 0
+
+        results.append({
+            'videoId': raw['videoId'], 'channelId': raw['channelId'], 'title': raw['title'],
+            'channelTitle': raw['channelTitle'], 'publishedAt': raw['publishedAt'],
+            'thumbnail': raw['thumbnail'],
+            'viewCount': views, 'likeCount': likes, 'subscriberCount': subscribers,
+            'ratio': ratio, 'likeRatio': like_ratio, 'vph': vph,
+            'publishedAt_timestamp': published_time.timestamp(),
+            'publishedAt_formatted': published_time.strftime('%y-%m-%d'),
+            'duration_seconds': duration_seconds,
+            'duration_formatted': str(timedelta(seconds=int(duration_seconds))),
+            'captionAvailable': raw['captionAvailable']
+        })
+    return results
+
+
+def make_raw_items(count):
+    backend = FakeYouTubeBackend()
+    ids = [f"bench{i:06d}"[:11] for i in range(count)]
+    videos = backend._videos({'id': ','.join(ids)})['items']
+    return [{
+        'videoId': item['id'], 'channelId': item['snippet']['channelId'], 'title': item['snippet']['title'],
+        'channelTitle': item['snippet']['channelTitle'], 'publishedAt': item['snippet']['publishedAt'],
+        'thumbnail': item['snippet']['thumbnails']['high']['url'],
+        'viewCount': int(item['statistics']['viewCount']), 'likeCount': int(item['statistics']['likeCount']),
+        'subscriberCount': (i * 7919) % 300_000, 'madeForKids': item['status']['madeForKids'],
+        'duration': item['contentDetails']['duration'], 'captionAvailable': item['contentDetails']['caption'] == 'true',
+    } for i, item in enumerate(videos)]
+
+
+def _best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    now_time = datetime.now(timezone.utc)
+    for count in (50, 1000, 5000, 20000):
+        raw_items = make_raw_items(count)
+        legacy = legacy_apply_search_filters(raw_items, PARAMS, now_time)
+        columnar = apply_search_filters(raw_items, PARAMS, now_time)
+        assert legacy == columnar, "열 단위 결과가 기존 루프와 다릅니다."
+
+        repeat = 20 if count <= 1000 else 5
+        before = _best_of(lambda: legacy_apply_search_filters(raw_items, PARAMS, now_time), repeat)
+        parse_iso_duration.cache_clear()
+        after = _best_of(lambda: apply_search_filters(raw_items, PARAMS, now_time), repeat)
+        print(f"{count:>6}행 (통과 {len(columnar):>5})   loop {before * 1000:8.2f}ms   columnar {after * 1000:8.2f}ms   x{before / after:5.1f}")
+
+
+if __name__ == '__main__':
+    main()
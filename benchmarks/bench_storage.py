@@ -0,0 +1,74 @@
+# ===================================================================
+#     benchmarks/bench_storage.py (JSON TEXT vs gzip 압축 컬럼 비교)
+# ===================================================================
+# 사용법: python -m benchmarks.bench_storage [행 수]
+# 50개짜리 검색 결과 스냅샷을 임시 SQLite 파일에 TEXT 와 CompressedJSONText 로
+# 각각 저장한 뒤, 저장 크기(컬럼 합계 + DB 파일 크기), 쓰기 시간과
+# "전체 읽기 + 파싱(앱과 같은 json_codec.loads)" 시간을 비교합니다.
+#   gzip level 6 / level 1: 크기와 관계없이 모두 압축했을 때 (level 6 은 이전 설정)
+#   CompressedJSONText (현재): COMPRESS_MIN_BYTES 이상인 값만 level 1 로 압축 (json_codec.py 참고)
+# 읽기 시간은 OS 페이지 캐시가 데워진 상태에서 3번 중 가장 빠른 값입니다.
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, create_engine, func, insert, select
+
+from benchmarks.bench_search_metrics import make_raw_items
+import json_codec
+from json_codec import CompressedJSONText, loads
+from search_metrics import apply_search_filters
+
+
+def make_payloads(count):
+    now_time = datetime.now(timezone.utc)
+    raw_items = make_raw_items(count * 10)
+    # 같은 영상이 여러 스냅샷에 겹쳐 나오는 실제 사용 패턴을 흉내 냅니다.
+    return [json.dumps(apply_search_filters(raw_items[i * 10:i * 10 + 50], {}, now_time)) for i in range(count)]
+
+
+def run(column_type, payloads, db_path):
+    engine = create_engine(f'sqlite:///{db_path}')
+    table = Table('payloads', MetaData(), Column('id', Integer, primary_key=True), Column('body', column_type))
+    table.metadata.create_all(engine)
+    with engine.begin() as connection:
+        start = time.perf_counter()
+        connection.execute(insert(table), [{'body': payload} for payload in payloads])
+        write_time = time.perf_counter() - start
+    with engine.connect() as connection:
+        stored_bytes = connection.execute(select(func.sum(func.length(table.c.body.cast(Text) if column_type is Text else table.c.body)))).scalar()
+        read_time = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            for (body,) in connection.execute(select(table.c.body)):
+                loads(body)
+            read_time = min(read_time, time.perf_counter() - start)
+    engine.dispose()
+    return stored_bytes, os.path.getsize(db_path), write_time, read_time
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    payloads = make_payloads(count)
+    print(f"검색 결과 스냅샷 {count}개 (각 50개 영상)")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        default_level, default_min_bytes = json_codec.STORAGE_COMPRESS_LEVEL, json_codec.COMPRESS_MIN_BYTES
+        for index, (label, column_type, level, min_bytes) in enumerate((
+                ('TEXT', Text, None, None),
+                ('gzip level 6', CompressedJSONText, 6, 0),
+                ('gzip level 1', CompressedJSONText, 1, 0),
+                ('CompressedJSONText', CompressedJSONText, default_level, default_min_bytes))):
+            if column_type is CompressedJSONText:
+                json_codec.STORAGE_COMPRESS_LEVEL, json_codec.COMPRESS_MIN_BYTES = level, min_bytes
+            stored_bytes, file_bytes, write_time, read_time = run(column_type, payloads, os.path.join(tmp_dir, f"{index}.db"))
+            baseline = baseline or stored_bytes
+            print(f"{label:<26} 컬럼 {stored_bytes / 1024:8.1f}KB ({stored_bytes / baseline * 100:5.1f}%)   DB 파일 {file_bytes / 1024:8.1f}KB   "
+                  f"쓰기 {write_time * 1000:7.1f}ms   읽기+파싱 {read_time * 1000:7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# ===================================================================
+#   benchmarks/bench_summarizer.py (긴 스크립트: 단일 호출 vs map-reduce)
+# ===================================================================
+# 사용법: python -m benchmarks.bench_summarizer [스크립트 글자 수]
+# 가짜 Gemini 모델(입력 길이에 비례해 느려짐)로 다음을 비교합니다.
+#   single     : 스크립트 전체를 한 번에 요약 (기존 get_summary)
+#   map-reduce : 구간별 요약을 동시에 실행한 뒤 구간 요약으로 최종 요약
+#   prompt 변경 : 구간 요약 캐시가 채워진 상태에서 프롬프트만 바꿔 다시 요약
+import random
+import sys
+import time
+
+from benchmarks.fakes import FakeGeminiModel
+from summarizer import MapReduceSummarizer, estimate_tokens
+
+
+class DictCache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def put(self, key, payload):
+        self.data[key] = payload
+
+
+def make_script(chars):
+    random.seed(7)
+    words, total = [], 0
+    while total < chars:
+        word = ''.join(random.choice('가나다라마바사아자차카타파하') for _ in range(random.randint(1, 5)))
+        words.append(word + ('.' if random.random() < 0.08 else ''))
+        total += len(word) + 1
+    return ' '.join(words)
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    chars = int(sys.argv[1]) if len(sys.argv) > 1 else 120000
+    script = make_script(chars)
+    # 입력 1천 글자당 0.02초, 고정 0.3초 (flash 기준 대략적인 비율을 축소한 값)
+    single_model = FakeGeminiModel(base_latency=0.3, latency_per_1k_chars=0.02)
+    single = timed(lambda: single_model.generate_content(f"요약해줘\n\n{script}"))
+
+    map_model = FakeGeminiModel(base_latency=0.3, latency_per_1k_chars=0.02)
+    reduce_model = FakeGeminiModel(base_latency=0.3, latency_per_1k_chars=0.02)
+    summarizer = MapReduceSummarizer(map_model, 'fake-flash', chunk_cache=DictCache(), chunk_tokens=8000, max_workers=4)
+    first = timed(lambda: summarizer.summarize(script, '요약해줘', reduce_model))
+    map_calls = map_model.calls
+    second = timed(lambda: summarizer.summarize(script, '후킹 요소만 뽑아줘', reduce_model))
+
+    print(f"스크립트 {len(script)}자 (추정 {estimate_tokens(script)} 토큰)")
+    print(f"single        {single * 1000:8.0f}ms   최대 입력 {max(single_model.prompt_chars):>7}자")
+    print(f"map-reduce    {first * 1000:8.0f}ms   구간 {map_calls}개, 최대 입력 {max(map_model.prompt_chars + reduce_model.prompt_chars):>7}자")
+    print(f"prompt 변경   {second * 1000:8.0f}ms   추가 map 호출 {map_model.calls - map_calls}회")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# ===================================================================
+#    benchmarks/bench_youtube_client.py (build() 매번 호출 vs 클라이언트 재사용)
+# ===================================================================
+# 사용법: python -m benchmarks.bench_youtube_client [반복횟수]
+# 가짜 HTTP 계층을 쓰므로 네트워크 없이 실행됩니다. /api/search 캐시 미스 1회와
+# 같은 search.list → videos.list → channels.list 호출 묶음을 기준으로 측정합니다.
+import statistics
+import sys
+import time
+
+from googleapiclient.discovery import build
+
+from benchmarks.fakes import FakeHttp, FakeYouTubeBackend
+from youtube_client import YouTubeClientManager
+
+CONNECT_LATENCY = 0.005  # 새 커넥션마다 5ms 핸드셰이크 비용을 가정
+
+
+def _run_search(youtube):
+    search = youtube.search().list(part='snippet', q='bench', type='video', maxResults=50).execute()
+    ids = [item['id']['videoId'] for item in search['items']]
+    videos = youtube.videos().list(part='statistics,contentDetails,status,snippet', id=','.join(ids)).execute()
+    channel_ids = {item['snippet']['channelId'] for item in videos['items']}
+    youtube.channels().list(part='statistics', id=','.join(channel_ids)).execute()
+
+
+def bench_build_per_request(backend, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        youtube = build('youtube', 'v3', developerKey='bench', http=FakeHttp(backend, CONNECT_LATENCY), cache_discovery=False)
+        _run_search(youtube)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_shared_client(backend, iterations):
+    manager = YouTubeClientManager('bench', http_factory=lambda: FakeHttp(backend, CONNECT_LATENCY))
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        _run_search(manager.get_service())
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label, timings):
+    ms = sorted(t * 1000 for t in timings)
+    print(f"{label:<28} mean {statistics.mean(ms):7.2f}ms   p50 {ms[len(ms) // 2]:7.2f}ms   max {ms[-1]:7.2f}ms")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    backend = FakeYouTubeBackend()
+    before = bench_build_per_request(backend, iterations)
+    after = bench_shared_client(backend, iterations)
+    print(f"YouTube 클라이언트 오버헤드 ({iterations}회, connect_latency={CONNECT_LATENCY * 1000:.0f}ms)")
+    _report("before: build() per request", before)
+    _report("after: shared client", after)
+    print(f"요청당 절감: {(statistics.mean(before) - statistics.mean(after)) * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
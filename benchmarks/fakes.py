@@ -0,0 +1,196 @@
+# ===================================================================
+#     benchmarks/fakes.py (네트워크 없이 쓰는 가짜 YouTube / Gemini 백엔드)
+# ===================================================================
+# httplib2.Http 를 흉내 내는 가짜 전송 계층입니다. googleapiclient 가 만든
+# 요청 URL 을 보고 search / videos / channels / playlistItems 응답을 결정적으로 만들어 줍니다.
+# 채널 업로드 재생목록은 채널마다 UPLOADS_PER_CHANNEL 개로 시작하며, add_uploads() 로 새 업로드를 흉내 냅니다.
+# - connect_latency: 새 Http 인스턴스의 첫 요청에만 붙는 지연 (TCP+TLS 핸드셰이크 흉내)
+# - request_latency: 매 요청마다 붙는 지연 (네트워크 왕복 흉내)
+#
+# FakeGeminiModel 은 genai.GenerativeModel 의 generate_content 만 흉내 냅니다.
+# 지연 = base_latency + 입력 길이 비례 + 출력 조각 수 비례 (stream=True 면 조각 단위로 나눠 돌려줌)
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse, parse_qs
+
+import httplib2
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+UPLOADS_PER_CHANNEL = 300
+
+
+def _seed(text):
+    return int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+
+
+def fake_video_id(query, index):
+    return hashlib.md5(f"{query}:{index}".encode('utf-8')).hexdigest()[:11]
+
+
+def fake_channel_id(video_id):
+    # 영상 8개당 채널 하나 정도가 겹치도록 만듭니다.
+    return 'UC' + hashlib.md5(f"ch:{_seed(video_id) % 997}".encode('utf-8')).hexdigest()[:22]
+
+
+class FakeYouTubeBackend:
+    """요청 횟수를 엔드포인트별로 세는, 스레드 안전한 가짜 YouTube 응답기."""
+
+    def __init__(self, request_latency=0.0):
+        self.request_latency = request_latency
+        self.calls = {}
+        self.new_uploads = {}  # {channelId: 시작 이후 추가된 업로드 수}
+        self._lock = threading.Lock()
+
+    def _count(self, endpoint):
+        with self._lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+
+    def add_uploads(self, channel_id, count):
+        with self._lock:
+            self.new_uploads[channel_id] = self.new_uploads.get(channel_id, 0) + count
+
+    def handle(self, uri):
+        if self.request_latency:
+            time.sleep(self.request_latency)
+        parsed = urlparse(uri)
+        endpoint = parsed.path.rsplit('/', 1)[-1]
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        self._count(endpoint)
+        handler = getattr(self, f"_{endpoint}", None)
+        if handler is None:
+            return 404, {'error': {'code': 404, 'message': f"unknown endpoint {endpoint}"}}
+        return 200, handler(query)
+
+    def _search(self, q):
+        if q.get('type') == 'channel':
+            return {'items': [{'id': {'channelId': fake_channel_id(q.get('q', ''))},
+                               'snippet': {'channelId': fake_channel_id(q.get('q', '')), 'title': q.get('q', '')}}]}
+        seed_text = q.get('q') or q.get('channelId', '')
+        page = int(q.get('pageToken', '0') or 0)
+        count = int(q.get('maxResults', 5) or 5)
+        items = []
+        for i in range(page * count, (page + 1) * count):
+            vid = fake_video_id(seed_text, i)
+            published = BASE_TIME - timedelta(hours=(_seed(vid) % 2000) + 1)
+            items.append({
+                'id': {'kind': 'youtube#video', 'videoId': vid},
+                'snippet': {'channelId': q.get('channelId') or fake_channel_id(vid), 'title': f"{seed_text} video {i}",
+                            'channelTitle': f"channel {_seed(vid) % 997}",
+                            'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ')},
+            })
+        return {'items': items, 'nextPageToken': str(page + 1)}
+
+    def _videos(self, q):
+        items = []
+        for vid in filter(None, q.get('id', '').split(',')):
+            seed = _seed(vid)
+            published = BASE_TIME - timedelta(hours=(seed % 2000) + 1)
+            items.append({
+                'id': vid,
+                'snippet': {'channelId': fake_channel_id(vid), 'title': f"video {vid}", 'channelTitle': f"channel {seed % 997}",
+                            'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                            'thumbnails': {'high': {'url': f"https://i.ytimg.com/vi/{vid}/hqdefault.jpg"}}},
+                'statistics': {'viewCount': str(seed % 5_000_000), 'likeCount': str(seed % 50_000)},
+                'contentDetails': {'duration': f"PT{seed % 3}H{seed % 60}M{seed % 59}S", 'caption': 'true' if seed % 2 else 'false'},
+                'status': {'madeForKids': seed % 11 == 0},
+            })
+        return {'items': items}
+
+    def _channels(self, q):
+        if q.get('forHandle'):
+            return {'items': [{'id': fake_channel_id(q['forHandle'].lower())}]}
+        return {'items': [{'id': cid, 'statistics': {'subscriberCount': str(_seed(cid) % 2_000_000)}}
+                          for cid in filter(None, q.get('id', '').split(','))]}
+
+    def _playlistItems(self, q):
+        # 업로드 재생목록(UU…)은 최신순. i 번째 업로드(0 이 가장 오래됨)는 i 시간 간격으로 올라왔다고 가정합니다.
+        channel_id = 'UC' + q.get('playlistId', '')[2:]
+        total = UPLOADS_PER_CHANNEL + self.new_uploads.get(channel_id, 0)
+        offset = int(q.get('pageToken', '0') or 0)
+        count = int(q.get('maxResults', 5) or 5)
+        items = []
+        for position in range(offset, min(offset + count, total)):
+            index = total - 1 - position
+            vid = fake_video_id(channel_id, index)
+            published = (BASE_TIME + timedelta(hours=index)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            items.append({
+                'snippet': {'channelId': channel_id, 'title': f"{channel_id} upload {index}", 'channelTitle': f"channel {channel_id[-4:]}",
+                            'videoOwnerChannelId': channel_id, 'videoOwnerChannelTitle': f"channel {channel_id[-4:]}",
+                            'resourceId': {'kind': 'youtube#video', 'videoId': vid}, 'publishedAt': published},
+                'contentDetails': {'videoId': vid, 'videoPublishedAt': published},
+            })
+        response = {'items': items}
+        if offset + count < total: response['nextPageToken'] = str(offset + count)
+        return response
+
+
+class FakeHttp:
+    """httplib2.Http 대용. 인스턴스마다 첫 요청에 connect_latency 가 붙습니다."""
+
+    def __init__(self, backend, connect_latency=0.0):
+        self.backend = backend
+        self.connect_latency = connect_latency
+        self.connected = False
+        self.redirect_codes = set(httplib2.REDIRECT_CODES) - {308}
+        self.timeout = None
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        if not self.connected:
+            if self.connect_latency:
+                time.sleep(self.connect_latency)
+            self.connected = True
+        status, payload = self.backend.handle(uri)
+        return httplib2.Response({'status': str(status), 'content-type': 'application/json'}), json.dumps(payload).encode('utf-8')
+
+    def close(self):
+        self.connected = False
+
+
+class FakeGeminiResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """prompt 해시로 결정적인 응답을 만드는 가짜 Gemini 모델. 호출 수와 입력 길이를 기록합니다."""
+
+    def __init__(self, base_latency=0.0, latency_per_1k_chars=0.0, chunk_latency=0.0, chunks=8):
+        self.base_latency = base_latency
+        self.latency_per_1k_chars = latency_per_1k_chars
+        self.chunk_latency = chunk_latency
+        self.chunks = chunks
+        self.calls = 0
+        self.prompt_chars = []
+        self._lock = threading.Lock()
+
+    def _text_chunks(self, prompt):
+        digest = hashlib.md5(prompt.encode('utf-8')).hexdigest()
+        return [f"**요점 {index + 1}** {digest[index * 4:index * 4 + 4]} 내용입니다.\n" for index in range(self.chunks)]
+
+    def _json_text(self, prompt):
+        # 연관 키워드처럼 JSON 응답을 요청한 경우 (response_mime_type=application/json)
+        digest = hashlib.md5(prompt.encode('utf-8')).hexdigest()
+        keywords = [{'original': f"키워드 {digest[index * 3:index * 3 + 3]}", 'korean': f"키워드 {index + 1}"} for index in range(10)]
+        return json.dumps({'translated_query': f"query-{digest[:6]}", 'keywords': keywords}, ensure_ascii=False)
+
+    def generate_content(self, prompt, stream=False, generation_config=None):
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars.append(len(prompt))
+        time.sleep(self.base_latency + len(prompt) / 1000 * self.latency_per_1k_chars)
+        if (generation_config or {}).get('response_mime_type') == 'application/json':
+            time.sleep(self.chunk_latency * self.chunks)
+            return FakeGeminiResponse(self._json_text(prompt))
+        text_chunks = self._text_chunks(prompt)
+        if not stream:
+            time.sleep(self.chunk_latency * len(text_chunks))
+            return FakeGeminiResponse(''.join(text_chunks))
+        return self._stream(text_chunks)
+
+    def _stream(self, text_chunks):
+        for text in text_chunks:
+            time.sleep(self.chunk_latency)
+            yield FakeGeminiResponse(text)
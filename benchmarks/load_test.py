@@ -0,0 +1,234 @@
+# ===================================================================
+#   benchmarks/load_test.py (가짜 YouTube / Gemini 로 Flask 앱 전체 부하 테스트)
+# ===================================================================
+# 사용법: python -m benchmarks.load_test [--users 8] [--requests 200] [--youtube-latency 0.05] ...
+# 네트워크 없이 실행됩니다.
+#   - YouTube: googleapiclient 요청 생성은 그대로 두고, HTTP 전송 계층만 FakeHttp 로 바꿉니다.
+#   - Gemini : gemini_pro_model / gemini_flash_model 을 FakeGeminiModel 로 바꿉니다.
+#   - DB     : 임시 SQLite 파일 (작업 큐 파일도 임시 디렉터리)
+# 로그인한 가상 사용자 여러 명이 각자 test_client 로 동시에 요청을 보내며,
+# 시나리오(단계)별로 p50/p95/p99 지연, 처리량, 캐시 적중률, 요청당 DB 쿼리 수를 출력합니다.
+#   search_miss  : 처음 보는 검색어 (search.list 호출)
+#   search_hit   : 이미 검색한 검색어에 필터만 바꿔 다시 검색 (DB 검색 캐시 / 응답 캐시)
+#   project_save : 검색 결과를 프로젝트로 저장
+#   project_load : 저장된 프로젝트 불러오기
+#   summary_miss : 처음 보는 스크립트 요약 (Gemini 호출)
+#   summary_hit  : 같은 스크립트 + 프롬프트 다시 요약 (요약 캐시)
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sqlalchemy import event
+
+from benchmarks.bench_summarizer import make_script
+from benchmarks.fakes import FakeGeminiModel, FakeHttp, FakeYouTubeBackend
+
+SEARCH_PARAMS = {'searchType': 'keyword', 'videoLength': 'any', 'period': '30', 'region': 'KR', 'sortOrder': 'relevance',
+                 'minViews': '1000', 'useVPH': False, 'minVPH': '100', 'maxResults': '50', 'excludeKids': False, 'language': 'ko'}
+SUMMARY_PROMPT = '이 영상의 핵심 내용을 요약하고 성공 요인을 3가지로 정리해주세요.'
+
+
+def load_app(tmp_dir, args):
+    # app 모듈은 import 할 때 환경 변수를 읽으므로 먼저 설정합니다.
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp_dir, 'load-test.db')}"
+    os.environ['JOB_QUEUE_PATH'] = os.path.join(tmp_dir, 'jobs.db')
+    os.environ['METRICS_DIR'] = os.path.join(tmp_dir, 'metrics')
+    os.environ.setdefault('YOUTUBE_API_KEY', 'offline-load-test')
+    os.environ.pop('GEMINI_API_KEY', None)
+    os.environ.pop('VIEW_SAMPLER_ENABLED', None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as appmod
+
+    backend = FakeYouTubeBackend(request_latency=args.youtube_latency)
+    appmod.youtube_clients._http_factory = lambda: FakeHttp(backend, connect_latency=args.connect_latency)
+    appmod.youtube_clients.reset()
+
+    gemini = FakeGeminiModel(base_latency=args.gemini_latency, latency_per_1k_chars=0.002, chunk_latency=0.01)
+    appmod.gemini_pro_model = appmod.gemini_flash_model = gemini
+    appmod.summary_map_reduce.map_model = gemini
+    appmod.generation_config = {'temperature': 0.7}
+
+    # 부하 테스트가 쿼터 한도에 걸리지 않도록 예산을 넉넉하게 잡습니다.
+    appmod.quota_scheduler = appmod.QuotaScheduler(appmod.quota_ledger, daily_budget=10**9, user_daily_budget=10**9)
+    with appmod.app.app_context():
+        appmod.db.create_all()
+    return appmod, backend, gemini
+
+
+class QueryCounter:
+    """요청 스레드별로 실행된 SQL 문 수를 셉니다."""
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+
+    def reset(self):
+        self._local.count = 0
+
+    def value(self):
+        return getattr(self._local, 'count', 0)
+
+
+class VirtualUser:
+    def __init__(self, appmod, index):
+        self.client = appmod.app.test_client()
+        self.index = index
+        response = self.client.post('/api/register', json={'username': f'load{index}', 'email': f'load{index}@example.com', 'password': 'pw'})
+        if response.status_code != 200:
+            raise RuntimeError(f"가상 사용자 {index} 등록 실패: {response.status_code}")
+        self.project_ids = []
+
+
+def run_phase(name, users, operations, counter):
+    """operations: [(user_index, func(user) -> 성공 여부)] 를 사용자별로 순서대로, 사용자끼리는 동시에 실행합니다."""
+    by_user = {}
+    for user_index, operation in operations:
+        by_user.setdefault(user_index, []).append(operation)
+    latencies, query_counts, errors = [], [], 0
+    lock = threading.Lock()
+
+    def run_user(user_index):
+        nonlocal errors
+        user = users[user_index]
+        for operation in by_user[user_index]:
+            counter.reset()
+            start = time.perf_counter()
+            try:
+                ok = operation(user)
+            except Exception as e:
+                print(f"❌ [{name}] {e}")
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                query_counts.append(counter.value())
+                if not ok: errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(by_user)) as executor:
+        list(executor.map(run_user, by_user))
+    wall_time = time.perf_counter() - started
+    return {'name': name, 'requests': len(latencies), 'errors': errors, 'wall_time': wall_time,
+            'latencies': np.array(latencies) * 1000, 'queries': np.array(query_counts)}
+
+
+def print_report(result, hit_rate=None):
+    latencies = result['latencies']
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0, 0, 0)
+    hit_text = f"{hit_rate * 100:5.1f}%" if hit_rate is not None else '    -'
+    print(f"{result['name']:<13} {result['requests']:>5} {result['errors']:>4} {result['requests'] / result['wall_time']:>8.1f} "
+          f"{p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {hit_text:>7} {result['queries'].mean() if len(result['queries']) else 0:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='가짜 YouTube / Gemini 백엔드로 Flask 앱 부하 테스트')
+    parser.add_argument('--users', type=int, default=8, help='동시 가상 사용자 수')
+    parser.add_argument('--requests', type=int, default=200, help='시나리오별 요청 수')
+    parser.add_argument('--youtube-latency', type=float, default=0.05, help='YouTube 요청당 지연(초)')
+    parser.add_argument('--connect-latency', type=float, default=0.1, help='새 HTTP 커넥션의 첫 요청 지연(초)')
+    parser.add_argument('--gemini-latency', type=float, default=0.3, help='Gemini 호출 기본 지연(초)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        appmod, backend, gemini = load_app(tmp_dir, args)
+        with appmod.app.app_context():
+            counter = QueryCounter(appmod.db.engine)
+        users = [VirtualUser(appmod, index) for index in range(args.users)]
+        request_count = args.requests
+        miss_queries = [f"부하 테스트 검색어 {index}" for index in range(request_count)]
+
+        def search(query, min_views='1000'):
+            def operation(user):
+                response = user.client.post('/api/search', json={**SEARCH_PARAMS, 'query': query, 'minViews': min_views})
+                return response.status_code == 200
+            return operation
+
+        def save_project(query):
+            def operation(user):
+                items = user.client.post('/api/search', json={**SEARCH_PARAMS, 'query': query}).get_json().get('items', [])
+                response = user.client.post('/api/project/save', json={'projectName': query, 'searchParams': {**SEARCH_PARAMS, 'query': query},
+                                                                       'searchResults': items})
+                return response.status_code == 200
+            return operation
+
+        def load_project(user):
+            if not user.project_ids: return False
+            response = user.client.get(f"/api/project/get/{random.choice(user.project_ids)}")
+            return response.status_code == 200
+
+        def summarize(script):
+            def operation(user):
+                response = user.client.post('/api/get_summary', json={'transcript': script, 'prompt': SUMMARY_PROMPT, 'model': 'gemini-flash-latest'})
+                while response.status_code == 202:  # 작업 큐에서 아직 생성 중
+                    response = user.client.get(f"/api/jobs/{response.get_json()['job']['id']}?wait=2")
+                data = response.get_json()
+                return response.status_code == 200 and data.get('success') and (data.get('job') or {}).get('status', 'done') == 'done'
+            return operation
+
+        def user_index(index):
+            return index % len(users)
+
+        print(f"가상 사용자 {len(users)}명, 시나리오별 요청 {request_count}개, YouTube 지연 {args.youtube_latency * 1000:.0f}ms, "
+              f"Gemini 지연 {args.gemini_latency * 1000:.0f}ms (오프라인)")
+        print(f"{'scenario':<13} {'req':>5} {'err':>4} {'req/s':>8} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'cache':>7} {'db q/req':>7}")
+
+        with contextlib.redirect_stdout(io.StringIO()) as app_log:
+            # 1) search_miss: 모두 처음 보는 검색어
+            backend.calls.clear()
+            miss = run_phase('search_miss', users, [(user_index(i), search(query)) for i, query in enumerate(miss_queries)], counter)
+            miss_hit_rate = 1 - backend.calls.get('search', 0) / max(miss['requests'], 1)
+
+            # 2) search_hit: 같은 검색어, 필터만 다르게 (응답 캐시 또는 DB 검색 캐시에서 처리되어야 함)
+            backend.calls.clear()
+            hit = run_phase('search_hit', users, [(user_index(i), search(random.choice(miss_queries), random.choice(['0', '1000', '50000', '200000'])))
+                                                   for i in range(request_count)], counter)
+            hit_rate = 1 - backend.calls.get('search', 0) / max(hit['requests'], 1)
+
+            # 3) project_save / project_load
+            save = run_phase('project_save', users, [(user_index(i), save_project(miss_queries[i])) for i in range(request_count)], counter)
+            with appmod.app.app_context():
+                for user in users:
+                    owner = appmod.User.query.filter_by(username=f'load{user.index}').first()
+                    user.project_ids = [project.id for project in appmod.Project.query.filter_by(user_id=owner.id).all()]
+            load = run_phase('project_load', users, [(user_index(i), load_project) for i in range(request_count)], counter)
+
+            # 4) summary_miss / summary_hit
+            base_script = make_script(3000)
+            scripts = [f"{index}번 영상. {base_script}" for index in range(max(request_count // 4, 1))]
+            calls_before = gemini.calls
+            summary_miss = run_phase('summary_miss', users, [(user_index(i), summarize(script)) for i, script in enumerate(scripts)], counter)
+            summary_miss_rate = 1 - (gemini.calls - calls_before) / max(summary_miss['requests'], 1)
+            calls_before = gemini.calls
+            summary_hit = run_phase('summary_hit', users, [(user_index(i), summarize(random.choice(scripts))) for i in range(len(scripts))], counter)
+            summary_hit_rate = 1 - (gemini.calls - calls_before) / max(summary_hit['requests'], 1)
+
+        print_report(miss, miss_hit_rate)
+        print_report(hit, hit_rate)
+        print_report(save)
+        print_report(load)
+        print_report(summary_miss, summary_miss_rate)
+        print_report(summary_hit, summary_hit_rate)
+        errors = [line for line in app_log.getvalue().splitlines() if line.startswith('❌')]
+        if errors:
+            print(f"\n앱 오류 로그 {len(errors)}건 (처음 5건):", *errors[:5], sep='\n  ')
+        appmod.job_queue.stop()
+        appmod.youtube_clients.reset()
+        with appmod.app.app_context():
+            appmod.db.engine.dispose()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+# ===================================================================
+#          cache_store.py (영상/채널 단위 메타데이터 2단 캐시)
+# ===================================================================
+# 연관 검색들은 같은 영상과 채널을 반복해서 돌려줍니다. EntityStore 는
+# videoId / channelId 단위로 API 응답을 저장하는 2단 캐시입니다.
+#   1단: 프로세스 내부 LRU (가장 빠름, 워커마다 따로 존재)
+#   2단: DB 테이블 (워커/재시작 간 공유)
+# TTL 이 지난 항목은 "없는 것"으로 취급되어 API 로 다시 조회됩니다.
+#
+# KeyValueCache 는 같은 2단 구조를 임의의 해시 키(예: AI 요약)에 쓰는 버전으로,
+# 메모리 LRU 와 DB 표 모두 "저장된 바이트 수" 기준으로 오래 안 쓴 항목부터 지웁니다.
+import json
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+
+from cachetools import LRUCache
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+YOUTUBE_BATCH_SIZE = 50  # videos.list / channels.list 한 번에 보낼 수 있는 최대 ID 수
+
+
+def chunked(items, size=YOUTUBE_BATCH_SIZE):
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class EntityStore:
+    """entity_id / payload_json / fetched_at 컬럼을 가진 모델 위에 LRU 를 얹은 캐시."""
+
+    def __init__(self, db, model, ttl_seconds, lru_size=5000):
+        self.db = db
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self._lru = LRUCache(maxsize=lru_size)
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, fetched_ts, now_ts):
+        return now_ts - fetched_ts < self.ttl_seconds
+
+    def get_many(self, entity_ids):
+        # (신선한 항목 dict, 없거나 만료된 ID 목록) 을 돌려줍니다.
+        now_ts = time.time()
+        found, need_db = {}, []
+        with self._lock:
+            for entity_id in dict.fromkeys(entity_ids):
+                entry = self._lru.get(entity_id)
+                if entry and self._is_fresh(entry[0], now_ts):
+                    found[entity_id] = entry[1]
+                else:
+                    need_db.append(entity_id)
+
+        for batch in chunked(need_db, 500):
+            rows = self.db.session.query(self.model.entity_id, self.model.payload_json, self.model.fetched_at) \
+                .filter(self.model.entity_id.in_(batch)).all()
+            with self._lock:
+                for entity_id, payload_json, fetched_at in rows:
+                    fetched_ts = fetched_at.replace(tzinfo=timezone.utc).timestamp()
+                    if not self._is_fresh(fetched_ts, now_ts): continue
+                    payload = json.loads(payload_json)
+                    self._lru[entity_id] = (fetched_ts, payload)
+                    found[entity_id] = payload
+
+        missing = [entity_id for entity_id in need_db if entity_id not in found]
+        return found, missing
+
+    def put_many(self, payloads):
+        # DB 에는 upsert 로 한 번에 기록합니다. (commit 은 호출한 쪽에서)
+        if not payloads: return
+        now = datetime.now(timezone.utc)
+        rows = [{'entity_id': entity_id, 'payload_json': json.dumps(payload), 'fetched_at': now}
+                for entity_id, payload in payloads.items()]
+        dialect = self.db.engine.dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite_insert if dialect == 'sqlite' else pg_insert
+            stmt = insert(self.model.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['entity_id'],
+                set_={'payload_json': stmt.excluded.payload_json, 'fetched_at': stmt.excluded.fetched_at})
+            self.db.session.execute(stmt, rows)
+        else:
+            for row in rows:
+                self.db.session.merge(self.model(**row))
+
+        now_ts = now.timestamp()
+        with self._lock:
+            for entity_id, payload in payloads.items():
+                self._lru[entity_id] = (now_ts, payload)
+
+    def clear_local(self):
+        with self._lock:
+            self._lru.clear()
+
+
+class KeyValueCache:
+    """cache_key / payload_json / size_bytes / created_at / accessed_at 컬럼을 가진 모델 위의 2단 캐시."""
+
+    def __init__(self, db, model, ttl_seconds, lru_bytes=16 * 1024 * 1024, max_db_bytes=256 * 1024 * 1024, prune_every=50):
+        self.db = db
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self.max_db_bytes = max_db_bytes
+        self.prune_every = prune_every
+        self._lru = LRUCache(maxsize=lru_bytes, getsizeof=lambda entry: entry[2])
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    def _remember(self, cache_key, created_ts, payload, size_bytes):
+        if size_bytes > self._lru.maxsize: return  # LRU 전체보다 큰 항목은 DB 에만 둡니다.
+        with self._lock:
+            self._lru[cache_key] = (created_ts, payload, size_bytes)
+
+    def get(self, cache_key):
+        # 없거나 TTL 이 지났으면 None. DB 에서 찾은 경우 accessed_at 을 갱신합니다. (commit 은 호출한 쪽에서)
+        now_ts = time.time()
+        with self._lock:
+            entry = self._lru.get(cache_key)
+        if entry and now_ts - entry[0] < self.ttl_seconds:
+            return entry[1]
+
+        row = self.db.session.query(self.model.payload_json, self.model.size_bytes, self.model.created_at) \
+            .filter(self.model.cache_key == cache_key).first()
+        if row is None: return None
+        created_ts = row.created_at.replace(tzinfo=timezone.utc).timestamp()
+        if now_ts - created_ts >= self.ttl_seconds: return None
+        self.db.session.execute(update(self.model.__table__).where(self.model.cache_key == cache_key)
+                                .values(accessed_at=datetime.now(timezone.utc)))
+        payload = json.loads(row.payload_json)
+        self._remember(cache_key, created_ts, payload, row.size_bytes)
+        return payload
+
+    def put(self, cache_key, payload):
+        # upsert 로 기록하고, prune_every 번마다 만료/용량 초과 항목을 정리합니다. (commit 은 호출한 쪽에서)
+        now = datetime.now(timezone.utc)
+        payload_json = json.dumps(payload, ensure_ascii=False)
+        size_bytes = len(payload_json.encode('utf-8'))
+        row = {'cache_key': cache_key, 'payload_json': payload_json, 'size_bytes': size_bytes, 'created_at': now, 'accessed_at': now}
+        dialect = self.db.engine.dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite_insert if dialect == 'sqlite' else pg_insert
+            stmt = insert(self.model.__table__)
+            stmt = stmt.on_conflict_do_update(index_elements=['cache_key'], set_={
+                column: getattr(stmt.excluded, column) for column in ('payload_json', 'size_bytes', 'created_at', 'accessed_at')})
+            self.db.session.execute(stmt, [row])
+        else:
+            self.db.session.merge(self.model(**row))
+        self._remember(cache_key, now.timestamp(), payload, size_bytes)
+
+        with self._lock:
+            self._puts += 1
+            should_prune = self._puts % self.prune_every == 0
+        if should_prune: self.prune()
+
+    def prune(self):
+        # TTL 이 지난 행을 지우고, 전체 크기가 max_db_bytes 를 넘으면 오래 안 쓴 행부터 지웁니다.
+        model = self.model
+        expired_before = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        removed = self.db.session.execute(delete(model.__table__).where(model.created_at < expired_before)).rowcount or 0
+        total_bytes = self.db.session.execute(select(func.coalesce(func.sum(model.size_bytes), 0))).scalar()
+        if total_bytes <= self.max_db_bytes: return removed
+
+        excess, evict_keys = total_bytes - self.max_db_bytes, []
+        for cache_key, size_bytes in self.db.session.execute(
+                select(model.cache_key, model.size_bytes).order_by(model.accessed_at).limit(10000)):
+            if excess <= 0: break
+            evict_keys.append(cache_key)
+            excess -= size_bytes
+        for batch in chunked(evict_keys, 500):
+            removed += self.db.session.execute(delete(model.__table__).where(model.cache_key.in_(batch))).rowcount or 0
+        with self._lock:
+            for cache_key in evict_keys:
+                self._lru.pop(cache_key, None)
+        return removed
+
+    def clear_local(self):
+        with self._lock:
+            self._lru.clear()
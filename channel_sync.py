@@ -0,0 +1,249 @@
+# ===================================================================
+#     channel_sync.py (채널 모드: 업로드 재생목록 기반 증분 동기화)
+# ===================================================================
+# 예전 채널 모드는 새로고침할 때마다 채널 찾기 search.list(100) + 채널 최신 영상
+# search.list(100) 로 200 units 를 썼습니다. ChannelSyncer 는
+#   1) 입력(채널 ID / 채널 URL / @핸들 / 채널명)을 채널 ID 로 한 번만 변환해 ChannelAlias 에 저장하고
+#      (ID·URL 은 0, @핸들은 channels.list forHandle 1, 채널명만 search.list 100 units)
+#   2) 채널의 업로드 재생목록(UC… → UU…)을 playlistItems.list 로 읽고 (페이지당 50개, 1 unit)
+#   3) 채널별 동기화 커서(가장 최근에 본 영상 ID, 더 오래된 업로드를 이어 읽을 pageToken)와
+#      업로드 목록을 ChannelUploads 에 남겨, 다음 새로고침에서는 이미 본 영상이 나올 때까지의
+#      새 업로드만 가져옵니다. (보통 1 unit)
+# 저장하는 업로드 항목은 search.list 응답과 같은 모양({'id': {'videoId'}, 'snippet': {...}})이라
+# 기존 보강(fetch_enrichment) 단계를 그대로 사용할 수 있습니다.
+import math
+import re
+from datetime import datetime, timezone, timedelta
+
+from googleapiclient.errors import HttpError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from json_codec import dumps_bytes, loads
+
+PLAYLIST_PAGE_SIZE = 50  # playlistItems.list 한 페이지 최대 항목 수
+SYNC_DUE_COST = 1  # 모니터링 동기화 1회: 새 업로드 1페이지
+CHANNEL_ID_PATTERN = re.compile(r'(?:^|/channel/)(UC[0-9A-Za-z_-]{22})(?:[/?#]|$)')
+HANDLE_PATTERN = re.compile(r'(?:^|youtube\.com/)(@[^\s/?#]+)')
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def parse_channel_query(query):
+    """('id', 'UC…') / ('handle', '@…') / ('name', 채널명) 중 하나를 돌려줍니다."""
+    query = (query or '').strip()
+    match = CHANNEL_ID_PATTERN.search(query)
+    if match: return 'id', match.group(1)
+    match = HANDLE_PATTERN.search(query)
+    if match: return 'handle', match.group(1)
+    return 'name', re.sub(r'\s+', ' ', query)
+
+
+def alias_key(kind, value):
+    # 핸들과 채널명은 대소문자를 구분하지 않습니다.
+    return f"{kind}:{value.lower()}"[:200]
+
+
+def uploads_playlist_id(channel_id):
+    # 모든 채널의 업로드 재생목록 ID 는 채널 ID 의 'UC' 를 'UU' 로 바꾼 값입니다.
+    return 'UU' + channel_id[2:]
+
+
+def playlist_item_to_search_item(item):
+    # 비공개/삭제된 영상은 videoPublishedAt 이 없으므로 None 을 돌려줍니다.
+    snippet, content_details = item.get('snippet', {}), item.get('contentDetails', {})
+    video_id = content_details.get('videoId') or snippet.get('resourceId', {}).get('videoId')
+    published_at = content_details.get('videoPublishedAt')
+    if not video_id or not published_at: return None
+    return {'id': {'videoId': video_id},
+            'snippet': {'channelId': snippet.get('videoOwnerChannelId') or snippet.get('channelId'), 'title': snippet.get('title', ''),
+                        'channelTitle': snippet.get('videoOwnerChannelTitle') or snippet.get('channelTitle', ''),
+                        'publishedAt': published_at}}
+
+
+class ChannelSyncer:
+    def __init__(self, db, alias_model, uploads_model, youtube_clients, min_sync_interval=600,
+                 initial_items=200, max_items=1000, max_pages=20):
+        self.db = db
+        self.alias_model = alias_model
+        self.uploads_model = uploads_model
+        self.youtube_clients = youtube_clients
+        self.min_sync_interval = min_sync_interval  # 이 시간 안에 다시 요청되면 API 를 호출하지 않음
+        self.initial_items = initial_items  # min_items 를 주지 않았을 때 읽어 둘 업로드 수
+        self.max_items = max_items  # 채널별로 보관하는 최신 업로드 수
+        self.max_pages = max_pages  # 한 번의 동기화에서 읽는 최대 페이지 수
+
+    def _upsert(self):
+        return sqlite_insert if self.db.engine.dialect.name == 'sqlite' else pg_insert
+
+    # ▼▼▼ 채널 ID 찾기 (한 번 찾은 결과는 계속 재사용) ▼▼▼
+    def cached_channel_id(self, query):
+        kind, value = parse_channel_query(query)
+        if kind == 'id': return value
+        alias = self.db.session.get(self.alias_model, alias_key(kind, value))
+        return alias.channel_id if alias else None
+
+    def resolve(self, query):
+        """입력을 채널 ID 로 바꿉니다. 찾지 못하면 None. (찾은 결과는 commit 까지 마침)"""
+        channel_id = self.cached_channel_id(query)
+        if channel_id: return channel_id
+        kind, value = parse_channel_query(query)
+        if not value: return None
+        youtube = self.youtube_clients.get_service()
+        if kind == 'handle':
+            response = self.youtube_clients.execute(youtube.channels().list(part='id', forHandle=value))
+            channel_id = next((item['id'] for item in response.get('items', [])), None)
+        else:
+            response = self.youtube_clients.execute(youtube.search().list(part='snippet', q=value, type='channel', maxResults=1))
+            channel_id = next((item['snippet']['channelId'] for item in response.get('items', [])), None)
+        if channel_id is None: return None  # 못 찾은 결과는 저장하지 않음 (채널이 새로 생길 수 있음)
+        stmt = self._upsert()(self.alias_model.__table__).values(alias=alias_key(kind, value), channel_id=channel_id, resolved_at=_utcnow())
+        self.db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['alias'], set_={'channel_id': stmt.excluded.channel_id, 'resolved_at': stmt.excluded.resolved_at}))
+        self.db.session.commit()
+        return channel_id
+
+    # ▼▼▼ 업로드 재생목록 읽기 ▼▼▼
+    def _fetch_page(self, playlist_id, page_token=None):
+        youtube = self.youtube_clients.get_service()
+        try:
+            return self.youtube_clients.execute(youtube.playlistItems().list(
+                part='snippet,contentDetails', playlistId=playlist_id, maxResults=PLAYLIST_PAGE_SIZE, pageToken=page_token))
+        except HttpError as e:
+            if e.resp.status == 404: return {'items': []}  # 업로드가 하나도 없는 채널은 재생목록이 없음
+            raise
+
+    def _is_fresh(self, state, now):
+        return state is not None and now - state.synced_at < timedelta(seconds=self.min_sync_interval)
+
+    def _read_new_uploads(self, playlist_id, latest_video_id, known_ids, want):
+        # 앞(최신)에서부터 읽다가 이미 저장된 영상이 나오면 멈춥니다.
+        # (새 업로드 목록, 최신 영상 ID, 이어 읽을 pageToken, 저장된 영상까지 도달했는지) 를 돌려줍니다.
+        new_items, newest_id, page_token = [], None, None
+        for _ in range(self.max_pages):
+            response = self._fetch_page(playlist_id, page_token)
+            for item in response.get('items', []):
+                video_id = item.get('contentDetails', {}).get('videoId')
+                if newest_id is None: newest_id = video_id
+                if video_id == latest_video_id or video_id in known_ids:
+                    return new_items, newest_id or latest_video_id, None, True
+                search_item = playlist_item_to_search_item(item)
+                if search_item: new_items.append(search_item)
+            page_token = response.get('nextPageToken')
+            if not page_token or (not known_ids and len(new_items) >= want): break
+        return new_items, newest_id or latest_video_id, page_token, False
+
+    def _read_older_uploads(self, playlist_id, page_token, known_ids, want):
+        older = []
+        for _ in range(self.max_pages):
+            response = self._fetch_page(playlist_id, page_token)
+            for item in response.get('items', []):
+                search_item = playlist_item_to_search_item(item)
+                if search_item and search_item['id']['videoId'] not in known_ids: older.append(search_item)
+            page_token = response.get('nextPageToken')
+            if not page_token or len(older) >= want: break
+        return older, page_token
+
+    def sync(self, channel_id, min_items=None, requested=True):
+        """채널의 최신 업로드 목록(최신순, search.list 항목 모양)을 돌려줍니다. (저장까지 commit)
+
+        requested=False 는 모니터링 동기화처럼 사용자가 직접 요청하지 않은 경우로, 요청 시각을 갱신하지 않습니다.
+        """
+        min_items = min(min_items or self.initial_items, self.max_items)
+        now = _utcnow()
+        state = self.db.session.get(self.uploads_model, channel_id)
+        items = loads(state.items_json) if state else []
+        playlist_id = state.uploads_playlist_id if state else uploads_playlist_id(channel_id)
+        latest_video_id = state.latest_video_id if state else None
+        backfill_token = state.backfill_page_token if state else None
+        history_complete = state.history_complete if state else False
+        if self._is_fresh(state, now) and (len(items) >= min_items or history_complete):
+            if requested: self._touch(state, now)
+            return items
+
+        # 1) 새 업로드: 저장된 영상이 나올 때까지만 읽음 (처음이면 min_items 만큼)
+        known_ids = {item['id']['videoId'] for item in items}
+        # 처음 동기화할 때도 요청한 개수(예: maxResults 50 → 1페이지)만 읽고, 더 필요해지면 2) 에서 이어 읽습니다.
+        new_items, latest_video_id, page_token, reached_known = self._read_new_uploads(
+            playlist_id, latest_video_id, known_ids, min_items)
+        if state is None or not reached_known:
+            # 처음 읽었거나, 새 업로드가 너무 많아 저장된 목록과 이어지지 않으면 새로 읽은 목록으로 교체
+            if state is not None: print(f"⚠️ [ChannelSync] {channel_id}: 새 업로드가 너무 많아 목록을 새로 만듭니다.")
+            items, backfill_token, history_complete = new_items, page_token, page_token is None
+        else:
+            items = new_items + items
+
+        # 2) 더 많은 영상을 요청했는데 저장된 목록이 짧으면 이어서 과거 업로드를 읽음
+        if len(items) < min_items and backfill_token:
+            older, backfill_token = self._read_older_uploads(
+                playlist_id, backfill_token, {item['id']['videoId'] for item in items}, min_items - len(items))
+            items += older
+            history_complete = backfill_token is None
+
+        if len(items) > self.max_items:
+            items, history_complete = items[:self.max_items], False
+        self._save(channel_id, playlist_id, items, latest_video_id, backfill_token, history_complete, now, requested)
+        print(f"✅ [ChannelSync] {channel_id}: 새 업로드 {len(new_items)}개, 보관 {len(items)}개")
+        return items
+
+    def _save(self, channel_id, playlist_id, items, latest_video_id, backfill_token, history_complete, now, requested):
+        values = {'channel_id': channel_id, 'uploads_playlist_id': playlist_id, 'items_json': dumps_bytes(items),
+                  'latest_video_id': latest_video_id, 'backfill_page_token': backfill_token,
+                  'history_complete': history_complete, 'synced_at': now, 'requested_at': now}
+        stmt = self._upsert()(self.uploads_model.__table__).values(**values)
+        self.db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['channel_id'],
+            set_={key: stmt.excluded[key] for key in values if key != 'channel_id' and (requested or key != 'requested_at')}))
+        self.db.session.commit()
+
+    def _touch(self, state, now):
+        # 최근에 요청된 채널만 모니터링(sync_due) 대상으로 삼기 위해 요청 시각을 남깁니다.
+        if now - state.requested_at > timedelta(minutes=1):
+            state.requested_at = now
+            self.db.session.commit()
+
+    # ▼▼▼ 쿼터 예상치 (검색 전 예산 확인용) ▼▼▼
+    def estimate_cost(self, query, min_items=None):
+        min_items = min(min_items or self.initial_items, self.max_items)
+        kind, _ = parse_channel_query(query)
+        channel_id = self.cached_channel_id(query)
+        resolve_cost = 0 if channel_id else (1 if kind == 'handle' else 100)
+        state = self.db.session.get(self.uploads_model, channel_id) if channel_id else None
+        if state is None:
+            sync_cost = math.ceil(min_items / PLAYLIST_PAGE_SIZE)
+        elif self._is_fresh(state, _utcnow()) and (state.history_complete or min_items <= PLAYLIST_PAGE_SIZE):
+            sync_cost = 0
+        else:
+            sync_cost = 1 + math.ceil(min_items / PLAYLIST_PAGE_SIZE)
+        return resolve_cost + sync_cost + 2  # + videos.list / channels.list 보강
+
+    # ▼▼▼ 모니터링: 최근 요청된 채널들을 주기적으로 새 업로드만 동기화 (`flask sync-channels`) ▼▼▼
+    def due_channel_ids(self, active_within, limit):
+        now = _utcnow()
+        uploads = self.uploads_model
+        query = select(uploads.channel_id).where(
+            uploads.requested_at >= now - active_within,
+            uploads.synced_at < now - timedelta(seconds=self.min_sync_interval),
+        ).order_by(uploads.synced_at).limit(limit)
+        return [row[0] for row in self.db.session.execute(query)]
+
+    def sync_due(self, active_within=timedelta(days=7), limit=500, quota_scheduler=None):
+        synced = 0
+        for channel_id in self.due_channel_ids(active_within, limit):
+            # 저장된 목록과 이어지는 새 업로드만 읽으므로 보통 playlistItems.list 1페이지(1 단위)를 차감합니다.
+            # (더 읽은 페이지도 on_call 훅이 장부에는 그대로 기록)
+            if quota_scheduler is not None and not quota_scheduler.try_consume(None, SYNC_DUE_COST):
+                print("⚠️ [ChannelSync] 쿼터가 부족하여 이번 동기화를 중단합니다.")
+                break
+            try:
+                self.sync(channel_id, min_items=1, requested=False)
+            except Exception:
+                if quota_scheduler is not None: quota_scheduler.refund(None, SYNC_DUE_COST)
+                raise
+            synced += 1
+            # 채널마다 결과를 commit 하므로 쿼터 장부도 함께 기록해 둡니다. (중간에 멈춰도 사용량이 빠지지 않도록)
+            if quota_scheduler is not None: quota_scheduler.ledger.flush()
+        return synced
@@ -0,0 +1,29 @@
+# ===================================================================
+#     gunicorn.conf.py (사용법: gunicorn -c gunicorn.conf.py -b 0.0.0.0:8000)
+# ===================================================================
+# GUNICORN_PRELOAD=1: master 가 앱을 한 번 import 하고 Gemini SDK / 모델 / YouTube discovery 문서까지
+# 미리 불러 둔 뒤 워커를 fork 합니다. (워커 기동이 빨라지고 메모리 페이지도 공유)
+# 기본값(0)은 각 워커가 앱을 직접 import 하고, 무거운 SDK 는 처음 쓸 때 불러옵니다.
+#
+# 워커 종류는 gthread 입니다. 요약 스트리밍(SSE/NDJSON)은 생성이 끝날 때까지, 작업 조회(?wait=)는
+# 최대 JOB_MAX_WAIT_SECONDS 동안 연결을 붙잡습니다. 기본 sync 워커는 요청 하나가 프로세스 전체를
+# 막으므로, 스레드 여러 개(GUNICORN_THREADS)로 다른 요청을 계속 처리합니다.
+# (앱은 이미 스레드 안전하게 작성되어 있음: 요청별 DB 세션, 잠금으로 보호되는 캐시/버킷)
+import os
+
+preload_app = os.environ.get('GUNICORN_PRELOAD') == '1'
+wsgi_app = 'app:get_app(warm=True)' if preload_app else 'app:get_app()'
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+
+def child_exit(server, worker):
+    # 종료된(재시작된) 워커의 지표 값을 보관 파일에 더해 /metrics 의 합계가 줄어들지 않도록 합니다.
+    from metrics import DEFAULT_METRICS_DIR, archive_process_file
+    archive_process_file(os.environ.get('METRICS_DIR', DEFAULT_METRICS_DIR), worker.pid)
+
+
+def post_fork(server, worker):
+    if preload_app:
+        import app
+        app.after_fork()
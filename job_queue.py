@@ -0,0 +1,266 @@
+# ===================================================================
+#     job_queue.py (AI 작업을 요청 스레드 밖에서 실행하는 작업 큐)
+# ===================================================================
+# Gemini 호출처럼 오래 걸리는 작업은 요청 안에서 실행하지 않고 큐에 넣은 뒤
+# 작업 ID 를 바로 돌려줍니다. 브라우저는 ID 로 결과를 조회(폴링/롱폴링)합니다.
+#   - 브로커: 로컬 SQLite 파일 (같은 서버의 gunicorn 워커들이 함께 사용, WAL 모드)
+#   - 실행기: 각 프로세스의 스레드 풀이 큐에서 작업을 하나씩 가져가 실행
+#   - 중복 제거: 같은 dedup_key 로 진행 중이거나 최근 완료된 작업이 있으면 그 작업을 돌려줌
+#   - 사용자별 제한: 대기+실행 중인 작업 수(제출 시)와 동시에 실행되는 작업 수(가져갈 때)
+# 작업 함수는 register(name, func) 로 등록하며 func(payload) 의 반환값(JSON)이 결과가 됩니다.
+# 실행 중에는 report_progress(data) 로 중간 결과(예: 지금까지 생성된 요약)를 남길 수 있습니다.
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import suppress
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    user_id INTEGER,
+    dedup_key TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    progress TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_created_at ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS ix_jobs_dedup_key ON jobs (dedup_key);
+CREATE INDEX IF NOT EXISTS ix_jobs_user_id_status ON jobs (user_id, status);
+"""
+
+
+class JobLimitExceeded(Exception):
+    pass
+
+
+class JobQueue:
+    def __init__(self, db_path, context_factory=None, max_workers=4, max_active_per_user=5, max_running_per_user=2,
+                 result_ttl=3600, stale_after=600, poll_interval=0.5):
+        self.db_path = db_path
+        self.context_factory = context_factory  # 작업 실행 시 감쌀 컨텍스트 (예: app.app_context)
+        self.max_workers = max_workers
+        self.max_active_per_user = max_active_per_user
+        self.max_running_per_user = max_running_per_user
+        self.result_ttl = result_ttl
+        self.stale_after = stale_after  # 이 시간 동안 heartbeat 가 없으면 실행하던 워커가 죽은 것으로 보고 다시 대기열로
+        self.poll_interval = poll_interval
+        self._handlers = {}
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        self._finished = threading.Condition()  # 이 프로세스의 실행기가 작업을 끝내면 wait() 를 바로 깨움
+        self._threads = []
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._last_cleanup = 0
+
+    # ▼▼▼ SQLite 연결 (스레드마다 하나) ▼▼▼
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(SCHEMA)
+            columns = {row['name'] for row in connection.execute('PRAGMA table_info(jobs)')}
+            if 'progress' not in columns:  # progress 컬럼이 생기기 전에 만든 큐 파일
+                with suppress(sqlite3.OperationalError):  # 다른 워커가 먼저 추가한 경우
+                    connection.execute('ALTER TABLE jobs ADD COLUMN progress TEXT')
+            self._local.connection = connection
+        return connection
+
+    def _transaction(self):
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')  # 쓰기 잠금을 먼저 잡아 워커 간 경쟁을 직렬화
+        return connection
+
+    @staticmethod
+    def _to_dict(row):
+        if row is None: return None
+        return {'id': row['id'], 'name': row['name'], 'status': row['status'],
+                'result': json.loads(row['result']) if row['result'] is not None else None,
+                'progress': json.loads(row['progress']) if row['progress'] is not None else None,
+                'error': row['error'], 'user_id': row['user_id'],
+                'created_at': row['created_at'], 'finished_at': row['finished_at']}
+
+    def register(self, name, func):
+        self._handlers[name] = func
+
+    # ▼▼▼ 제출 / 조회 ▼▼▼
+    def submit(self, name, payload, user_id=None, dedup_key=None):
+        """(작업 dict, 새로 만들었는지 여부) 를 돌려줍니다. 사용자별 한도를 넘으면 JobLimitExceeded."""
+        if name not in self._handlers: raise ValueError(f"등록되지 않은 작업입니다: {name}")
+        now = time.time()
+        connection = self._transaction()
+        try:
+            if dedup_key is not None:
+                existing = connection.execute(
+                    "SELECT * FROM jobs WHERE dedup_key = ? AND (status IN (?, ?) OR (status = ? AND finished_at > ?)) "
+                    "ORDER BY created_at DESC LIMIT 1", (dedup_key, QUEUED, RUNNING, DONE, now - self.result_ttl)).fetchone()
+                if existing is not None:
+                    connection.execute('COMMIT')
+                    return self._to_dict(existing), False
+            if user_id is not None:
+                active = connection.execute("SELECT COUNT(*) FROM jobs WHERE user_id = ? AND status IN (?, ?)",
+                                            (user_id, QUEUED, RUNNING)).fetchone()[0]
+                if active >= self.max_active_per_user:
+                    raise JobLimitExceeded(f"진행 중인 AI 작업이 너무 많습니다. (최대 {self.max_active_per_user}개)")
+            job_id = uuid.uuid4().hex
+            connection.execute(
+                "INSERT INTO jobs (id, name, user_id, dedup_key, payload, status, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, name, user_id, dedup_key, json.dumps(payload, ensure_ascii=False), QUEUED, now))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        self.start()
+        with self._wakeup:
+            self._wakeup.notify()
+        return self.get(job_id), True
+
+    def get(self, job_id):
+        return self._to_dict(self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def wait(self, job_id, timeout):
+        # 롱폴링: 작업이 끝나거나 timeout 이 지날 때까지 기다렸다가 현재 상태를 돌려줍니다.
+        # 다른 프로세스가 실행 중인 작업은 poll_interval 마다 다시 읽습니다.
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._finished:
+                job = self.get(job_id)
+                if job is None or job['status'] not in ACTIVE_STATUSES or time.monotonic() >= deadline:
+                    return job
+                self._finished.wait(min(self.poll_interval, max(deadline - time.monotonic(), 0)))
+
+    # ▼▼▼ 워커 ▼▼▼
+    def _claim(self):
+        now = time.time()
+        connection = self._transaction()
+        try:
+            # 실행 중 작업이 max_running_per_user 개인 사용자의 작업은 건너뛰고 가장 오래된 작업을 가져갑니다.
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE status = ? AND (user_id IS NULL OR user_id NOT IN ("
+                "  SELECT user_id FROM jobs WHERE status = ? AND user_id IS NOT NULL GROUP BY user_id HAVING COUNT(*) >= ?)) "
+                "ORDER BY created_at LIMIT 1", (QUEUED, RUNNING, self.max_running_per_user)).fetchone()
+            if row is not None:
+                connection.execute("UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ? WHERE id = ?",
+                                   (RUNNING, now, now, row['id']))
+            connection.execute('COMMIT')
+            return row
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    def report_progress(self, data):
+        # 작업 함수 안에서 호출합니다. 조회하는 쪽은 job['progress'] 로 받습니다. (작업 밖에서는 무시)
+        job_id = getattr(self._local, 'job_id', None)
+        if job_id is None: return
+        self._connection().execute("UPDATE jobs SET progress = ? WHERE id = ? AND status = ?",
+                                   (json.dumps(data, ensure_ascii=False), job_id, RUNNING))
+
+    def _finish(self, job_id, status, result=None, error=None):
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, progress = NULL, error = ?, finished_at = ? WHERE id = ?",
+            (status, json.dumps(result, ensure_ascii=False) if result is not None else None, error, time.time(), job_id))
+
+    def _heartbeat(self, job_id, done):
+        # 오래 걸리는 작업도 살아 있다는 표시를 남겨 다른 워커가 다시 가져가지 않도록 합니다.
+        connection = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        try:
+            while not done.wait(max(self.stale_after / 4, 1)):
+                connection.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?", (time.time(), job_id, RUNNING))
+        finally:
+            connection.close()
+
+    def run_job(self, row):
+        handler = self._handlers.get(row['name'])
+        done = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(row['id'], done), daemon=True).start()
+        self._local.job_id = row['id']
+        try:
+            if handler is None: raise ValueError(f"등록되지 않은 작업입니다: {row['name']}")
+            payload = json.loads(row['payload'])
+            if self.context_factory is None:
+                result = handler(payload)
+            else:
+                with self.context_factory():
+                    result = handler(payload)
+            self._finish(row['id'], DONE, result=result)
+        except Exception as e:
+            print(f"❌ [JobQueue] {row['name']} 작업 실패: {e}")
+            self._finish(row['id'], FAILED, error=str(e))
+        finally:
+            self._local.job_id = None
+            done.set()
+            with self._finished:
+                self._finished.notify_all()
+
+    def cleanup(self):
+        # 오래된 완료 작업을 지우고, heartbeat 가 끊긴 실행 중 작업은 다시 대기열로 돌립니다.
+        now = time.time()
+        connection = self._transaction()
+        try:
+            removed = connection.execute("DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                                         (DONE, FAILED, now - self.result_ttl)).rowcount
+            connection.execute("UPDATE jobs SET status = ?, started_at = NULL, progress = NULL WHERE status = ? AND heartbeat_at < ?",
+                               (QUEUED, RUNNING, now - self.stale_after))
+            connection.execute('COMMIT')
+            return removed
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() - self._last_cleanup > 60:
+                    self._last_cleanup = time.monotonic()
+                    self.cleanup()
+                row = self._claim()
+            except sqlite3.OperationalError as e:  # 잠금 경합 등: 잠시 후 다시 시도
+                print(f"⚠️ [JobQueue] 큐 조회 실패: {e}")
+                row = None
+            if row is not None:
+                self.run_job(row)
+                continue
+            with self._wakeup:
+                self._wakeup.wait(self.poll_interval)
+
+    def start(self):
+        # 앱의 첫 요청(start_background_work) 또는 처음 작업을 제출할 때 스레드를 띄웁니다.
+        # 재시작된 워커가 남긴 대기 작업도 새 제출을 기다리지 않고 바로 가져갑니다. (CLI 실행 시에는 만들지 않음)
+        with self._start_lock:
+            if self._threads: return
+            self._stop.clear()
+            for index in range(self.max_workers):
+                thread = threading.Thread(target=self._worker_loop, name=f'job-worker-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def reset(self):
+        # fork 된 자식 프로세스용: 부모의 SQLite 연결과 실행 스레드 상태를 물려받지 않습니다. (부모의 연결은 닫지 않고 버림)
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        self._finished = threading.Condition()
+        self._threads = []
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def stop(self):
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
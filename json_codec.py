@@ -0,0 +1,108 @@
+# ===================================================================
+#      json_codec.py (JSON 문자열 컬럼을 바이너리로 저장하고 큰 값은 gzip 압축)
+# ===================================================================
+# 저장된 검색 결과는 썸네일 URL, 채널명, 같은 키가 끝없이 반복되는 JSON 이라
+# 압축률이 매우 높습니다. CompressedJSONText 는 모델 입장에서는 지금처럼
+# "JSON 문자열"을 읽고 쓰지만, DB 에는 바이트(LargeBinary)로 저장합니다.
+# (benchmarks/bench_storage.py 로 크기와 읽기/쓰기 시간을 비교)
+#   - 검색/요약 캐시 행(50개 영상 스냅샷은 약 25KB)을 포함해 COMPRESS_MIN_BYTES(1KB) 이상인 값은
+#     모두 압축합니다. 그보다 작은 값(검색 조건, 작업 payload 등)은 압축해도 gzip 헤더 때문에
+#     거의 줄지 않으므로 UTF-8 바이트 그대로 저장합니다. 읽을 때는 gzip 헤더 유무로 구분합니다.
+#   - 저장용 압축은 level 1 입니다. level 6 보다 조금 크지만 쓰기 시간이 절반입니다.
+#     압축을 풀고 파싱하는 시간은 그대로 읽을 때보다 느리지만(페이지 캐시가 데워진 SQLite 기준)
+#     저장 크기가 수 분의 1 로 줄어 DB 파일과 백업, 캐시 테이블 정리 부담이 함께 줄어듭니다.
+#
+# 응답 쪽에서는 orjson 으로 직렬화하고(없으면 표준 json), 이미 직렬화된
+# 바이트(JSONBody)는 다시 파싱하지 않고 그대로 내보냅니다.
+import gzip
+import json
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+try:
+    import orjson
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:  # orjson 이 없으면 표준 json 으로 동작
+    orjson = None
+
+GZIP_MAGIC = b'\x1f\x8b'
+COMPRESS_LEVEL = 6  # HTTP 응답용 (한 번 만들어 여러 번 보냄)
+STORAGE_COMPRESS_LEVEL = 1  # DB 저장용 (행마다 압축하므로 빠른 쪽)
+COMPRESS_MIN_BYTES = 1024  # 이보다 작은 값은 압축 이득이 거의 없음
+
+
+def dumps_bytes(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=ORJSON_OPTIONS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=DefaultJSONProvider.default).encode('utf-8')
+
+
+def loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def gzip_bytes(data, level=COMPRESS_LEVEL):
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_json_text(text):
+    data = text if isinstance(text, bytes) else text.encode('utf-8')
+    if len(data) < COMPRESS_MIN_BYTES: return data  # JSON 은 0x1f 로 시작하지 않으므로 gzip 바이트와 섞이지 않음
+    return gzip_bytes(data, STORAGE_COMPRESS_LEVEL)
+
+
+def decompress_json_bytes(value):
+    if value is None: return None
+    if isinstance(value, str): return value  # 변환 전(TEXT) 값이 남아 있는 경우
+    value = bytes(value)  # psycopg2 는 memoryview 로 돌려줍니다.
+    if value[:2] == GZIP_MAGIC:
+        return gzip.decompress(value).decode('utf-8')
+    return value.decode('utf-8')
+
+
+class JSONBody:
+    """직렬화가 끝난 JSON 응답 본문. gzip 본문은 처음 필요할 때 한 번만 만듭니다."""
+
+    __slots__ = ('raw', '_gzip')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._gzip = None
+
+    def gzip(self):
+        if self._gzip is None:
+            self._gzip = gzip_bytes(self.raw)
+        return self._gzip
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify / request.get_json 이 orjson 을 쓰도록 하는 Flask JSON provider."""
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs: return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs: return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+
+class CompressedJSONText(TypeDecorator):
+    """파이썬 쪽에서는 str(JSON 문자열), DB 쪽에서는 gzip 압축 바이트. (작은 값은 압축하지 않은 UTF-8 바이트)"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None: return None
+        if isinstance(value, (bytes, bytearray)) and value[:2] == GZIP_MAGIC:
+            return bytes(value)  # 이미 압축된 바이트는 그대로 저장
+        return compress_json_text(bytes(value) if isinstance(value, bytearray) else value)  # str 또는 직렬화된 bytes
+
+    def process_result_value(self, value, dialect):
+        return decompress_json_bytes(value)
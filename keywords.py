@@ -0,0 +1,89 @@
+# ===================================================================
+#     keywords.py (연관 키워드 생성: 프롬프트 / 응답 파서 / 검색어 정규화)
+# ===================================================================
+# 번역과 키워드 생성을 Gemini 호출 한 번으로 처리합니다. 모델에게 JSON 으로
+#   {"translated_query": "...", "keywords": [{"original": "...", "korean": "..."}, ...]}
+# 형태만 돌려달라고 요청하고(response_mime_type=application/json), 응답은
+# 코드 펜스나 앞뒤 설명이 섞여 있어도 첫 번째로 올바른 JSON 객체를 찾아 검증합니다.
+import json
+import re
+import unicodedata
+
+LANGUAGE_NAMES = {'ko': 'Korean', 'en': 'English', 'ja': 'Japanese'}
+KEYWORD_COUNT = 10
+KEYWORD_CACHE_VERSION = 1  # 프롬프트나 결과 형식이 바뀌면 올립니다.
+
+KEYWORD_PROMPT_TEMPLATE = """
+You are an expert in analyzing YouTube content trends and generating search keywords for a specific language market. Your user is a YouTube creator looking for their next content idea.
+{translation_instruction}
+Then take the search query and generate a total of 10 related keywords. These keywords must be divided into two distinct categories:
+1.  **Directly Related Keywords (5 keywords):** Generate 5 keywords that are specific variations or synonyms of the user's full search query. For example, if the query is "쿠팡꿀템", suggestions could be "쿠팡 추천템", "쿠팡 가성비 제품", "로켓배송 꿀템".
+2.  **Expansion Keywords (5 keywords):** Identify the core concept in the user's query (e.g., in "쿠팡꿀템", the core concept is "꿀템"). Generate 5 keywords by combining this core concept with other popular, related subjects. For "쿠팡꿀템", this could lead to "살림꿀템", "주방꿀템", "알리익스프레스 꿀템".
+The target language for the output keywords is: **{target_language_name}**
+**CRUCIAL INSTRUCTION: You MUST generate the "original" keywords strictly in the specified target language: **{target_language_name}**. Do NOT output keywords in English unless the target language is "English".**
+After generating all 10 keywords in {target_language_name}, you must also provide the Korean translation for each keyword.
+You MUST return ONLY a single raw JSON object with exactly two keys:
+"translated_query" (the search query in {target_language_name}) and "keywords" (an array of the 10 generated objects, each with the keys "original" (the keyword in {target_language_name}) and "korean" (the Korean translation)).
+"""
+
+
+def normalize_query(query):
+    # 캐시 키용: 전각/반각 통일, 대소문자/공백 차이 무시
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', query)).strip().lower()
+
+
+def build_keyword_prompt(query, target_lang, known_translation=None):
+    target_language_name = LANGUAGE_NAMES.get(target_lang, 'Korean')
+    if target_lang == 'ko':
+        translation_instruction = f'The user\'s search query is: "{query}". It is already in Korean, so "translated_query" is the query itself.'
+    elif known_translation:
+        translation_instruction = (f'The user\'s search query is: "{query}". Its {target_language_name} translation is: "{known_translation}". '
+                                   f'Use it as "translated_query".')
+    else:
+        translation_instruction = (f'The user\'s search query is: "{query}". First translate it to {target_language_name} '
+                                   f'(only the translated text, without explanations or quotation marks) and use it as "translated_query".')
+    return KEYWORD_PROMPT_TEMPLATE.format(translation_instruction=translation_instruction, target_language_name=target_language_name)
+
+
+def _json_objects(text):
+    # 문자열 안의 '{' 위치마다 raw_decode 를 시도해 JSON 객체를 앞에서부터 하나씩 돌려줍니다.
+    decoder = json.JSONDecoder()
+    position = text.find('{')
+    while position >= 0:
+        try:
+            value, end = decoder.raw_decode(text, position)
+        except ValueError:
+            position = text.find('{', position + 1)
+            continue
+        if isinstance(value, dict): yield value
+        position = text.find('{', end)
+
+
+def _clean_keywords(items):
+    keywords, seen = [], set()
+    for item in items:
+        if isinstance(item, str):
+            item = {'original': item, 'korean': item}
+        if not isinstance(item, dict) or not isinstance(item.get('original'), str): continue
+        original = item['original'].strip()
+        if not original or original.lower() in seen: continue
+        seen.add(original.lower())
+        korean = item.get('korean')
+        keywords.append({'original': original, 'korean': korean.strip() if isinstance(korean, str) else ''})
+    return keywords[:KEYWORD_COUNT]
+
+
+def parse_keyword_response(text, fallback_query):
+    """모델 응답에서 {"keywords": [...], "translated_query": str} 를 꺼냅니다. 없으면 ValueError."""
+    text = re.sub(r'```(?:json)?', '', text or '')
+    for candidate in _json_objects(text):
+        items = candidate.get('keywords')
+        if not isinstance(items, list):  # 키 이름을 다르게 준 경우: 첫 번째 리스트 값을 사용
+            items = next((value for value in candidate.values() if isinstance(value, list)), None)
+        keywords = _clean_keywords(items or [])
+        if not keywords: continue
+        translated_query = candidate.get('translated_query')
+        if not isinstance(translated_query, str) or not translated_query.strip():
+            translated_query = fallback_query
+        return {'keywords': keywords, 'translated_query': translated_query.strip().replace('"', '')}
+    raise ValueError("AI 응답에서 키워드 리스트가 담긴 JSON 객체를 찾을 수 없습니다.")
@@ -0,0 +1,320 @@
+# ===================================================================
+#     metrics.py (요청 단계별 시간 측정 + Prometheus 형식 /metrics)
+# ===================================================================
+# print() 로그만으로는 느린 요청이 어느 단계(캐시 조회, YouTube 호출, 후처리, commit,
+# Gemini 호출)에서 시간을 쓰는지 알 수 없었습니다. 이 모듈은
+#   - 카운터(inc) / 히스토그램(observe) 을 프로세스 메모리에 모으고
+#   - stage(name) 으로 감싼 구간의 시간을 히스토그램과 "현재 요청의 단계 목록"에 함께 남기며
+#   - 요청마다 실행된 SQL 문 수를 셉니다.
+# gunicorn 워커는 서로 메모리를 공유하지 않으므로, 각 프로세스가 주기적으로
+# directory/metrics-<pid>.json 에 자기 값을 덮어쓰고 /metrics 는 모든 파일을 합쳐 응답합니다.
+# (작업 큐와 같은 방식: 같은 서버의 워커들이 로컬 파일을 공유)
+# 종료된 워커의 값은 버리지 않고 metrics-archived.json 에 더해 둡니다. (prometheus_client multiprocess 방식)
+# 파일을 지우기만 하면 워커가 재시작될 때마다 합계가 줄어들고, Prometheus 는 이를 카운터 리셋으로 보아
+# rate()/increase() 가 튑니다. 보관은 gunicorn child_exit 훅(archive_process_file)이 하고, 훅이 실행되지
+# 못한 경우에도 collect 가 프로세스가 더 이상 없는 파일을 보관 파일로 옮깁니다.
+# (지금은 카운터와 히스토그램만 있으므로 모두 보관합니다. 게이지가 생기면 그 값은 보관하지 말고 버려야 함)
+import glob
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, suppress
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 워커가 하나뿐이라 파일 잠금 없이 진행
+    fcntl = None
+
+from json_codec import dumps_bytes, loads
+
+DEFAULT_METRICS_DIR = os.path.join(tempfile.gettempdir(), 'benchly-metrics')
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(label_items, extra=()):
+    items = list(label_items) + list(extra)
+    if not items: return ''
+    escaped = (f'{key}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"' for key, value in items)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+def process_file_path(directory, pid):
+    return os.path.join(directory, f'metrics-{pid}.json')
+
+
+def archive_file_path(directory):
+    return os.path.join(directory, 'metrics-archived.json')
+
+
+@contextmanager
+def _file_lock(directory, exclusive):
+    # 보관 파일에 더하는 쪽(배타)과 합산하는 쪽(공유)이 서로의 중간 상태를 보지 않도록 합니다.
+    # (보관 파일에 더한 뒤 워커 파일을 지우기 전에 읽으면 같은 값을 두 번 세게 됨)
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'metrics.lock'), 'a+b') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _read_snapshot(path):
+    try:
+        with open(path, 'rb') as f:
+            return loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def _write_snapshot(path, snapshot):
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(dumps_bytes(snapshot))
+    os.replace(temp_path, path)  # 읽는 쪽이 쓰다 만 파일을 보지 않도록
+
+
+def _merge(snapshots, buckets=None):
+    counters, histograms, buckets = {}, {}, dict(buckets or {})
+    for snapshot in snapshots:
+        for name, bounds in snapshot.get('buckets', {}).items():
+            buckets.setdefault(name, tuple(bounds))
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.get(key)
+            if merged is None or len(merged) != len(values):
+                histograms[key] = list(values)
+            else:
+                histograms[key] = [a + b for a, b in zip(merged, values)]
+    return counters, histograms, buckets
+
+
+def archive_process_file(directory, pid):
+    """종료된 워커의 값을 보관 파일에 더하고 워커 파일을 지웁니다. 옮겼으면 True."""
+    path = process_file_path(directory, pid)
+    with _file_lock(directory, exclusive=True):
+        try:
+            snapshot = _read_snapshot(path)
+        except ValueError:
+            snapshot = {'counters': [], 'histograms': []}  # 깨진 파일은 값 없이 지움
+        if snapshot is None: return False  # 이미 다른 프로세스가 옮김
+        archive_path = archive_file_path(directory)
+        archived = _read_snapshot(archive_path) or {'counters': [], 'histograms': []}
+        counters, histograms, buckets = _merge([archived, snapshot])
+        _write_snapshot(archive_path, {
+            'counters': [[name, list(map(list, labels)), value] for (name, labels), value in counters.items()],
+            'histograms': [[name, list(map(list, labels)), values] for (name, labels), values in histograms.items()],
+            'buckets': {name: list(bounds) for name, bounds in buckets.items()},
+        })
+        os.remove(path)
+    return True
+
+
+def _process_alive(pid):
+    if os.name != 'posix': return True  # 확인할 방법이 없으면 살아 있는 것으로 봄
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _file_pid(path):
+    try:
+        return int(os.path.basename(path)[len('metrics-'):-len('.json')])
+    except ValueError:
+        return None  # metrics-archived.json
+
+
+class RequestTrace:
+    """요청 하나의 단계별 소요 시간과 SQL 문 수."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = []  # [(단계 이름, 초)]
+        self.queries = 0
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def breakdown(self):
+        # 같은 이름의 단계(예: videos.list 여러 배치)는 합쳐서 (이름, 초, 횟수) 로 돌려줍니다.
+        totals = {}
+        for name, seconds in self.stages:
+            total, count = totals.get(name, (0.0, 0))
+            totals[name] = (total + seconds, count + 1)
+        return [(name, total, count) for name, (total, count) in totals.items()]
+
+
+class Metrics:
+    def __init__(self, directory, flush_interval=5, prefix='benchly'):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.prefix = prefix
+        self._help = {}
+        self._buckets = {}
+        self._counters = {}  # {(name, labels): 값}
+        self._histograms = {}  # {(name, labels): [버킷별 개수..., +Inf 개수, 합계, 개수]}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_flush = 0
+        if hasattr(os, 'register_at_fork'):
+            # gunicorn preload 등으로 fork 된 자식은 부모의 값을 이어받지 않고 0 에서 시작합니다.
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._counters, self._histograms = {}, {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_flush = 0
+
+    def describe(self, name, help_text, buckets=None):
+        self._help[name] = help_text
+        if buckets is not None: self._buckets[name] = tuple(buckets)
+
+    # ▼▼▼ 기록 ▼▼▼
+    def inc(self, name, amount=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        buckets = self._buckets.get(name, DEFAULT_BUCKETS)
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(buckets) + 3)  # 버킷들 + 초과(+Inf) + 합계 + 개수
+            histogram[next((index for index, bound in enumerate(buckets) if value <= bound), len(buckets))] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def cache_result(self, cache, hit):
+        self.inc(f'{self.prefix}_cache_requests_total', cache=cache, result='hit' if hit else 'miss')
+
+    # ▼▼▼ 요청 단위 추적 ▼▼▼
+    def begin_request(self):
+        trace = RequestTrace()
+        self._local.trace = trace
+        return trace
+
+    def end_request(self):
+        trace = getattr(self._local, 'trace', None)
+        self._local.trace = None
+        return trace
+
+    def current_trace(self):
+        return getattr(self._local, 'trace', None)
+
+    def record_stage(self, name, seconds):
+        self.observe(f'{self.prefix}_stage_seconds', seconds, stage=name)
+        trace = self.current_trace()
+        if trace is not None: trace.stages.append((name, seconds))
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start)
+
+    def count_query(self, *args):
+        # SQLAlchemy before_cursor_execute 리스너로 등록합니다. (요청 밖의 쿼리는 세지 않음)
+        trace = self.current_trace()
+        if trace is not None: trace.queries += 1
+
+    # ▼▼▼ 워커 간 집계 (프로세스별 파일) ▼▼▼
+    def _path(self):
+        return process_file_path(self.directory, os.getpid())
+
+    def snapshot(self):
+        with self._lock:
+            counters = [[name, list(map(list, labels)), value] for (name, labels), value in self._counters.items()]
+            histograms = [[name, list(map(list, labels)), list(values)] for (name, labels), values in self._histograms.items()]
+        return {'counters': counters, 'histograms': histograms,
+                'buckets': {name: list(buckets) for name, buckets in self._buckets.items()}}
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        os.makedirs(self.directory, exist_ok=True)
+        _write_snapshot(self._path(), self.snapshot())
+
+    def maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"⚠️ [Metrics] 파일 저장 실패: {e}")
+
+    def clear_files(self):
+        # 이전 서버 실행이 남긴 워커 파일과 보관 파일을 지웁니다. 지운 파일 수를 돌려줍니다.
+        # (배포 때 서버 전체가 다시 시작되는 것은 Prometheus 에도 리셋이므로 합계를 0 에서 다시 시작)
+        paths = glob.glob(os.path.join(self.directory, 'metrics-*.json'))
+        for path in paths:
+            with suppress(FileNotFoundError):
+                os.remove(path)
+        return len(paths)
+
+    def collect(self):
+        """모든 워커 파일을 합친 (counters, histograms, buckets) 를 돌려줍니다. 현재 프로세스는 메모리 값을 사용."""
+        own_path, archive_path = self._path(), archive_file_path(self.directory)
+        pattern = os.path.join(self.directory, 'metrics-*.json')
+        for path in glob.glob(pattern):
+            pid = _file_pid(path)
+            if pid is not None and path != own_path and not _process_alive(pid):
+                try:
+                    archive_process_file(self.directory, pid)  # 종료된 워커의 값은 보관 파일로 (합계가 줄지 않도록)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ [Metrics] 종료된 워커({pid}) 파일 보관 실패: {e}")
+        snapshots = [self.snapshot()]
+        with _file_lock(self.directory, exclusive=False):
+            for path in glob.glob(pattern):
+                if path == own_path: continue
+                try:
+                    snapshot = _read_snapshot(path)
+                except (OSError, ValueError):
+                    snapshot = None  # 깨진 파일은 이번 수집에서 건너뜀
+                if snapshot is not None: snapshots.append(snapshot)
+        return _merge(snapshots, self._buckets)
+
+    def render(self):
+        """Prometheus 텍스트 형식 (version 0.0.4)."""
+        counters, histograms, buckets = self.collect()
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            if name in self._help: lines.append(f'# HELP {name} {self._help[name]}')
+            lines.append(f'# TYPE {name} counter')
+            for (metric_name, labels), value in sorted(counters.items()):
+                if metric_name == name: lines.append(f'{name}{_format_labels(labels)} {value}')
+        for name in sorted({name for name, _ in histograms}):
+            if name in self._help: lines.append(f'# HELP {name} {self._help[name]}')
+            lines.append(f'# TYPE {name} histogram')
+            bounds = tuple(buckets.get(name, DEFAULT_BUCKETS)) + (float('inf'),)
+            for (metric_name, labels), values in sorted(histograms.items()):
+                if metric_name != name: continue
+                cumulative = 0
+                for bound, count in zip(bounds, values[:-2]):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", _format_bound(bound))])} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {values[-2]}')
+                lines.append(f'{name}_count{_format_labels(labels)} {values[-1]}')
+        return '\n'.join(lines) + '\n'
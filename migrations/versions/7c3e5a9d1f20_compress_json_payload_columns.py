@@ -0,0 +1,61 @@
+"""Compress JSON payload columns
+
+Revision ID: 7c3e5a9d1f20
+Revises: 61694b13ed17
+Create Date: 2026-10-18 13:02:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from json_codec import compress_json_text, decompress_json_bytes
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e5a9d1f20'
+down_revision = '61694b13ed17'
+branch_labels = None
+depends_on = None
+
+# (테이블, 컬럼, nullable)
+PAYLOAD_COLUMNS = [
+    ('project', 'search_params_json', False),
+    ('project', 'search_results_json', True),
+    ('search_cache', 'results_json', False),
+]
+BATCH_SIZE = 500
+
+
+def _convert(table_name, source, target, encode):
+    # 기존 값을 읽어 새 컬럼에 변환해서 채웁니다. (메모리를 아끼기 위해 id 순으로 나눠서 처리)
+    bind = op.get_bind()
+    table = sa.table(table_name, sa.column('id', sa.Integer), sa.column(source), sa.column(target))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c[source]).where(table.c.id > last_id).order_by(table.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        for row_id, value in rows:
+            bind.execute(table.update().where(table.c.id == row_id).values({target: encode(value) if value is not None else None}))
+        last_id = rows[-1][0]
+
+
+def _swap_columns(new_type, encode):
+    for table_name, column_name, nullable in PAYLOAD_COLUMNS:
+        temp_name = f"{column_name}_new"
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column(temp_name, new_type, nullable=True))
+        _convert(table_name, column_name, temp_name, encode)
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column(column_name)
+            batch_op.alter_column(temp_name, new_column_name=column_name, existing_type=new_type, nullable=nullable)
+
+
+def upgrade():
+    _swap_columns(sa.LargeBinary(), compress_json_text)
+
+
+def downgrade():
+    _swap_columns(sa.Text(), decompress_json_bytes)
@@ -0,0 +1,181 @@
+# ===================================================================
+#   project_refresh.py (저장된 프로젝트의 통계만 새로고침 + 변화량 스냅샷)
+# ===================================================================
+# 저장된 프로젝트를 최신 상태로 보려면 같은 검색을 다시 해야 했고(100+ units),
+# 그마저도 다른 영상 목록이 돌아왔습니다. ProjectRefresher 는 search_results_json 에
+# 이미 들어 있는 영상/채널 ID 만으로
+#   - videos.list(part=statistics) / channels.list(part=statistics) 를 50개씩 묶어 호출하고 (각 1 unit)
+#   - 조회수/좋아요/구독자 수를 바꾼 뒤 vph, ratio, likeRatio 를 다시 계산해 프로젝트에 덮어쓰고
+#   - 직전 값과의 차이만 ProjectSnapshot 에 남깁니다.
+# 여러 프로젝트를 한 번에 새로고침하면 프로젝트끼리 겹치는 영상/채널은 한 번만 조회합니다.
+#
+# 변화량(delta) 형식 (값이 바뀐 항목만 기록):
+#   {"videos": {videoId: [조회수 증가, 좋아요 증가]}, "channels": {channelId: 구독자 증가},
+#    "unavailable": [삭제/비공개되어 조회되지 않은 videoId, ...]}
+#
+# videoId 나 publishedAt 이 없는 등 형식이 다른 항목은 새로고침하지 않고, 저장할 때 그대로 다시 씁니다.
+import math
+from datetime import datetime, timezone
+
+from cache_store import chunked
+from json_codec import dumps_bytes, loads
+from search_metrics import recompute_result_metrics
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _count(statistics, key, previous):
+    # 좋아요 수를 숨긴 영상처럼 값이 빠져 있으면 이전 값을 유지합니다.
+    value = statistics.get(key)
+    return int(value) if value is not None else previous
+
+
+def _is_refreshable(video):
+    # 조회수 등을 다시 계산할 수 있는 항목인지 확인하고, 빠진 숫자 값은 0 으로 채웁니다.
+    if not isinstance(video, dict) or not isinstance(video.get('videoId'), str) or not video['videoId']: return False
+    try:
+        datetime.fromisoformat(video['publishedAt'].replace('Z', '+00:00'))
+        counts = [int(video.get(key) or 0) for key in ('viewCount', 'likeCount', 'subscriberCount')]
+    except (KeyError, AttributeError, TypeError, ValueError):
+        return False
+    video['viewCount'], video['likeCount'], video['subscriberCount'] = counts
+    return True
+
+
+class ProjectRefresher:
+    def __init__(self, db, project_model, snapshot_model, youtube_clients, channel_stats_store=None,
+                 on_view_counts=None, batch_size=50):
+        self.db = db
+        self.project_model = project_model
+        self.snapshot_model = snapshot_model
+        self.youtube_clients = youtube_clients
+        self.channel_stats_store = channel_stats_store  # 구독자 수는 천천히 바뀌므로 TTL 안의 값은 재사용
+        self.on_view_counts = on_view_counts  # {videoId: 조회수} 를 받는 훅 (예: 조회수 표본 기록)
+        self.batch_size = batch_size  # 한 번에 함께 새로고침할 프로젝트 수
+
+    @staticmethod
+    def load_results(project):
+        # 저장된 목록 전체를 돌려줍니다. (목록이 아니면 None: 새로고침하지 않고 값도 건드리지 않음)
+        results = loads(project.search_results_json) if project.search_results_json else []
+        return results if isinstance(results, list) else None
+
+    @staticmethod
+    def refreshable(results):
+        return [video for video in results or [] if _is_refreshable(video)]
+
+    @classmethod
+    def collect_ids(cls, results_list):
+        video_ids, channel_ids = {}, {}
+        for results in results_list:
+            for video in cls.refreshable(results):
+                video_ids[video['videoId']] = True
+                if video.get('channelId'): channel_ids[video['channelId']] = True
+        return list(video_ids), list(channel_ids)
+
+    def estimate_cost(self, video_count, channel_count):
+        return math.ceil(video_count / 50) + math.ceil(channel_count / 50)
+
+    # ▼▼▼ 통계 조회 (영상/채널 배치를 모두 동시에 요청) ▼▼▼
+    def fetch_statistics(self, video_ids, channel_ids):
+        youtube = self.youtube_clients.get_service()
+        channel_stats, missing_channel_ids = {}, list(channel_ids)
+        if self.channel_stats_store is not None:
+            channel_stats, missing_channel_ids = self.channel_stats_store.get_many(channel_ids)
+        video_futures = [self.youtube_clients.submit(youtube.videos().list(part='statistics', id=','.join(batch), maxResults=50))
+                         for batch in chunked(video_ids)]
+        channel_futures = [self.youtube_clients.submit(youtube.channels().list(part='statistics', id=','.join(batch), maxResults=50))
+                           for batch in chunked(missing_channel_ids)]
+        video_stats = {}
+        for future in video_futures:
+            for item in self.youtube_clients.result(future).get('items', []):
+                video_stats[item['id']] = item.get('statistics', {})
+        fetched_channels = {}
+        for future in channel_futures:
+            for item in self.youtube_clients.result(future).get('items', []):
+                fetched_channels[item['id']] = item.get('statistics', {})
+        if self.channel_stats_store is not None and fetched_channels:
+            self.channel_stats_store.put_many(fetched_channels)
+        return video_stats, {**channel_stats, **fetched_channels}
+
+    # ▼▼▼ 새로고침 ▼▼▼
+    def apply_statistics(self, results, video_stats, channel_stats):
+        """결과 목록을 제자리에서 갱신하고 직전 값과의 차이(delta)를 돌려줍니다. (형식이 다른 항목은 건너뜀)"""
+        delta = {'videos': {}, 'channels': {}, 'unavailable': []}
+        for video in results:
+            try:
+                self._apply_video_statistics(video, video_stats, channel_stats, delta)
+            except (KeyError, AttributeError, TypeError, ValueError) as e:
+                print(f"⚠️ [ProjectRefresh] 형식이 다른 항목을 건너뜁니다: {e!r}")
+        return delta
+
+    @staticmethod
+    def _apply_video_statistics(video, video_stats, channel_stats, delta):
+        statistics = video_stats.get(video['videoId'])
+        if statistics is None:
+            delta['unavailable'].append(video['videoId'])
+        else:
+            previous_views, previous_likes = video.get('viewCount', 0), video.get('likeCount', 0)
+            views = _count(statistics, 'viewCount', previous_views)
+            likes = _count(statistics, 'likeCount', previous_likes)
+            if views != previous_views or likes != previous_likes:
+                delta['videos'][video['videoId']] = [views - previous_views, likes - previous_likes]
+            video['viewCount'], video['likeCount'] = views, likes
+        channel_id = video.get('channelId')
+        if channel_id in channel_stats and not channel_stats[channel_id].get('hiddenSubscriberCount'):
+            previous_subscribers = video.get('subscriberCount', 0)
+            subscribers = _count(channel_stats[channel_id], 'subscriberCount', previous_subscribers)
+            if subscribers != previous_subscribers:
+                delta['channels'][channel_id] = subscribers - previous_subscribers
+            video['subscriberCount'] = subscribers
+
+    def refresh(self, projects, now=None, results_by_project=None):
+        """프로젝트 목록을 한 번에 새로고침하고 {project_id: 요약} 을 돌려줍니다. (commit 까지)"""
+        now = now or _utcnow()
+        results_by_project = results_by_project or {project.id: self.load_results(project) for project in projects}
+        video_ids, channel_ids = self.collect_ids(results_by_project.values())
+        video_stats, channel_stats = self.fetch_statistics(video_ids, channel_ids)
+
+        summary = {}
+        for project in projects:
+            results = results_by_project[project.id]
+            videos = self.refreshable(results)
+            delta = self.apply_statistics(videos, video_stats, channel_stats)
+            recompute_result_metrics(videos, now.replace(tzinfo=timezone.utc))
+            # 갱신한 항목은 목록 안에서 제자리 수정되었으므로, 형식이 다른 항목까지 목록 전체를 그대로 저장합니다.
+            if results is not None: project.search_results_json = dumps_bytes(results)
+            project.refreshed_at = now
+            self.db.session.add(self.snapshot_model(project_id=project.id, created_at=now, delta_json=dumps_bytes(delta)))
+            summary[project.id] = {'videos': len(videos), 'changed': len(delta['videos']), 'unavailable': len(delta['unavailable'])}
+        if self.on_view_counts is not None and video_stats:
+            self.on_view_counts({video_id: statistics.get('viewCount', 0) for video_id, statistics in video_stats.items()})
+        self.db.session.commit()
+        return summary
+
+    def refresh_many(self, project_ids, consume_quota=None, refund_quota=None):
+        """project_ids 를 batch_size 개씩 나눠 새로고침합니다.
+
+        consume_quota(units) 가 False 를 돌려주면 남은 프로젝트는 건너뛰고 'skipped' 에 담습니다.
+        배치 새로고침이 실패하면 그 배치에서 차감한 만큼 refund_quota(units) 로 돌려주고 예외를 그대로 올립니다.
+        큰 JSON 컬럼은 배치마다 필요한 만큼만 읽습니다.
+        """
+        refreshed, skipped = {}, []
+        batches = chunked(list(dict.fromkeys(project_ids)), self.batch_size)
+        for index, batch in enumerate(batches):
+            projects = self.db.session.query(self.project_model).filter(self.project_model.id.in_(batch)).all()
+            results_by_project = {project.id: self.load_results(project) for project in projects}
+            cost = 0
+            if consume_quota is not None:
+                video_ids, channel_ids = self.collect_ids(results_by_project.values())
+                cost = self.estimate_cost(len(video_ids), len(channel_ids))
+                if not consume_quota(cost):
+                    skipped = [project_id for rest in batches[index:] for project_id in rest]
+                    break
+            try:
+                refreshed.update(self.refresh(projects, results_by_project=results_by_project))
+            except Exception:
+                if cost and refund_quota is not None: refund_quota(cost)
+                raise
+            self.db.session.expunge_all()  # 다음 배치를 읽기 전에 큰 JSON 을 들고 있는 객체를 놓아줍니다.
+        return {'refreshed': refreshed, 'skipped': skipped}
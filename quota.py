@@ -0,0 +1,192 @@
+# ===================================================================
+#          quota.py (YouTube Data API 쿼터 장부 + 예산 스케줄러)
+# ===================================================================
+# YouTube Data API 는 호출마다 쿼터 단위(unit)를 차감합니다.
+#   search.list = 100, videos.list / channels.list / playlistItems.list = 1
+# QuotaLedger 는 호출 1건당 (사용자, 엔드포인트, 단위)를 기록하고,
+# QuotaScheduler 는 전역/사용자별 일일 예산과 토큰 버킷으로 호출을 제한합니다.
+# 쿼터는 태평양 시간 자정에 초기화되므로 "오늘"도 그 기준으로 계산합니다.
+#
+# 주의: 토큰 버킷은 프로세스마다 따로 있습니다. (gunicorn 워커끼리 공유하지 않음)
+#   - processes 에 워커 수를 넘기면 버킷 크기/충전 속도를 워커 수로 나눠, 서버 전체의 순간 사용량이
+#     설정한 값을 넘지 않게 합니다. (한 번의 검색은 가능하도록 버킷 크기는 최소 300)
+#   - 워커 간의 일일 합계는 장부(DB) 합계로만 확인하며, 이 값은 sum_cache_seconds 동안 캐시됩니다.
+#   - 버킷은 호출 전에 예상 비용을 차감하므로, 호출이 실패하거나 캐시/병합된 결과를 쓰면 refund 합니다.
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import func, insert
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:  # tzdata 가 없는 환경(Windows 등)에서는 고정 오프셋 사용
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+QUOTA_COSTS = {
+    'search.list': 100,
+    'videos.list': 1,
+    'channels.list': 1,
+    'playlistItems.list': 1,
+}
+
+
+def quota_cost(method_id):
+    # googleapiclient 의 methodId('youtube.search.list')에서 서비스 이름을 뗀 값으로 조회
+    endpoint = method_id.split('.', 1)[1] if method_id.count('.') >= 2 else method_id
+    return endpoint, QUOTA_COSTS.get(endpoint, 1)
+
+
+def quota_day_start(now=None):
+    now = (now or datetime.now(timezone.utc)).astimezone(QUOTA_TIMEZONE)
+    return now.replace(hour=0, minute=0, second=0, microsecond=0).astimezone(timezone.utc)
+
+
+class TokenBucket:
+    def __init__(self, capacity, refill_per_second):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+    def try_consume(self, amount):
+        with self._lock:
+            self._refill()
+            if self.tokens < amount: return False
+            self.tokens -= amount
+            return True
+
+    def refund(self, amount):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class QuotaLedger:
+    """호출 기록을 메모리에 모았다가 요청이 끝날 때 한 번에 DB 로 내보냅니다."""
+
+    def __init__(self, db, model, sum_cache_seconds=30):
+        self.db = db
+        self.model = model
+        self.sum_cache_seconds = sum_cache_seconds
+        self._pending = []
+        self._sum_cache = {}
+        self._lock = threading.Lock()
+
+    def record(self, user_id, endpoint, units):
+        with self._lock:
+            self._pending.append({'user_id': user_id, 'endpoint': endpoint, 'units': units,
+                                  'created_at': datetime.now(timezone.utc)})
+
+    def flush(self):
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows: return
+        try:
+            # 요청 세션과 분리된 트랜잭션으로 기록합니다.
+            with self.db.engine.begin() as connection:
+                connection.execute(insert(self.model.__table__), rows)
+            with self._lock:
+                self._sum_cache.clear()
+        except Exception as e:
+            print(f"❌ Quota ledger flush Error: {e}")
+            with self._lock:
+                self._pending = rows + self._pending
+
+    def used_today(self, user_id=None):
+        day_start = quota_day_start()
+        cache_key = (day_start, user_id)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._sum_cache.get(cache_key)
+            pending = sum(row['units'] for row in self._pending
+                          if row['created_at'] >= day_start and (user_id is None or row['user_id'] == user_id))
+        if cached and now - cached[0] < self.sum_cache_seconds:
+            return cached[1] + pending
+
+        query = self.db.session.query(func.coalesce(func.sum(self.model.units), 0)) \
+            .filter(self.model.created_at >= day_start.replace(tzinfo=None))
+        if user_id is not None:
+            query = query.filter(self.model.user_id == user_id)
+        used = int(query.scalar())
+        with self._lock:
+            self._sum_cache[cache_key] = (now, used)
+        return used + pending
+
+
+class QuotaScheduler:
+    """전역/사용자별 일일 예산 + 토큰 버킷(순간 폭주 방지)으로 새 API 호출을 허용할지 결정합니다."""
+
+    OK, TIGHT, EXHAUSTED = 'ok', 'tight', 'exhausted'
+
+    def __init__(self, ledger, daily_budget=10000, user_daily_budget=2000, reserve_ratio=0.2, burst_ratio=0.25, processes=1):
+        self.ledger = ledger
+        self.daily_budget = daily_budget
+        self.user_daily_budget = user_daily_budget
+        self.reserve_ratio = reserve_ratio
+        self.burst_ratio = burst_ratio
+        self.processes = max(int(processes), 1)  # 버킷을 나눠 가질 프로세스(워커) 수
+        # 하루 예산을 고르게 쓰도록 초당 충전량을 정하고, 버스트는 일부만 허용합니다.
+        self.global_bucket = TokenBucket(max(daily_budget * burst_ratio / self.processes, 300), daily_budget / 86400 / self.processes)
+        self._user_buckets = {}
+        self._lock = threading.Lock()
+
+    def _user_bucket(self, user_id):
+        with self._lock:
+            bucket = self._user_buckets.get(user_id)
+            if bucket is None:
+                bucket = self._user_buckets[user_id] = TokenBucket(
+                    max(self.user_daily_budget * self.burst_ratio * 2 / self.processes, 300), self.user_daily_budget / 86400 / self.processes)
+            return bucket
+
+    def remaining(self, user_id=None):
+        global_remaining = max(self.daily_budget - self.ledger.used_today(), 0)
+        result = {'global_remaining': global_remaining, 'global_budget': self.daily_budget,
+                  'resets_at': (quota_day_start() + timedelta(days=1)).isoformat()}
+        if user_id is not None:
+            result['user_remaining'] = max(self.user_daily_budget - self.ledger.used_today(user_id), 0)
+            result['user_budget'] = self.user_daily_budget
+        result['status'] = self.status(user_id, 0, result)
+        return result
+
+    def status(self, user_id, cost, remaining=None):
+        remaining = remaining or self.remaining(user_id)
+        user_remaining = remaining.get('user_remaining', remaining['global_remaining'])
+        if remaining['global_remaining'] < cost or user_remaining < cost:
+            return self.EXHAUSTED
+        if cost and (self.global_bucket.available() < cost or (user_id is not None and self._user_bucket(user_id).available() < cost)):
+            return self.EXHAUSTED
+        reserve = self.daily_budget * self.reserve_ratio
+        if remaining['global_remaining'] - cost < reserve or user_remaining - cost < self.user_daily_budget * self.reserve_ratio:
+            return self.TIGHT
+        return self.OK
+
+    def refund(self, user_id, cost):
+        # 실제로 API 를 호출하지 않았거나(캐시/병합된 결과 사용) 호출이 실패했을 때 차감했던 토큰을 돌려줍니다.
+        self.global_bucket.refund(cost)
+        if user_id is not None:
+            self._user_bucket(user_id).refund(cost)
+
+    def consume(self, user_id, cost):
+        # 토큰 버킷에서 예상 비용을 먼저 차감합니다. 실제 사용량은 장부에 따로 기록됩니다.
+        if not self.global_bucket.try_consume(cost): return False
+        if user_id is not None and not self._user_bucket(user_id).try_consume(cost):
+            self.global_bucket.refund(cost)
+            return False
+        return True
+
+    def try_consume(self, user_id, cost):
+        # 일일 잔량과 토큰 버킷을 모두 확인한 뒤 차감합니다. (백그라운드 작업/CLI/표본 수집용, user_id=None 이면 전역 예산만)
+        # 차감한 뒤 호출이 실패하면 refund 로 돌려줘야 합니다.
+        return self.status(user_id, cost) != self.EXHAUSTED and self.consume(user_id, cost)
@@ -0,0 +1,139 @@
+# ===================================================================
+#       search_metrics.py (검색 결과 지표 계산 + 필터를 열 단위로 처리)
+# ===================================================================
+# 영상마다 파이썬 루프를 돌던 후처리(날짜 파싱, 길이 파싱, VPH/비율 계산,
+# 필터 검사)를 numpy 배열 연산 한 번으로 처리합니다. 필터는 불리언 마스크로
+# 적용하고, 출력 dict 는 마스크를 통과한 행에 대해서만 만듭니다.
+# 반올림은 기존 결과와 똑같이 나오도록 파이썬 round() 를 그대로 사용합니다.
+import re
+from datetime import datetime, timezone, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ISO_DURATION_RE = re.compile(
+    r'^P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?'
+    r'(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$')
+
+
+# ▼▼▼ YouTube 가 돌려주는 ISO-8601 길이(PT1H2M3S, P1DT2H, P0D 등)만 다루는 경량 파서 ▼▼▼
+@lru_cache(maxsize=8192)
+def parse_iso_duration(value):
+    match = _ISO_DURATION_RE.match(value or '')
+    if not match: return 0.0
+    parts = {key: float(number) for key, number in match.groupdict().items() if number}
+    return timedelta(weeks=parts.get('weeks', 0), days=parts.get('days', 0), hours=parts.get('hours', 0),
+                     minutes=parts.get('minutes', 0), seconds=parts.get('seconds', 0)).total_seconds()
+
+
+@lru_cache(maxsize=8192)
+def format_duration(seconds):
+    return str(timedelta(seconds=int(seconds)))
+
+
+def _published_epoch_us(published_values):
+    # 'Z' 로 끝나는 UTC 문자열은 numpy datetime64 로 한 번에 변환합니다.
+    if all(value.endswith('Z') for value in published_values):
+        return np.array([value[:-1] for value in published_values], dtype='datetime64[us]').astype(np.int64)
+    return np.array([(datetime.fromisoformat(value.replace('Z', '+00:00')) - _EPOCH) // timedelta(microseconds=1)
+                     for value in published_values], dtype=np.int64)
+
+
+def _published_formatted(value, epoch_us):
+    if value.endswith('Z'): return value[2:10]
+    return (_EPOCH + timedelta(microseconds=epoch_us)).strftime('%y-%m-%d')
+
+
+def compute_rates(views, likes, subscribers, published_us, now_time):
+    # timedelta.total_seconds() 와 같은 계산 순서를 유지해야 결과가 똑같이 나옵니다.
+    now_us = (now_time - _EPOCH) // timedelta(microseconds=1)
+    diff_hours = ((now_us - published_us) / 10**6) / 3600
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vph = np.where(diff_hours >= 1, np.rint(views / np.where(diff_hours >= 1, diff_hours, 1)), views).astype(np.int64)
+        ratio = np.where(subscribers > 0, (views / np.where(subscribers > 0, subscribers, 1)) * 100, 0.0)
+        like_ratio = np.where(views > 0, (likes / np.where(views > 0, views, 1)) * 100, 0.0)
+    return vph, ratio, like_ratio
+
+
+def compute_columns(raw_items, now_time=None):
+    now_time = now_time or datetime.now(timezone.utc)
+    count = len(raw_items)
+    views = np.fromiter((raw['viewCount'] for raw in raw_items), dtype=np.int64, count=count)
+    likes = np.fromiter((raw['likeCount'] for raw in raw_items), dtype=np.int64, count=count)
+    subscribers = np.fromiter((raw['subscriberCount'] for raw in raw_items), dtype=np.int64, count=count)
+    made_for_kids = np.fromiter((bool(raw['madeForKids']) for raw in raw_items), dtype=bool, count=count)
+    duration_seconds = np.fromiter((parse_iso_duration(raw['duration']) for raw in raw_items), dtype=np.float64, count=count)
+    published_us = _published_epoch_us([raw['publishedAt'] for raw in raw_items])
+    vph, ratio, like_ratio = compute_rates(views, likes, subscribers, published_us, now_time)
+
+    return {
+        'views': views, 'likes': likes, 'subscribers': subscribers, 'made_for_kids': made_for_kids,
+        'duration_seconds': duration_seconds, 'published_us': published_us,
+        'vph': vph, 'ratio': ratio, 'like_ratio': like_ratio,
+    }
+
+
+def build_filter_mask(columns, params):
+    mask = columns['views'] >= int(params.get('minViews', 0))
+    if params.get('excludeKids'):
+        mask &= ~columns['made_for_kids']
+    if params.get('useVPH'):
+        mask &= columns['vph'] >= int(params.get('minVPH', 0))
+
+    duration_seconds = columns['duration_seconds']
+    length_filter = params.get('videoLength')
+    if length_filter == 'short':
+        mask &= duration_seconds < 240
+    elif length_filter == 'medium':
+        mask &= (duration_seconds >= 240) & (duration_seconds <= 1200)
+    elif length_filter == 'long':
+        mask &= duration_seconds > 1200
+    return mask
+
+
+# ▼▼▼ 캐시된 원본 목록에 지표 계산과 필터(minViews, minVPH, videoLength, excludeKids)를 적용 ▼▼▼
+def apply_search_filters(raw_items, params, now_time=None):
+    if not raw_items: return []
+    columns = compute_columns(raw_items, now_time)
+    selected = np.flatnonzero(build_filter_mask(columns, params)).tolist()
+
+    views, likes, subscribers = columns['views'].tolist(), columns['likes'].tolist(), columns['subscribers'].tolist()
+    vph, duration_seconds, published_us = columns['vph'].tolist(), columns['duration_seconds'].tolist(), columns['published_us'].tolist()
+    ratio, like_ratio = columns['ratio'].tolist(), columns['like_ratio'].tolist()
+
+    results = []
+    for i in selected:
+        raw = raw_items[i]
+        results.append({
+            'videoId': raw['videoId'], 'channelId': raw['channelId'], 'title': raw['title'],
+            'channelTitle': raw['channelTitle'], 'publishedAt': raw['publishedAt'],
+            'thumbnail': raw['thumbnail'],
+            'viewCount': views[i], 'likeCount': likes[i], 'subscriberCount': subscribers[i],
+            'ratio': round(ratio[i], 2) if subscribers[i] > 0 else 0,
+            'likeRatio': round(like_ratio[i], 2) if views[i] > 0 else 0,
+            'vph': vph[i],
+            'publishedAt_timestamp': published_us[i] / 10**6,
+            'publishedAt_formatted': _published_formatted(raw['publishedAt'], published_us[i]),
+            'duration_seconds': duration_seconds[i],
+            'duration_formatted': format_duration(duration_seconds[i]),
+            'captionAvailable': raw['captionAvailable']
+        })
+    return results
+
+
+# ▼▼▼ 저장된 결과(apply_search_filters 출력)의 조회수/좋아요/구독자 수가 바뀐 뒤 vph, ratio, likeRatio 만 다시 계산 (제자리 수정) ▼▼▼
+def recompute_result_metrics(results, now_time=None):
+    if not results: return results
+    now_time = now_time or datetime.now(timezone.utc)
+    count = len(results)
+    views = np.fromiter((video['viewCount'] for video in results), dtype=np.int64, count=count)
+    likes = np.fromiter((video['likeCount'] for video in results), dtype=np.int64, count=count)
+    subscribers = np.fromiter((video['subscriberCount'] for video in results), dtype=np.int64, count=count)
+    published_us = _published_epoch_us([video['publishedAt'] for video in results])
+    vph, ratio, like_ratio = (column.tolist() for column in compute_rates(views, likes, subscribers, published_us, now_time))
+    for i, video in enumerate(results):
+        video['vph'] = vph[i]
+        video['ratio'] = round(ratio[i], 2) if video['subscriberCount'] > 0 else 0
+        video['likeRatio'] = round(like_ratio[i], 2) if video['viewCount'] > 0 else 0
+    return results
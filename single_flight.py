@@ -0,0 +1,103 @@
+# ===================================================================
+#        single_flight.py (같은 검색이 동시에 들어오면 한 번만 실행)
+# ===================================================================
+# 같은 search_hash 로 요청이 겹치면 먼저 온 요청(leader)만 YouTube 를 호출하고,
+# 뒤에 온 요청(follower)은 leader 의 결과를 기다렸다가 그대로 사용합니다.
+#   - 같은 프로세스 안: threading.Event 로 대기
+#   - gunicorn 워커 간: 키별 파일 잠금(fcntl.flock)으로 직렬화합니다. 잠금을
+#     얻은 뒤 호출되는 함수가 DB 캐시를 다시 확인하므로, 다른 워커의 leader 가
+#     채워 둔 결과를 그대로 읽게 됩니다. (빈 결과도 캐시에 남겨야 follower 가 다시 호출하지 않음)
+# do() 는 (결과, shared) 를 돌려주며, shared 는 다른 요청의 결과를 기다렸는지를 뜻합니다.
+#   - 같은 프로세스의 follower: leader 의 결과를 그대로 받음
+#   - 다른 워커의 잠금을 기다린 요청: 잠금을 얻은 뒤 func 를 실행하므로 보통 캐시에서 읽지만,
+#     leader 가 실패했다면 직접 호출했을 수도 있습니다. (쿼터 정산은 호출자가 실제 호출 여부로 판단)
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경에서는 프로세스 내부 병합만 사용
+    fcntl = None
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, lock_dir=None, wait_timeout=60, lock_stripes=4096):
+        self.lock_dir = lock_dir
+        self.wait_timeout = wait_timeout
+        self.lock_stripes = lock_stripes
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        # fork 된 자식 프로세스용: 부모에서 진행 중이던 호출 목록과 잠금 상태를 물려받지 않습니다.
+        # (파일 잠금은 호출마다 열고 닫으므로 자식에 남는 것이 없음)
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _process_lock(self, key):
+        # 다른 프로세스가 잡고 있던 잠금을 기다렸으면 True 를 넘겨줍니다.
+        if fcntl is None or not self.lock_dir:
+            yield False
+            return
+        # 키마다 파일을 만들지 않고, 정해진 개수의 잠금 파일에 나눠 담습니다.
+        stripe = int(hashlib.sha1(key.encode('utf-8')).hexdigest(), 16) % self.lock_stripes
+        os.makedirs(self.lock_dir, exist_ok=True)
+        with open(os.path.join(self.lock_dir, f"flight-{stripe:04d}.lock"), 'a+') as lock_file:
+            deadline = time.monotonic() + self.wait_timeout
+            waited = False
+            while True:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() > deadline:  # 잠금을 오래 못 얻으면 그냥 직접 실행
+                        yield False
+                        return
+                    waited = True
+                    time.sleep(0.05)
+            try:
+                yield waited
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def do(self, key, func):
+        # (결과, 다른 요청의 결과를 공유받았는지 여부) 를 돌려줍니다.
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            if call.event.wait(self.wait_timeout):
+                if call.error is not None: raise call.error
+                return call.result, True
+            return func(), False  # leader 가 너무 오래 걸리면 직접 실행
+
+        try:
+            with self._process_lock(key) as waited:
+                call.result = func()
+            return call.result, waited
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+
+def default_lock_dir():
+    return os.environ.get('SINGLE_FLIGHT_LOCK_DIR', os.path.join(tempfile.gettempdir(), 'benchly-locks'))
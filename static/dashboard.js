@@ -21,8 +21,64 @@ document.addEventListener('DOMContentLoaded', () => {
         if (targetButton.classList.contains('btn-load')) {
             handleLoad(projectId);
         }
+
+        // 클릭된 것이 '통계 새로고침' 버튼인지 확인
+        if (targetButton.classList.contains('btn-refresh')) {
+            handleRefresh({ projectIds: [Number(projectId)] }, targetButton);
+        }
     });
 
+    const refreshAllButton = document.getElementById('refresh-all-button');
+    if (refreshAllButton) {
+        refreshAllButton.addEventListener('click', (event) => {
+            event.preventDefault();
+            handleRefresh({ all: true }, refreshAllButton);
+        });
+    }
+
+    /**
+     * [신규] 통계 새로고침: 검색을 다시 하지 않고 저장된 영상들의 조회수/좋아요/구독자 수만 갱신 (작업 큐에서 실행)
+     */
+    async function handleRefresh(body, buttonElement) {
+        const originalText = buttonElement.innerHTML;
+        buttonElement.innerHTML = '<i class="fa-solid fa-spinner fa-spin"></i> 새로고침 중...';
+        buttonElement.style.pointerEvents = 'none';
+        try {
+            const submitResponse = await fetch('/api/jobs/refresh_projects', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(body),
+            });
+            let data = await submitResponse.json();
+            if (!data.success) throw new Error(data.error);
+            // 서버 스레드를 오래 붙잡지 않도록 짧게(wait=1) 조회하고, 조회 간격은 0.5초부터 최대 4초까지 늘립니다.
+            let delay = 500;
+            while (data.job.status === 'queued' || data.job.status === 'running') {
+                await new Promise(resolve => setTimeout(resolve, delay));
+                delay = Math.min(delay * 2, 4000);
+                const pollResponse = await fetch(`/api/jobs/${data.job.id}?wait=1`);
+                data = await pollResponse.json();
+                if (!data.success) throw new Error(data.error);
+            }
+            if (data.job.status === 'failed') throw new Error(data.job.error);
+            const result = data.job.result;
+            const refreshedAt = new Date().toLocaleString();
+            Object.keys(result.refreshed).forEach(projectId => {
+                const label = document.querySelector(`#project-item-${projectId} .refreshed-at`);
+                if (label) label.textContent = ` · 통계 갱신: ${refreshedAt}`;
+            });
+            let message = `프로젝트 ${Object.keys(result.refreshed).length}개의 통계를 새로고침했습니다.`;
+            if (result.skipped.length) message += `\n(YouTube API 사용량 부족으로 ${result.skipped.length}개는 건너뛰었습니다.)`;
+            alert(message);
+        } catch (error) {
+            console.error('Refresh Error:', error);
+            alert('통계 새로고침 중 오류가 발생했습니다: ' + error.message);
+        } finally {
+            buttonElement.innerHTML = originalText;
+            buttonElement.style.pointerEvents = '';
+        }
+    }
+
     /**
      * 삭제 버튼 처리 함수 (기존과 동일)
      */
@@ -56,12 +112,12 @@ document.addEventListener('DOMContentLoaded', () => {
         .then(response => response.json())
         .then(data => {
             if (data.success) {
-                // 2. 검색 조건(params)과 결과(results)를 모두 localStorage에 저장
-                localStorage.setItem('projectToLoad_Params', data.search_params_json);
-                localStorage.setItem('projectToLoad_Results', data.search_results_json);
+                // 2. 검색 조건(params)과 결과(results)를 모두 localStorage에 저장 (응답에 객체로 포함됨)
+                localStorage.setItem('projectToLoad_Params', JSON.stringify(data.search_params));
+                localStorage.setItem('projectToLoad_Results', JSON.stringify(data.search_results || []));
                 
-                // 3. 검색 페이지('/search')로 이동
-                window.location.href = '/search';
+                // 3. 검색 페이지('/')로 이동
+                window.location.href = '/';
             } else {
                 alert('오류: ' + data.error);
                 if (data.error.includes('로그인')) {
@@ -43,6 +43,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const targetLanguage = document.getElementById('targetLanguage');
     const keywordRecommendationArea = document.getElementById('keyword-recommendation-area');
     const keywordChipsContainer = document.getElementById('keyword-chips-container');
+    const quotaWarning = document.getElementById('quota-warning');
     
     // --- '스크립트/AI' 모달 요소 ---
     const modalOverlay = document.getElementById('transcript-modal');
@@ -65,8 +66,11 @@ document.addEventListener('DOMContentLoaded', () => {
     const minViewCount = document.getElementById('minViewCount');
     const vphToggle = document.getElementById('vphToggle');
     const minVPH = document.getElementById('minVPH');
+    const minViews24h = document.getElementById('minViews24h');
     const maxResults = document.getElementById('maxResults');
     const excludeMadeForKids = document.getElementById('excludeMadeForKids');
+    const multiPageToggle = document.getElementById('multiPageToggle');
+    const targetResults = document.getElementById('targetResults');
     
     // AI 프롬프트 
      const DEFAULT_AI_PROMPT = `당신은 최고의 유튜브 영상 분석 전문가입니다. 
@@ -99,6 +103,11 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // --- AI 추천 키워드 클릭 이벤트 ---
     keywordChipsContainer.addEventListener('click', (event) => {
+        if (event.target.classList.contains('keyword-chip-batch')) {
+            const queries = [...keywordChipsContainer.querySelectorAll('.keyword-chip[data-keyword]')].map(chip => chip.dataset.keyword);
+            startBatchSearch(queries);
+            return;
+        }
         if (event.target.classList.contains('keyword-chip')) {
             const newKeyword = event.target.dataset.keyword;
             searchInput.value = newKeyword;
@@ -155,7 +164,7 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     // --- 필터 변경 시 자동 재검색 이벤트 리스너 (모든 필터에 공통 적용) ---
-    [sortOrder, videoLengthType, regionCode, uploadDays, minViewCount, vphToggle, minVPH, maxResults, excludeMadeForKids].forEach(filterElement => {
+    [sortOrder, videoLengthType, regionCode, uploadDays, minViewCount, vphToggle, minVPH, minViews24h, maxResults, excludeMadeForKids].forEach(filterElement => {
         if (filterElement) { // 요소가 존재하는지 확인
             filterElement.addEventListener('change', () => { 
                 if (searchInput.value) { 
@@ -167,10 +176,10 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // ============ 3. 핵심 함수들 ============
 
-    function startSearch(isFromKeywordClick = false, translatedQuery = null) {
-        const searchParams = {
+    function buildSearchParams(query) {
+        return {
             searchType: searchModeKeyword.checked ? 'keyword' : 'channel',
-            query: translatedQuery || searchInput.value,
+            query: query,
             videoLength: videoLengthType.value,
             period: uploadDays.value,
             region: regionCode.value,
@@ -178,10 +187,15 @@ document.addEventListener('DOMContentLoaded', () => {
             minViews: minViewCount.value,
             useVPH: vphToggle.checked,
             minVPH: minVPH.value,
+            minViews24h: minViews24h.value,
             maxResults: maxResults.value,
             excludeKids: excludeMadeForKids.checked,
             language: targetLanguage.value
         };
+    }
+
+    function startSearch(isFromKeywordClick = false, translatedQuery = null) {
+        const searchParams = buildSearchParams(translatedQuery || searchInput.value);
         
         if (!isFromKeywordClick && searchParams.query) {
             getAndDisplayRelatedKeywords(searchInput.value, targetLanguage.value);
@@ -198,6 +212,11 @@ document.addEventListener('DOMContentLoaded', () => {
         resultsTableBody.innerHTML = '';
         lastSearchParams = searchParams;
 
+        if (multiPageToggle && multiPageToggle.checked && searchParams.searchType === 'keyword') {
+            startPagedSearch({ ...searchParams, targetResults: targetResults.value });
+            return;
+        }
+
         fetch('/api/search', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
@@ -208,6 +227,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 return response.text().then(text => {
                     try {
                         const errorData = JSON.parse(text);
+                        if (errorData.quota) { showQuotaWarning(errorData.quota, false); }
                         throw new Error(errorData.error || `HTTP error! Status: ${response.status}`);
                     } catch {
                         throw new Error(`HTTP error! Status: ${response.status}. Response: ${text}`);
@@ -217,6 +237,7 @@ document.addEventListener('DOMContentLoaded', () => {
             return response.json();
         })
         .then(data => {
+            showQuotaWarning(data.quota, data.stale);
             currentResults = data.items;
             initialMessage.style.display = 'none';
             sortData('ratio', 'desc');
@@ -231,28 +252,140 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
-    function getAndDisplayRelatedKeywords(query, lang) {
-        keywordRecommendationArea.style.display = 'block';
-        keywordChipsContainer.innerHTML = '<div class="loading-spinner"></div> AI가 연관 키워드를 분석 중입니다...';
+    // ▼▼▼ [신규] 추천 키워드 전체를 한 번에 검색 (/api/search/batch) 후 합쳐진 결과를 표시 ▼▼▼
+    function startBatchSearch(queries) {
+        const { query, searchType, ...sharedParams } = buildSearchParams('');
+        initialMessage.innerHTML = `<p>추천 키워드 ${queries.length}개를 한 번에 분석하는 중입니다... (API 호출 중)</p>`;
+        initialMessage.style.display = 'block';
+        resultsTableBody.innerHTML = '';
+        lastSearchParams = { ...sharedParams, searchType: 'keyword', query: queries.join(', '), queries: queries };
 
-        fetch('/api/get_related_keywords', {
+        fetch('/api/search/batch', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ query: query, target_lang: lang }),
+            body: JSON.stringify({ ...sharedParams, queries: queries }),
         })
-        .then(res => {
-            if (!res.ok) {
-                 return res.text().then(text => {
-                    try {
-                        const errorData = JSON.parse(text);
-                        throw new Error(errorData.error || `HTTP error! Status: ${res.status}`);
-                    } catch {
-                        throw new Error(`HTTP error! Status: ${res.status}. Response: ${text}`);
-                    }
-                });
+        .then(response => response.json().then(data => {
+            if (!response.ok) {
+                if (data.quota) { showQuotaWarning(data.quota, false); }
+                throw new Error(data.error || `HTTP error! Status: ${response.status}`);
             }
-            return res.json();
+            return data;
+        }))
+        .then(data => {
+            showQuotaWarning(data.quota, data.stale);
+            if (data.skipped && data.skipped.length) { console.warn('쿼터 부족으로 건너뛴 검색어:', data.skipped); }
+            currentResults = data.merged;
+            initialMessage.style.display = 'none';
+            sortData('ratio', 'desc');
+            renderTable();
+            updateSortHeaders('ratio', 'desc');
         })
+        .catch(error => {
+            console.error('❌ 배치 검색 에러:', error);
+            initialMessage.innerHTML = `<p>데이터를 불러오는 데 실패했습니다. 오류: ${error.message}</p>`;
+            initialMessage.style.display = 'block';
+            currentResults = [];
+        });
+    }
+
+    // ▼▼▼ [신규] 여러 페이지 검색 (/api/search/stream): NDJSON 한 줄(페이지)이 올 때마다 표에 바로 추가 ▼▼▼
+    const PAGED_STOP_MESSAGES = {
+        no_more_pages: '더 이상 검색 결과가 없습니다.',
+        max_pages: '최대 페이지 수까지 검색했습니다.',
+        quota: 'YouTube API 사용량이 부족하여 검색을 멈췄습니다.',
+    };
+
+    async function startPagedSearch(searchParams) {
+        currentResults = [];
+        try {
+            const response = await fetch('/api/search/stream', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(searchParams),
+            });
+            if (!response.ok) {
+                const errorData = await response.json();
+                throw new Error(errorData.error || `HTTP error! Status: ${response.status}`);
+            }
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                for (const line of lines) {
+                    if (!line.trim()) continue;
+                    const data = JSON.parse(line);
+                    if (data.error) throw new Error(data.error);
+                    if (data.items) {
+                        currentResults = currentResults.concat(data.items);
+                        sortData('ratio', 'desc');
+                        renderTable();
+                        updateSortHeaders('ratio', 'desc');
+                    }
+                    if (data.done) {
+                        showQuotaWarning(data.quota, false);
+                        if (data.stopReason !== 'target' && PAGED_STOP_MESSAGES[data.stopReason]) {
+                            console.log(`여러 페이지 검색 종료 (${data.total}/${searchParams.targetResults}개): ${PAGED_STOP_MESSAGES[data.stopReason]}`);
+                        }
+                        if (currentResults.length === 0) renderTable();
+                    }
+                }
+            }
+        } catch (error) {
+            console.error('❌ 여러 페이지 검색 에러:', error);
+            if (currentResults.length === 0) {
+                initialMessage.innerHTML = `<p>데이터를 불러오는 데 실패했습니다. 오류: ${error.message}</p>`;
+                initialMessage.style.display = 'block';
+            }
+        }
+    }
+
+    // ▼▼▼ [신규] YouTube 쿼터가 빠듯하거나 오래된 캐시 결과를 받았을 때 경고 표시 ▼▼▼
+    function showQuotaWarning(quota, isStale) {
+        if (!quotaWarning) return;
+        const messages = [];
+        if (isStale) { messages.push('API 사용량 절약을 위해 최근에 저장된 검색 결과를 보여드립니다.'); }
+        if (quota && quota.status !== 'ok') {
+            const remaining = Math.min(quota.global_remaining, quota.user_remaining ?? quota.global_remaining);
+            messages.push(`오늘 남은 YouTube 검색 가능량이 적습니다. (남은 단위: ${remaining.toLocaleString()}, 검색 1회 ≈ 100)`);
+        }
+        quotaWarning.textContent = messages.join(' ');
+        quotaWarning.style.display = messages.length ? 'block' : 'none';
+    }
+
+    // ▼▼▼ [신규] AI 작업 큐: 작업을 제출하고 끝날 때까지 폴링한 뒤 {success, ...결과} 로 돌려줌 ▼▼▼
+    // 서버 스레드를 오래 붙잡지 않도록 짧게(wait=1) 조회하고, 조회 간격은 0.5초부터 최대 4초까지 늘립니다.
+    // onProgress 를 넘기면 실행 중 작업의 중간 결과(job.progress)를 받고, 화면이 계속 갱신되도록 간격을 1초까지만 늘립니다.
+    async function runAiJob(url, body, onProgress) {
+        const submitResponse = await fetch(url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body),
+        });
+        let data = await submitResponse.json();
+        let delay = 500;
+        while (data.success && (data.job.status === 'queued' || data.job.status === 'running')) {
+            if (onProgress && data.job.progress) onProgress(data.job.progress);
+            await new Promise(resolve => setTimeout(resolve, delay));
+            delay = Math.min(delay * 2, onProgress ? 1000 : 4000);
+            const pollResponse = await fetch(`/api/jobs/${data.job.id}?wait=1`);
+            data = await pollResponse.json();
+        }
+        if (!data.success) return data;
+        return data.job.status === 'done' ? { success: true, ...data.job.result } : { success: false, error: data.job.error };
+    }
+
+    function getAndDisplayRelatedKeywords(query, lang) {
+        keywordRecommendationArea.style.display = 'block';
+        keywordChipsContainer.innerHTML = '<div class="loading-spinner"></div> AI가 연관 키워드를 분석 중입니다...';
+
+        // ▼▼▼ [수정] 요청 안에서 기다리지 않고 AI 작업 큐에 제출한 뒤 결과를 폴링 ▼▼▼
+        runAiJob('/api/jobs/related_keywords', { query: query, target_lang: lang })
         .then(data => {
             if (data.success) {
                 keywordChipsContainer.innerHTML = '';
@@ -275,6 +408,12 @@ document.addEventListener('DOMContentLoaded', () => {
                         }
                         keywordChipsContainer.appendChild(chip);
                     });
+                    if (searchModeKeyword.checked) {
+                        const batchChip = document.createElement('button');
+                        batchChip.className = 'keyword-chip keyword-chip-batch';
+                        batchChip.textContent = '추천 키워드 모두 검색';
+                        keywordChipsContainer.appendChild(batchChip);
+                    }
                 } else {
                     keywordChipsContainer.textContent = 'AI 키워드 추천 실패: 유효한 키워드 리스트를 찾을 수 없습니다.';
                 }
@@ -304,6 +443,8 @@ document.addEventListener('DOMContentLoaded', () => {
         const multiplier = (direction === 'asc') ? 1 : -1;
         currentResults.sort((a, b) => {
             let valA = a[key]; let valB = b[key];
+            // 값이 없는 항목(예: 표본이 부족한 24H 조회수)은 정렬 방향과 관계없이 항상 맨 뒤로
+            if (valA == null || valB == null) { return (valA == null) - (valB == null); }
             if (typeof valA === 'string') { return valA.localeCompare(valB) * multiplier; }
             return (valA - valB) * multiplier;
         });
@@ -352,6 +493,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 <td>${nFormatter(video.viewCount, 1)}</td> 
                 <td class="highlight-metric like-ratio">${video.likeRatio}%</td>
                 <td class="highlight-metric vph">${video.vph.toLocaleString()}</td>
+                <td class="highlight-metric" title="최근 1시간: ${video.views1h ?? '-'} / 7일: ${video.views7d ?? '-'}">${video.views24h == null ? '-' : nFormatter(video.views24h, 1)}</td>
                 <td class="highlight-metric">${nFormatter(video.subscriberCount, 1)}</td> 
                 <td class="highlight-metric ratio">${video.ratio}%</td>
                 <td>${video.duration_formatted}</td> 
@@ -386,6 +528,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 minViewCount.value = params.minViews || '10000';
                 vphToggle.checked = params.useVPH || false;
                 minVPH.value = params.minVPH || '100';
+                minViews24h.value = params.minViews24h || '0';
                 maxResults.value = params.maxResults || '50';
                 excludeMadeForKids.checked = params.excludeKids; 
                 targetLanguage.value = params.language || 'ko';
@@ -535,30 +678,27 @@ function openTranscriptModal(videoId, videoTitle) {
         modalRunAiBtn.innerHTML = '<i class="fa-solid fa-spinner fa-spin"></i> AI가 분석 중입니다...';
         modalAiSummaryContent.innerHTML = `<p>${selectedModel} 모델이 스크립트를 분석 중입니다... (최대 1분 소요)</p>`;
 
-        fetch('/api/get_summary', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ 
-                transcript: transcriptText,
-                prompt: userPrompt,
-                model: selectedModel
-            }),
+        const resetAiButton = () => {
+            modalRunAiBtn.disabled = false;
+            modalRunAiBtn.innerHTML = '<i class="fa-solid fa-wand-magic-sparkles"></i> AI 성공 요인 분석하기';
+        };
+
+        // ▼▼▼ [수정] 요약은 AI 작업 큐에서 생성하고, 폴링할 때마다 지금까지 생성된 부분을 화면에 표시 ▼▼▼
+        runAiJob('/api/jobs/summary', { transcript: transcriptText, prompt: userPrompt, model: selectedModel }, progress => {
+            modalAiSummaryContent.innerHTML = progress.summary_html;
         })
-        .then(response => response.json())
         .then(data => {
             if (data.success) {
-                modalAiSummaryContent.innerHTML = data.summary_html || data.key_points_html; // 서버 응답에 따라 유연하게 처리
+                modalAiSummaryContent.innerHTML = data.summary_html;
             } else {
                 modalAiSummaryContent.innerHTML = "<p>AI 분석 실패: " + data.error + "</p>";
             }
-            modalRunAiBtn.disabled = false;
-            modalRunAiBtn.innerHTML = '<i class="fa-solid fa-wand-magic-sparkles"></i> AI 성공 요인 분석하기';
+            resetAiButton();
         })
         .catch(error => {
             console.error('Error fetching AI summary:', error);
             modalAiSummaryContent.innerHTML = "<p>AI 분석 서버 통신 실패: " + error + "</p>";
-            modalRunAiBtn.disabled = false;
-            modalRunAiBtn.innerHTML = '<i class="fa-solid fa-wand-magic-sparkles"></i> AI 성공 요인 분석하기';
+            resetAiButton();
         });
     });
 });
\ No newline at end of file
@@ -0,0 +1,173 @@
+# ===================================================================
+#   summarizer.py (긴 스크립트 map-reduce 요약 + 결과 HTML 변환/스트리밍)
+# ===================================================================
+# Gemini 응답은 줄바꿈과 **굵게** 표시가 섞인 텍스트입니다.
+# summary_to_html 은 기존 get_summary 의 변환을 그대로 옮긴 것이고,
+# IncrementalSummaryHtml 은 스트리밍으로 조각이 들어올 때 같은 결과가 나오도록
+# 짝이 맞지 않은 '**' 이후만 잠시 붙잡아 두고 나머지는 바로 변환해 내보냅니다.
+#
+# MapReduceSummarizer 는 토큰 예산을 넘는 긴 스크립트를 문장 경계로 나눠
+#   map   : 구간별 요약 (flash 모델, 제한된 스레드 풀에서 동시에 실행)
+#   reduce: 구간 요약들 + 사용자 프롬프트로 최종 프롬프트 구성
+# 순서로 처리합니다. 구간 요약은 내용 해시로 캐시하므로 프롬프트만 바꾸면 reduce 만 다시 실행됩니다.
+# 모델은 generate_content(prompt) 가 .text 를 가진 응답을 돌려주기만 하면 되므로 가짜 모델로 대체할 수 있습니다.
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+BOLD_PATTERN = re.compile(r'\*\*(.*?)\*\*')
+
+
+def summary_to_html(text):
+    html = text.replace('\n', '<br>')
+    return BOLD_PATTERN.sub(r'<strong>\1</strong>', html)
+
+
+class IncrementalSummaryHtml:
+    """feed() 로 받은 텍스트 조각을 변환이 확정된 부분까지만 HTML 로 돌려줍니다."""
+
+    def __init__(self):
+        self._pending = ''
+        self.html = ''  # 지금까지 내보낸 HTML 전체 (summary_to_html(전체 텍스트) 와 같음)
+
+    def _safe_length(self):
+        # 앞에서부터 '**' 를 겹치지 않게 찾아, 마지막으로 짝이 맞은 지점까지를 확정합니다.
+        text, position, opened_at = self._pending, 0, None
+        while True:
+            found = text.find('**', position)
+            if found < 0: break
+            opened_at = found if opened_at is None else None
+            position = found + 2
+        if opened_at is not None: return opened_at
+        # 끝의 '*' 하나는 다음 조각과 합쳐 '**' 가 될 수 있으므로 남겨 둡니다.
+        return len(text) - 1 if text.endswith('*') and position < len(text) else len(text)
+
+    def _emit(self, length):
+        ready, self._pending = self._pending[:length], self._pending[length:]
+        html = summary_to_html(ready) if ready else ''
+        self.html += html
+        return html
+
+    def feed(self, text):
+        if not text: return ''
+        self._pending += text
+        return self._emit(self._safe_length())
+
+    def close(self):
+        return self._emit(len(self._pending))
+
+
+# ▼▼▼ 구간 나누기 ▼▼▼
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?。！？])\s+')
+
+
+def estimate_tokens(text):
+    # 한국어 자막 기준 대략 2글자당 1토큰으로 넉넉하게 잡습니다. (API 로 세지 않음)
+    return len(text) // 2 + 1
+
+
+def _split_long_unit(unit, max_tokens, token_counter):
+    # 문장 부호 없는 자동 자막처럼 한 문장이 예산을 넘으면 단어 단위로, 단어도 넘으면 글자 수로 자릅니다.
+    words = []
+    for word in unit.split(' '):
+        if token_counter(word) <= max_tokens: words.append(word)
+        else: words.extend(word[i:i + max_tokens] for i in range(0, len(word), max_tokens))
+    pieces, current, current_tokens = [], [], 0
+    for word in words:
+        word_tokens = token_counter(word)
+        if current and current_tokens + word_tokens > max_tokens:
+            pieces.append(' '.join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += word_tokens
+    if current: pieces.append(' '.join(current))
+    return pieces
+
+
+def split_transcript(text, max_tokens, token_counter=estimate_tokens):
+    """문장 경계를 지키면서 max_tokens 이하의 구간 목록으로 나눕니다. (순서 유지)"""
+    chunks, current, current_tokens = [], [], 0
+    for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+        if not sentence: continue
+        units = [sentence] if token_counter(sentence) <= max_tokens else _split_long_unit(sentence, max_tokens, token_counter)
+        for unit in units:
+            unit_tokens = token_counter(unit)
+            if current and current_tokens + unit_tokens > max_tokens:
+                chunks.append(' '.join(current))
+                current, current_tokens = [], 0
+            current.append(unit)
+            current_tokens += unit_tokens
+    if current: chunks.append(' '.join(current))
+    return chunks
+
+
+# ▼▼▼ map-reduce 요약기 ▼▼▼
+MAP_PROMPT = (
+    "다음은 긴 유튜브 영상 스크립트의 일부 구간입니다. 이 구간에서 다루는 핵심 내용, 주장, 예시, "
+    "시청자의 관심을 붙잡는 장치(도입부 후킹, 전환, 반전, 행동 유도 등)를 빠짐없이 한국어 글머리표로 정리해주세요. "
+    "구간에 없는 내용은 추측하지 마세요."
+)
+MAP_CACHE_VERSION = 1  # MAP_PROMPT 를 바꾸면 올립니다.
+
+
+class MapReduceSummarizer:
+    def __init__(self, map_model, map_model_name, chunk_cache=None, chunk_tokens=8000, max_workers=4,
+                 call_timeout=120, token_counter=estimate_tokens):
+        self.map_model = map_model
+        self.map_model_name = map_model_name
+        self.chunk_cache = chunk_cache  # get(key) / put(key, payload) 를 가진 캐시 (예: KeyValueCache)
+        self.chunk_tokens = chunk_tokens
+        self.max_workers = max_workers
+        self.call_timeout = call_timeout
+        self.token_counter = token_counter
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='summary-map')
+        return self._executor
+
+    def reset(self):
+        # fork 된 자식 프로세스용: 부모의 스레드 풀은 자식에 스레드가 없으므로 버리고 처음 쓸 때 다시 만듭니다.
+        self._executor = None
+
+    def needs_map_reduce(self, cleaned_script):
+        return self.token_counter(cleaned_script) > self.chunk_tokens
+
+    def chunk_key(self, chunk):
+        key_source = '\0'.join(('chunk', str(MAP_CACHE_VERSION), self.map_model_name, chunk))
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+    def _summarize_chunk(self, chunk):
+        return self.map_model.generate_content(f"{MAP_PROMPT}\n\n--- 구간 스크립트 시작 ---\n{chunk}\n--- 구간 스크립트 끝 ---").text
+
+    def map_chunks(self, chunks):
+        # 캐시 조회/저장은 호출한 스레드(요청 컨텍스트)에서, 모델 호출만 스레드 풀에서 실행합니다.
+        summaries, futures = [None] * len(chunks), {}
+        for index, chunk in enumerate(chunks):
+            cached = self.chunk_cache.get(self.chunk_key(chunk)) if self.chunk_cache is not None else None
+            if cached is not None:
+                summaries[index] = cached['summary']
+            else:
+                futures[index] = self._get_executor().submit(self._summarize_chunk, chunk)
+        for index, future in futures.items():
+            summaries[index] = future.result(timeout=self.call_timeout)
+            if self.chunk_cache is not None and summaries[index].strip():
+                self.chunk_cache.put(self.chunk_key(chunks[index]), {'summary': summaries[index]})
+        return summaries
+
+    @staticmethod
+    def build_reduce_prompt(user_prompt, chunk_summaries):
+        sections = '\n\n'.join(f"[구간 {index}]\n{summary.strip()}" for index, summary in enumerate(chunk_summaries, 1))
+        return (f"{user_prompt}\n\n"
+                f"스크립트가 길어 {len(chunk_summaries)}개 구간으로 나눠 순서대로 요약했습니다. "
+                f"아래 구간 요약들을 영상 전체의 흐름으로 보고 답해주세요.\n\n"
+                f"--- 구간 요약 시작 ---\n{sections}\n--- 구간 요약 끝 ---")
+
+    def prepare_prompt(self, cleaned_script, user_prompt):
+        # 최종 모델에 보낼 reduce 프롬프트를 돌려줍니다. (map 단계까지 실행)
+        chunks = split_transcript(cleaned_script, self.chunk_tokens, self.token_counter)
+        return self.build_reduce_prompt(user_prompt, self.map_chunks(chunks))
+
+    def summarize(self, cleaned_script, user_prompt, reduce_model):
+        return reduce_model.generate_content(self.prepare_prompt(cleaned_script, user_prompt)).text
@@ -0,0 +1,105 @@
+# app.py: 가짜 Gemini 로 AI 작업 API(요약이 작업 큐를 거치는지, 작업 소유자 확인)와 로그인 사용자 캐시를 고정합니다.
+import contextlib
+import io
+import os
+
+import pytest
+from flask import session as flask_session
+from flask_login import current_user
+
+from benchmarks.fakes import FakeGeminiModel
+
+SUMMARY_REQUEST = {'transcript': '첫 문장입니다. 둘째 문장입니다.', 'prompt': '요약해주세요.', 'model': 'gemini-flash-latest'}
+
+
+@pytest.fixture(scope='module')
+def appmod(tmp_path_factory):
+    # app 모듈은 import 할 때 환경 변수를 읽으므로 먼저 설정합니다. (benchmarks/load_test.py 와 같은 방식)
+    tmp_dir = tmp_path_factory.mktemp('app')
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('DATABASE_URL', f"sqlite:///{tmp_dir / 'app.db'}")
+        patch.setenv('JOB_QUEUE_PATH', str(tmp_dir / 'jobs.db'))
+        patch.setenv('METRICS_DIR', str(tmp_dir / 'metrics'))
+        patch.delenv('GEMINI_API_KEY', raising=False)
+        patch.delenv('VIEW_SAMPLER_ENABLED', raising=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            import app as appmod
+    gemini = FakeGeminiModel()
+    appmod.gemini_pro_model = appmod.gemini_flash_model = appmod.summary_map_reduce.map_model = gemini
+    appmod.generation_config = {'temperature': 0.7}
+    with appmod.app.app_context():
+        appmod.db.create_all()
+    yield appmod
+    appmod.job_queue.stop()
+
+
+def login(appmod, username):
+    client = appmod.app.test_client()
+    response = client.post('/api/register', json={'username': username, 'email': f'{username}@example.com', 'password': 'pw'})
+    assert response.status_code == 200, response.get_json()
+    return client
+
+
+def wait_for_job(client, response):
+    while response.status_code == 202:
+        response = client.get(f"/api/jobs/{response.get_json()['job']['id']}?wait=2")
+    return response.get_json()
+
+
+def test_summary_job_runs_on_the_queue_and_is_cached(appmod):
+    client = login(appmod, 'summary-user')
+    calls = appmod.gemini_flash_model.calls
+    data = wait_for_job(client, client.post('/api/jobs/summary', json=SUMMARY_REQUEST))
+    assert data['job']['status'] == 'done' and data['job']['result']['cached'] is False
+    assert '<strong>요점 1</strong>' in data['job']['result']['summary_html']
+    assert appmod.gemini_flash_model.calls == calls + 1
+
+    again = client.post('/api/get_summary', json=SUMMARY_REQUEST)  # 동기 API 도 작업 큐를 거침 (최근 완료된 같은 작업)
+    assert again.status_code == 200
+    assert again.get_json() == {'success': True, **data['job']['result']}
+
+    other = login(appmod, 'summary-other').post('/api/get_summary', json=SUMMARY_REQUEST)  # 다른 사용자: 새 작업, 요약 캐시 적중
+    assert other.status_code == 200 and other.get_json()['cached'] is True
+    assert appmod.gemini_flash_model.calls == calls + 1
+
+
+def test_jobs_are_visible_only_to_their_owner(appmod):
+    owner, other = login(appmod, 'job-owner'), login(appmod, 'job-other')
+    submitted = owner.post('/api/jobs/summary', json={**SUMMARY_REQUEST, 'prompt': '다른 프롬프트'})
+    job_id = submitted.get_json()['job']['id']
+    assert wait_for_job(owner, submitted)['job']['status'] == 'done'
+    assert other.get(f'/api/jobs/{job_id}').status_code == 404
+
+    # 같은 입력을 다른 사용자가 제출하면 별도 작업이 됩니다. (결과는 요약 캐시에서)
+    shared = other.post('/api/jobs/summary', json={**SUMMARY_REQUEST, 'prompt': '다른 프롬프트'}).get_json()
+    assert shared['job']['id'] != job_id
+
+
+def test_cached_current_user_can_load_relationships(appmod):
+    client = login(appmod, 'cached-user')
+    assert client.post('/api/project/save', json={'projectName': 'p', 'searchParams': {'query': 'q'}, 'searchResults': [{'videoId': 'a'}]}).status_code == 200
+    with client.session_transaction() as session:
+        user_id = int(session['_user_id'])
+    assert user_id in appmod.user_identity_cache  # 로그인 때 읽은 사용자 정보가 캐시됨
+
+    with appmod.app.test_request_context():
+        flask_session['_user_id'] = str(user_id)
+        assert [project.project_name for project in current_user.projects] == ['p']  # DetachedInstanceError 가 나지 않음
+        assert current_user.password_hash  # 캐시에 없는 컬럼도 읽을 수 있음
+
+
+def test_user_updates_invalidate_the_identity_cache(appmod):
+    client = login(appmod, 'renamed-user')
+    with client.session_transaction() as session:
+        user_id = int(session['_user_id'])
+    with appmod.app.app_context():
+        appmod.load_user(user_id)
+        appmod.User.query.filter_by(id=user_id).update({'username': 'renamed-user-2'})  # 객체를 거치지 않는 변경
+        appmod.db.session.commit()
+        assert user_id not in appmod.user_identity_cache
+        assert appmod.load_user(user_id).username == 'renamed-user-2'
+
+        user = appmod.db.session.get(appmod.User, user_id)
+        user.username = 'renamed-user-3'  # ORM 변경
+        appmod.db.session.commit()
+        assert user_id not in appmod.user_identity_cache
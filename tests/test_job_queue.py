@@ -0,0 +1,143 @@
+# job_queue.py: 제출/중복 제거, 사용자별 한도, heartbeat 만료, 정리 동작을 고정합니다.
+# max_workers=0 이면 실행 스레드가 뜨지 않으므로 _claim / run_job 을 직접 호출해 순서를 제어합니다.
+import time
+
+import pytest
+
+from job_queue import DONE, FAILED, QUEUED, RUNNING, JobLimitExceeded, JobQueue
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def factory(**kwargs):
+        queue = JobQueue(str(tmp_path / 'jobs.db'), **{'max_workers': 0, **kwargs})
+        queue.register('echo', lambda payload: {'echo': payload['value']})
+        queue.register('fail', lambda payload: 1 / 0)
+        queues.append(queue)
+        return queue
+
+    yield factory
+    for queue in queues:
+        queue.stop()
+
+
+def set_column(queue, job_id, column, value):
+    queue._connection().execute(f"UPDATE jobs SET {column} = ? WHERE id = ?", (value, job_id))
+
+
+def test_submit_returns_queued_job(make_queue):
+    queue = make_queue()
+    job, created = queue.submit('echo', {'value': 1}, user_id=1)
+    assert created
+    assert job['status'] == QUEUED and job['name'] == 'echo' and job['user_id'] == 1
+    assert queue.get(job['id']) == job
+    with pytest.raises(ValueError):
+        queue.submit('unknown', {})
+
+
+def test_submit_deduplicates_active_and_recent_jobs(make_queue):
+    queue = make_queue(result_ttl=60)
+    first, _ = queue.submit('echo', {'value': 1}, user_id=1, dedup_key='same')
+    again, created = queue.submit('echo', {'value': 1}, user_id=2, dedup_key='same')
+    assert not created and again['id'] == first['id']
+
+    queue.run_job(queue._claim())
+    done, created = queue.submit('echo', {'value': 1}, user_id=1, dedup_key='same')  # 최근 완료된 결과도 재사용
+    assert not created and done['status'] == DONE and done['result'] == {'echo': 1}
+
+    set_column(queue, first['id'], 'finished_at', time.time() - 120)  # result_ttl 이 지나면 새로 만듦
+    fresh, created = queue.submit('echo', {'value': 1}, user_id=1, dedup_key='same')
+    assert created and fresh['id'] != first['id']
+
+
+def test_failed_jobs_are_not_reused(make_queue):
+    queue = make_queue()
+    failed, _ = queue.submit('fail', {}, dedup_key='broken')
+    queue.run_job(queue._claim())
+    assert queue.get(failed['id'])['status'] == FAILED
+    assert 'division by zero' in queue.get(failed['id'])['error']
+    _, created = queue.submit('fail', {}, dedup_key='broken')
+    assert created
+
+
+def test_active_limit_per_user(make_queue):
+    queue = make_queue(max_active_per_user=2)
+    queue.submit('echo', {'value': 1}, user_id=1)
+    queue.submit('echo', {'value': 2}, user_id=1)
+    with pytest.raises(JobLimitExceeded):
+        queue.submit('echo', {'value': 3}, user_id=1)
+    queue.submit('echo', {'value': 4}, user_id=2)  # 다른 사용자는 영향 없음
+
+    queue.run_job(queue._claim())  # 하나가 끝나면 다시 제출 가능
+    queue.submit('echo', {'value': 5}, user_id=1)
+
+
+def test_claim_skips_users_at_running_limit(make_queue):
+    queue = make_queue(max_running_per_user=1)
+    first, _ = queue.submit('echo', {'value': 1}, user_id=1)
+    queue.submit('echo', {'value': 2}, user_id=1)
+    other, _ = queue.submit('echo', {'value': 3}, user_id=2)
+
+    assert queue._claim()['id'] == first['id']
+    assert queue._claim()['id'] == other['id']  # 사용자 1 의 두 번째 작업은 건너뜀
+    assert queue._claim() is None
+
+
+def test_cleanup_requeues_jobs_without_heartbeat(make_queue):
+    queue = make_queue(stale_after=30)
+    stale, _ = queue.submit('echo', {'value': 1})
+    alive, _ = queue.submit('echo', {'value': 2})
+    queue._claim()
+    queue._claim()
+    set_column(queue, stale['id'], 'heartbeat_at', time.time() - 60)
+
+    queue.cleanup()
+    assert queue.get(stale['id'])['status'] == QUEUED
+    assert queue.get(alive['id'])['status'] == RUNNING
+    assert queue._claim()['id'] == stale['id']  # 다른 워커가 다시 가져갈 수 있음
+
+
+def test_cleanup_removes_expired_results(make_queue):
+    queue = make_queue(result_ttl=60)
+    old, _ = queue.submit('echo', {'value': 1})
+    recent, _ = queue.submit('echo', {'value': 2})
+    queue.run_job(queue._claim())
+    queue.run_job(queue._claim())
+    set_column(queue, old['id'], 'finished_at', time.time() - 120)
+
+    assert queue.cleanup() == 1
+    assert queue.get(old['id']) is None
+    assert queue.get(recent['id'])['status'] == DONE
+
+
+def test_worker_threads_run_jobs_and_wait_returns_result(make_queue):
+    queue = make_queue(max_workers=1, poll_interval=0.05)
+    job, _ = queue.submit('echo', {'value': 'hello'})
+    finished = queue.wait(job['id'], timeout=5)
+    assert finished['status'] == DONE and finished['result'] == {'echo': 'hello'}
+    assert queue.wait('missing', timeout=0) is None
+
+
+def test_report_progress_is_visible_while_running(make_queue):
+    queue = make_queue()
+    job, _ = queue.submit('echo', {'value': 1})
+    row = queue._claim()
+    queue._local.job_id = row['id']  # run_job 안에서와 같은 상태
+    queue.report_progress({'step': 1})
+    queue._local.job_id = None
+    assert queue.get(job['id'])['progress'] == {'step': 1}
+    queue.report_progress({'step': 2})  # 작업 밖에서는 무시
+    assert queue.get(job['id'])['progress'] == {'step': 1}
+
+    queue.run_job(row)
+    finished = queue.get(job['id'])
+    assert finished['status'] == DONE and finished['progress'] is None
+
+
+def test_start_runs_jobs_left_by_another_process(make_queue):
+    leftover, _ = make_queue().submit('echo', {'value': 'left'})  # 실행기가 없는 프로세스가 남긴 작업
+    queue = make_queue(max_workers=1, poll_interval=0.05)
+    queue.start()  # 새 제출 없이 앱 시작 때 실행기만 띄움
+    assert queue.wait(leftover['id'], timeout=5)['status'] == DONE
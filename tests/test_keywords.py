@@ -0,0 +1,58 @@
+# keywords.py: 모델 응답이 형식에서 벗어났을 때의 파싱 동작을 고정합니다.
+import json
+
+import pytest
+
+from keywords import KEYWORD_COUNT, build_keyword_prompt, normalize_query, parse_keyword_response
+
+KEYWORDS = [{'original': f'キーワード{index}', 'korean': f'키워드{index}'} for index in range(KEYWORD_COUNT)]
+RESPONSE = json.dumps({'translated_query': '便利グッズ', 'keywords': KEYWORDS}, ensure_ascii=False)
+
+
+def test_parses_plain_json():
+    result = parse_keyword_response(RESPONSE, '꿀템')
+    assert result == {'keywords': KEYWORDS, 'translated_query': '便利グッズ'}
+
+
+@pytest.mark.parametrize('text', [
+    f"```json\n{RESPONSE}\n```",
+    f"Here are the keywords you asked for:\n{RESPONSE}\nLet me know if you need more.",
+    f"설명 {{먼저 나온 괄호}} 와 {{\"note\": 1}} 다음에 {RESPONSE} 끝",  # 앞의 잘못된/키워드 없는 객체는 건너뜀
+])
+def test_finds_json_inside_fences_and_prose(text):
+    assert parse_keyword_response(text, '꿀템')['keywords'] == KEYWORDS
+
+
+def test_accepts_other_list_key_and_plain_strings():
+    result = parse_keyword_response('{"results": ["  주방꿀템 ", "살림꿀템", "주방꿀템", "", 3]}', '꿀템')
+    assert result['keywords'] == [{'original': '주방꿀템', 'korean': '주방꿀템'}, {'original': '살림꿀템', 'korean': '살림꿀템'}]
+    assert result['translated_query'] == '꿀템'  # 번역이 없으면 원래 검색어
+
+
+def test_cleans_duplicates_missing_translation_and_extra_items():
+    items = [{'original': 'Tip', 'korean': '팁'}, {'original': 'tip'}, {'korean': '원문 없음'},
+             {'original': 'Hack', 'korean': None}] + [{'original': f'kw{index}', 'korean': ''} for index in range(20)]
+    result = parse_keyword_response(json.dumps({'translated_query': ' "hacks" ', 'keywords': items}), '꿀팁')
+    assert result['keywords'][:2] == [{'original': 'Tip', 'korean': '팁'}, {'original': 'Hack', 'korean': ''}]
+    assert len(result['keywords']) == KEYWORD_COUNT
+    assert result['translated_query'] == 'hacks'
+
+
+@pytest.mark.parametrize('text', [
+    '', None, '키워드를 만들 수 없습니다.', '{"keywords": []}', '{"keywords": [', '[{"original": "a"}]',
+    '{"translated_query": "x", "keywords": "a, b"}',
+])
+def test_raises_value_error_without_keywords(text):
+    with pytest.raises(ValueError):
+        parse_keyword_response(text, '꿀템')
+
+
+def test_normalize_query_ignores_width_case_and_spaces():
+    assert normalize_query('  ＣＯＵＰＡＮＧ   꿀템 ') == normalize_query('coupang 꿀템') == 'coupang 꿀템'
+
+
+def test_prompt_uses_known_translation():
+    assert '"translated_query" is the query itself' in build_keyword_prompt('꿀템', 'ko')
+    prompt = build_keyword_prompt('꿀템', 'ja', known_translation='便利グッズ')
+    assert 'Its Japanese translation is: "便利グッズ"' in prompt
+    assert 'First translate' in build_keyword_prompt('꿀템', 'en')
@@ -0,0 +1,75 @@
+# metrics.py: 워커별 파일 합산과 종료된 워커 값 보관(합계가 줄지 않음)을 고정합니다.
+import os
+import shutil
+
+import pytest
+
+from metrics import Metrics, archive_file_path, archive_process_file, process_file_path
+
+
+@pytest.fixture
+def metrics(tmp_path):
+    metrics = Metrics(str(tmp_path))
+    metrics.inc('requests_total', route='/a')
+    metrics.observe('request_seconds', 0.2, route='/a')
+    metrics.flush()
+    return metrics
+
+
+def copy_own_file(metrics, pid):
+    shutil.copy(process_file_path(metrics.directory, os.getpid()), process_file_path(metrics.directory, pid))
+
+
+def test_collect_merges_live_worker_files(metrics):
+    copy_own_file(metrics, os.getppid())  # 살아 있는 다른 프로세스의 파일 흉내
+    counters, histograms, _ = metrics.collect()
+    assert counters[('requests_total', (('route', '/a'),))] == 2
+    assert histograms[('request_seconds', (('route', '/a'),))][-1] == 2
+
+
+DEAD_PID = 2 ** 22 + 12345  # pid_max(기본 4194304)보다 큰 값은 존재할 수 없음
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='프로세스 생존 확인은 POSIX 에서만')
+def test_collect_archives_dead_worker_files(metrics):
+    copy_own_file(metrics, DEAD_PID)
+    counters, histograms, _ = metrics.collect()
+    assert counters[('requests_total', (('route', '/a'),))] == 2  # 종료된 워커의 값도 계속 합산
+    assert histograms[('request_seconds', (('route', '/a'),))][-1] == 2
+    assert not os.path.exists(process_file_path(metrics.directory, DEAD_PID))
+    assert os.path.exists(archive_file_path(metrics.directory))
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='프로세스 생존 확인은 POSIX 에서만')
+def test_totals_stay_monotonic_across_worker_restarts(metrics):
+    key = ('requests_total', (('route', '/a'),))
+    totals = [metrics.collect()[0][key]]
+    for restart in range(3):
+        pid = DEAD_PID + restart
+        copy_own_file(metrics, pid)  # 살아 있는 동안의 값
+        totals.append(metrics.collect()[0][key])
+        archive_process_file(metrics.directory, pid)  # child_exit 훅
+        totals.append(metrics.collect()[0][key])
+        metrics.inc('requests_total', route='/a')
+        metrics.flush()
+        totals.append(metrics.collect()[0][key])
+    assert totals == sorted(totals)
+    assert totals[-1] == 4 + (1 + 2 + 3)  # 현재 프로세스 4 + 보관된 워커 3개(각 1, 2, 3)
+
+
+def test_archive_process_file_ignores_missing_file(metrics):
+    assert not archive_process_file(metrics.directory, DEAD_PID)
+    assert not os.path.exists(archive_file_path(metrics.directory))
+
+
+def test_clear_files_removes_archive(metrics):
+    copy_own_file(metrics, DEAD_PID)
+    archive_process_file(metrics.directory, DEAD_PID)
+    assert metrics.clear_files() == 2
+    assert metrics.collect()[0][('requests_total', (('route', '/a'),))] == 1
+
+
+def test_render_includes_inf_bucket(metrics):
+    text = metrics.render()
+    assert 'request_seconds_bucket{route="/a",le="+Inf"} 1' in text
+    assert 'requests_total{route="/a"} 1' in text
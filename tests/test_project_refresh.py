@@ -0,0 +1,66 @@
+# project_refresh.py: 형식이 다른 저장 항목이 있어도 새로고침이 멈추거나 항목을 잃지 않는지 고정합니다.
+from types import SimpleNamespace
+
+import pytest
+
+from json_codec import dumps_bytes
+from project_refresh import ProjectRefresher
+
+
+def video(video_id, **fields):
+    return {'videoId': video_id, 'channelId': 'UC1', 'publishedAt': '2026-01-01T00:00:00Z',
+            'viewCount': 100, 'likeCount': 10, 'subscriberCount': 1000, **fields}
+
+
+def test_load_results_keeps_unknown_items():
+    stored = [video('a'), {'note': '메모'}, 'text', {'videoId': ''}]
+    assert ProjectRefresher.load_results(SimpleNamespace(search_results_json=dumps_bytes(stored).decode())) == stored
+    assert ProjectRefresher.load_results(SimpleNamespace(search_results_json=None)) == []
+    assert ProjectRefresher.load_results(SimpleNamespace(search_results_json='{"items": []}')) is None
+
+
+def test_refreshable_skips_malformed_items_and_fills_missing_counts():
+    no_likes = video('b')
+    del no_likes['likeCount']
+    results = [video('a'), no_likes, video('c', publishedAt=None), {'title': 'videoId 없음'}, video('d', viewCount='많음')]
+    assert [item['videoId'] for item in ProjectRefresher.refreshable(results)] == ['a', 'b']
+    assert no_likes['likeCount'] == 0
+
+
+def test_apply_statistics_records_delta_and_skips_bad_items():
+    refresher = ProjectRefresher(None, None, None, None)
+    results = [video('a'), video('b'), video('gone'), {'videoId': 'c', 'viewCount': 'x'}]
+    video_stats = {'a': {'viewCount': '150', 'likeCount': '12'}, 'b': {'viewCount': '100'}, 'c': {'viewCount': '5'}}
+    delta = refresher.apply_statistics(results, video_stats, {'UC1': {'subscriberCount': '1100'}})
+
+    assert delta['videos'] == {'a': [50, 2]}
+    assert delta['channels'] == {'UC1': 100}
+    assert delta['unavailable'] == ['gone']
+    assert results[0]['viewCount'] == 150 and results[1]['likeCount'] == 10  # 좋아요 수가 없으면 이전 값 유지
+
+
+class FakeQuery:
+    def __init__(self, projects):
+        self.projects = projects
+
+    def filter(self, *conditions):
+        return self
+
+    def all(self):
+        return self.projects
+
+
+def test_refresh_many_refunds_quota_when_the_batch_fails():
+    projects = [SimpleNamespace(id=1, search_results_json=dumps_bytes([video('a'), video('b')]).decode())]
+    session = SimpleNamespace(query=lambda model: FakeQuery(projects), expunge_all=lambda: None)
+    project_model = SimpleNamespace(id=SimpleNamespace(in_=lambda ids: None))
+    refresher = ProjectRefresher(SimpleNamespace(session=session), project_model, None, None)
+
+    def fail(projects, results_by_project=None):
+        raise RuntimeError('YouTube 오류')
+
+    refresher.refresh = fail
+    consumed, refunded = [], []
+    with pytest.raises(RuntimeError):
+        refresher.refresh_many([1], consume_quota=lambda units: consumed.append(units) or True, refund_quota=refunded.append)
+    assert consumed == refunded == [2]  # videos.list 1 + channels.list 1
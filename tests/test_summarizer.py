@@ -0,0 +1,156 @@
+# summarizer.py: 스트리밍 HTML 변환, 스크립트 구간 나누기, map-reduce 요약의 동작을 고정합니다.
+import random
+import threading
+
+import pytest
+
+from summarizer import IncrementalSummaryHtml, MapReduceSummarizer, split_transcript, summary_to_html
+
+
+def stream_html(text, cuts):
+    converter = IncrementalSummaryHtml()
+    html, previous = '', 0
+    for cut in list(cuts) + [len(text)]:
+        html += converter.feed(text[previous:cut])
+        previous = cut
+    html += converter.close()
+    assert converter.html == html
+    return html
+
+
+# ▼▼▼ IncrementalSummaryHtml ▼▼▼
+@pytest.mark.parametrize('text, cuts', [
+    ('**굵게** 보통', [1]),            # '**' 가 조각 사이에서 갈라짐
+    ('앞 **굵게** 뒤', [4, 6]),          # 굵게 구간 안에서 갈라짐
+    ('첫 줄\n둘째 **줄**\n', [3, 4]),   # 줄바꿈이 조각 경계에 있음
+    ('짝이 없는 ** 표시', [5]),         # 닫히지 않은 '**' 는 close() 때 그대로 나감
+    ('별 하나 * 와 ***세 개***', [6, 13, 14]),
+    ('', []),
+])
+def test_incremental_html_matches_full_conversion(text, cuts):
+    assert stream_html(text, cuts) == summary_to_html(text)
+
+
+def test_incremental_html_holds_back_only_unclosed_bold():
+    converter = IncrementalSummaryHtml()
+    assert converter.feed('앞부분 **굵') == '앞부분 '
+    assert converter.feed('게** 끝*') == '<strong>굵게</strong> 끝'  # 끝의 '*' 는 다음 조각을 기다림
+    assert converter.feed('*') == ''
+    assert converter.close() == '**'
+
+
+def test_incremental_html_random_splits():
+    rng = random.Random(7)
+    for _ in range(2000):
+        text = ''.join(rng.choice(['*', '**', 'a', '가', '\n', ' ']) for _ in range(rng.randint(0, 30)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 6))))
+        assert stream_html(text, cuts) == summary_to_html(text), (text, cuts)
+
+
+# ▼▼▼ split_transcript ▼▼▼
+def test_split_transcript_keeps_sentences_and_order():
+    sentences = [f"{index}번째 문장입니다." for index in range(40)]
+    chunks = split_transcript(' '.join(sentences), max_tokens=30)
+    assert len(chunks) > 1
+    assert ' '.join(chunks) == ' '.join(sentences)
+    for chunk in chunks:
+        assert len(chunk) // 2 + 1 <= 30
+        assert chunk.endswith('.')  # 문장 중간에서 자르지 않음
+
+
+def test_split_transcript_short_text_is_one_chunk():
+    assert split_transcript('  짧은 스크립트. 두 문장.  ', max_tokens=100) == ['짧은 스크립트. 두 문장.']
+    assert split_transcript('', max_tokens=100) == []
+
+
+def test_split_transcript_without_punctuation_falls_back_to_words():
+    words = [f"단어{index}" for index in range(200)]
+    chunks = split_transcript(' '.join(words), max_tokens=20)
+    assert ' '.join(chunks).split(' ') == words
+    assert all(len(chunk) // 2 + 1 <= 20 for chunk in chunks)
+
+
+def test_split_transcript_cuts_a_word_longer_than_the_budget():
+    chunks = split_transcript('가' * 100, max_tokens=10, token_counter=len)
+    assert ''.join(chunks) == '가' * 100
+    assert all(len(chunk) <= 10 for chunk in chunks)
+
+
+# ▼▼▼ MapReduceSummarizer ▼▼▼
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    def __init__(self, reply=None):
+        self.prompts = []
+        self.reply = reply
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        if self.reply is not None: return FakeResponse(self.reply)
+        chunk = prompt.split('--- 구간 스크립트 시작 ---\n')[-1].split('\n--- 구간 스크립트 끝 ---')[0]
+        return FakeResponse(f"- 요약: {chunk.split('.')[0]}")
+
+
+class DictCache:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def put(self, key, payload):
+        self.values[key] = payload
+
+
+def make_script(sentences=60):
+    return ' '.join(f"{index}번 구간의 내용입니다." for index in range(sentences))
+
+
+def test_map_reduce_keeps_chunk_order_in_reduce_prompt():
+    model, cache = FakeModel(), DictCache()
+    summarizer = MapReduceSummarizer(model, 'flash', chunk_cache=cache, chunk_tokens=40)
+    script = make_script()
+    chunks = split_transcript(script, 40)
+    prompt = summarizer.prepare_prompt(script, '핵심을 알려주세요.')
+
+    assert summarizer.needs_map_reduce(script)
+    assert len(model.prompts) == len(chunks)
+    assert prompt.startswith('핵심을 알려주세요.')
+    positions = [prompt.index(f"[구간 {index}]\n- 요약: {chunk.split('.')[0]}") for index, chunk in enumerate(chunks, 1)]
+    assert positions == sorted(positions)
+
+
+def test_map_reduce_reuses_cached_chunk_summaries():
+    model, cache = FakeModel(), DictCache()
+    summarizer = MapReduceSummarizer(model, 'flash', chunk_cache=cache, chunk_tokens=40)
+    script = make_script()
+    first = summarizer.prepare_prompt(script, '프롬프트 A')
+    calls = len(model.prompts)
+
+    second = summarizer.prepare_prompt(script, '프롬프트 B')  # 프롬프트만 바뀌면 map 단계는 캐시에서
+    assert len(model.prompts) == calls
+    assert second.replace('프롬프트 B', '프롬프트 A') == first
+
+    other_model = MapReduceSummarizer(model, 'pro', chunk_cache=cache, chunk_tokens=40)
+    other_model.prepare_prompt(script, '프롬프트 A')  # 모델 이름이 다르면 캐시 키도 다름
+    assert len(model.prompts) == calls * 2
+
+
+def test_map_reduce_does_not_cache_empty_summaries():
+    model, cache = FakeModel(reply='  '), DictCache()
+    summarizer = MapReduceSummarizer(model, 'flash', chunk_cache=cache, chunk_tokens=40)
+    summarizer.prepare_prompt(make_script(), '프롬프트')
+    assert cache.values == {}
+
+
+def test_summarize_sends_reduce_prompt_to_reduce_model():
+    reduce_model = FakeModel(reply='최종 요약')
+    summarizer = MapReduceSummarizer(FakeModel(), 'flash', chunk_tokens=40)
+    assert summarizer.summarize(make_script(), '프롬프트', reduce_model) == '최종 요약'
+    assert reduce_model.prompts[0].startswith('프롬프트')
+    assert not summarizer.needs_map_reduce('짧은 스크립트.')
@@ -0,0 +1,131 @@
+# view_sampler.py: 실제 수집 주기(interval + 루프 대기)로 찍힌 표본의 구간 속도 계산과 쿼터 버킷 차감을 고정합니다.
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+
+import view_sampler as view_sampler_module
+from quota import QuotaScheduler
+from view_sampler import ViewSampler
+
+VIEWS_PER_HOUR = 600
+
+
+class FakeRequest:
+    def __init__(self, video_ids):
+        self.video_ids = video_ids
+
+
+class FakeClients:
+    """videos().list(part='statistics') 에 시각에 비례하는 조회수를 돌려줍니다."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = 0
+
+    def get_service(self):
+        return self
+
+    def videos(self):
+        return self
+
+    def list(self, part, id):
+        return FakeRequest(id.split(','))
+
+    def execute(self, request):
+        self.calls += 1
+        if self.clock.fail: raise RuntimeError('YouTube 오류')
+        hours = (self.clock.now - self.clock.started).total_seconds() / 3600
+        return {'items': [{'id': video_id, 'statistics': {'viewCount': str(int(1000 + hours * VIEWS_PER_HOUR))}}
+                          for video_id in request.video_ids]}
+
+
+class Clock:
+    def __init__(self):
+        self.started = self.now = datetime(2026, 1, 1)
+        self.fail = False
+
+
+class FakeLedger:
+    def used_today(self, user_id=None):
+        return 0
+
+
+@pytest.fixture
+def sampler(monkeypatch):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db = SQLAlchemy(app)
+
+    class VideoViewStats(db.Model):
+        id = db.Column(db.Integer, primary_key=True)
+        video_id = db.Column(db.String(20), nullable=False)
+        timestamp = db.Column(db.DateTime, nullable=False)
+        view_count = db.Column(db.BigInteger)
+
+    class TrackedVideo(db.Model):
+        video_id = db.Column(db.String(20), primary_key=True)
+        source = db.Column(db.String(10), nullable=False)
+        first_seen_at = db.Column(db.DateTime, nullable=False)
+        last_seen_at = db.Column(db.DateTime, nullable=False)
+        last_sampled_at = db.Column(db.DateTime, nullable=True)
+
+    clock = Clock()
+    monkeypatch.setattr(view_sampler_module, '_utcnow', lambda: clock.now)
+    with app.app_context():
+        db.create_all()
+        sampler = ViewSampler(app, db, VideoViewStats, TrackedVideo, FakeClients(clock), interval_seconds=1800)
+        sampler.clock = clock
+        sampler.track(['v1'], source='project')
+        db.session.commit()
+        yield sampler
+
+
+def run_loop(sampler, hours, on_tick=None):
+    # run_forever 와 같은 주기: sample_once 후 loop_wait_seconds 만큼 대기
+    ticks = int(hours * 3600 / sampler.loop_wait_seconds())
+    for _ in range(ticks):
+        sampler.sample_once()
+        sampler.clock.now += timedelta(seconds=sampler.loop_wait_seconds())
+        if on_tick: on_tick()
+
+
+def test_views1h_is_filled_at_the_default_sampling_cadence(sampler):
+    run_loop(sampler, 2)
+    seen = []
+    run_loop(sampler, 3, on_tick=lambda: seen.append(sampler.velocity(['v1'])['v1']))
+    assert all(item['views1h'] is not None for item in seen)
+    assert all(abs(item['views1h'] - VIEWS_PER_HOUR) <= 2 for item in seen)
+
+
+def test_long_windows_still_require_coverage(sampler):
+    run_loop(sampler, 6)
+    velocity = sampler.velocity(['v1'])['v1']
+    assert velocity['views1h'] is not None
+    assert velocity['views24h'] is None and velocity['views7d'] is None and velocity['acceleration'] is None
+
+    run_loop(sampler, 20)
+    velocity = sampler.velocity(['v1'])['v1']
+    assert abs(velocity['views24h'] - 24 * VIEWS_PER_HOUR) <= 24
+    assert abs(velocity['acceleration']) <= 2  # 일정한 속도면 가속 없음
+
+
+def test_single_sample_has_no_velocity(sampler):
+    sampler.sample_once()
+    assert sampler.velocity(['v1'])['v1'] == {'views1h': None, 'views24h': None, 'views7d': None, 'acceleration': None}
+
+
+def test_sampling_consumes_and_refunds_the_quota_bucket(sampler):
+    sampler.quota_scheduler = QuotaScheduler(FakeLedger(), daily_budget=10000)
+    bucket = sampler.quota_scheduler.global_bucket
+    bucket.refill_per_second = 0
+    before = bucket.available()
+    sampler.sample_once()
+    assert bucket.available() == before - 1  # videos.list 1회
+
+    sampler.clock.now += timedelta(hours=1)
+    sampler.clock.fail = True
+    with pytest.raises(RuntimeError):
+        sampler.sample_once()
+    assert bucket.available() == before - 1  # 실패한 호출은 돌려줌
@@ -0,0 +1,268 @@
+# ===================================================================
+#     view_sampler.py (VideoViewStats 에 조회수 표본을 주기적으로 기록)
+# ===================================================================
+# 검색 결과와 저장된 프로젝트에 등장한 영상을 TrackedVideo 에 등록해 두고,
+# 주기적으로 videos.list(part=statistics) 를 50개씩 묶어 호출해 조회수 표본을
+# VideoViewStats 에 벌크 insert 합니다. (ORM 객체를 행마다 만들지 않음)
+#
+# 보존 정책 (표가 끝없이 커지지 않도록):
+#   - 최근 RAW_WINDOW 이내: 원본 표본 그대로
+#   - RAW_WINDOW ~ HOURLY_WINDOW: 영상별 1시간에 1개만 남김
+#   - HOURLY_WINDOW ~ RETENTION: 영상별 하루에 1개만 남김
+#   - RETENTION 이후: 삭제
+import os
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import and_, case, func, insert, select, update, delete
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from cache_store import chunked
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+RAW_WINDOW = timedelta(hours=48)
+HOURLY_WINDOW = timedelta(days=14)
+RETENTION = timedelta(days=90)
+SEARCH_TRACKING_WINDOW = timedelta(days=7)  # 검색으로만 본 영상은 마지막 등장 후 7일간 추적
+VELOCITY_WINDOWS = (('1h', timedelta(hours=1)), ('24h', timedelta(hours=24)), ('7d', timedelta(days=7)))
+MIN_WINDOW_COVERAGE = 0.8  # 표본이 구간의 80% 이상을 덮어야 해당 구간 속도를 계산 (짧은 구간을 크게 부풀려 추정하지 않도록)
+DEFAULT_SAMPLE_INTERVAL = timedelta(minutes=30)
+
+
+def _utcnow():
+    # DB 에는 기존 모델들과 같이 UTC 기준 naive datetime 으로 비교합니다.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def window_min_span(window, sample_interval):
+    # 구간 속도를 계산하는 데 필요한 최소 표본 범위. 표본은 sample_interval(+ 수집 루프 지연)마다 찍히므로
+    # 1시간 구간에서 48분(80%) 이상 떨어진 두 표본은 보장되지 않습니다. 그런 구간은 "구간 길이 - 한 주기"
+    # (1h, 30분 주기 -> 30분: 연속한 두 표본이면 충분)로 낮추고, 긴 구간(24h/7d)은 80% 기준을 그대로 씁니다.
+    return min(window * MIN_WINDOW_COVERAGE, max(window - sample_interval, sample_interval))
+
+
+# ▼▼▼ 최근 구간별 조회수 증가량 (결과 페이지 전체를 GROUP BY 쿼리 한 번으로 계산) ▼▼▼
+def query_velocity(db, stats_model, video_ids, now=None, sample_interval=DEFAULT_SAMPLE_INTERVAL):
+    """{video_id: {'views1h', 'views24h', 'views7d', 'acceleration'}} 를 돌려줍니다.
+
+    각 구간의 증가량은 기준 표본과 마지막 표본(가장 최근 시각의 표본)의 조회수 차이를 구간 길이로 환산한 값입니다.
+    기준 표본은 구간 시작 직전의 표본(시작 전 두 주기 이내)이고, 없으면 구간 안의 첫 표본입니다.
+    두 표본 사이가 window_min_span 보다 짧은 구간은 추정하지 않고 None 입니다.
+    acceleration 은 (최근 1시간 시간당 증가량 - 최근 24시간 시간당 증가량).
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    if not video_ids: return {}
+    now = now or _utcnow()
+    stats = stats_model
+    velocity = {}
+    for batch in chunked(video_ids, 500):
+        # 1) 영상별 마지막 표본 시각과 구간별 기준 표본 시각
+        bounds = [func.max(stats.timestamp).label('latest_at')]
+        for label, window in VELOCITY_WINDOWS:
+            start = now - window
+            before = func.max(case((and_(stats.timestamp < start, stats.timestamp >= start - 2 * sample_interval), stats.timestamp)))
+            inside = func.min(case((stats.timestamp >= start, stats.timestamp)))
+            bounds.append(func.coalesce(before, inside).label(f'first_{label}'))
+        bounds = (select(stats.video_id, *bounds)
+                  .where(stats.video_id.in_(batch), stats.timestamp >= now - VELOCITY_WINDOWS[-1][1] - 2 * sample_interval)
+                  .group_by(stats.video_id).subquery())
+        # 2) 그 시각의 조회수 (조회수의 MAX/MIN 이 아니라 해당 시각 표본의 값; 조회수는 줄어들 수도 있음)
+        time_columns = [bounds.c.latest_at] + [bounds.c[f'first_{label}'] for label, _ in VELOCITY_WINDOWS]
+        samples = [aliased(stats) for _ in time_columns]
+        query = select(bounds.c.video_id, *time_columns, *[func.max(sample.view_count) for sample in samples]).select_from(bounds)
+        for sample, column in zip(samples, time_columns):
+            query = query.outerjoin(sample, and_(sample.video_id == bounds.c.video_id, sample.timestamp == column))
+        rows = db.session.execute(query.group_by(bounds.c.video_id, *time_columns))
+
+        for row in rows:
+            video_id, times, views = row[0], row[1:1 + len(time_columns)], row[1 + len(time_columns):]
+            latest_at, latest_views = times[0], views[0]
+            metrics, hourly_rates = {}, {}
+            for index, (label, window) in enumerate(VELOCITY_WINDOWS):
+                first_at, first_views = times[1 + index], views[1 + index]
+                span_hours = (latest_at - first_at).total_seconds() / 3600 if first_at else 0
+                window_hours = window.total_seconds() / 3600
+                min_span_hours = window_min_span(window, sample_interval).total_seconds() / 3600
+                if span_hours <= 0 or span_hours < min_span_hours or None in (latest_views, first_views):
+                    metrics[f'views{label}'] = None
+                    continue
+                hourly_rates[label] = max(latest_views - first_views, 0) / span_hours
+                metrics[f'views{label}'] = round(hourly_rates[label] * window_hours)
+            metrics['acceleration'] = round(hourly_rates['1h'] - hourly_rates['24h']) if {'1h', '24h'} <= hourly_rates.keys() else None
+            velocity[video_id] = metrics
+    return velocity
+
+
+class ViewSampler:
+    def __init__(self, app, db, stats_model, tracked_model, youtube_clients, quota_scheduler=None,
+                 interval_seconds=1800, max_batches_per_run=40):
+        self.app = app
+        self.db = db
+        self.stats_model = stats_model
+        self.tracked_model = tracked_model
+        self.youtube_clients = youtube_clients
+        self.quota_scheduler = quota_scheduler
+        self.interval_seconds = interval_seconds
+        self.max_batches_per_run = max_batches_per_run
+        self._thread = None
+        self._stop = threading.Event()
+
+    def velocity(self, video_ids, now=None):
+        # 구간별 최소 범위를 실제 수집 주기에 맞춰 계산합니다.
+        return query_velocity(self.db, self.stats_model, video_ids, now=now,
+                              sample_interval=timedelta(seconds=self.interval_seconds))
+
+    def _upsert(self):
+        return sqlite_insert if self.db.engine.dialect.name == 'sqlite' else pg_insert
+
+    # ▼▼▼ 추적 대상 등록 (commit 은 호출한 쪽에서) ▼▼▼
+    def track(self, video_ids, source='search'):
+        video_ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+        if not video_ids: return
+        now = _utcnow()
+        table = self.tracked_model.__table__
+        # 검색 결과는 방금 받아온 조회수가 이미 표본으로 기록되므로 다음 주기부터 수집합니다.
+        last_sampled_at = now if source == 'search' else None
+        rows = [{'video_id': video_id, 'source': source, 'first_seen_at': now, 'last_seen_at': now, 'last_sampled_at': last_sampled_at}
+                for video_id in video_ids]
+        stmt = self._upsert()(table)
+        set_ = {'last_seen_at': stmt.excluded.last_seen_at}
+        if source == 'project':  # 프로젝트에 저장된 영상은 검색 추적 기간과 관계없이 계속 추적
+            set_['source'] = stmt.excluded.source
+        for batch in chunked(rows, 500):
+            self.db.session.execute(stmt.on_conflict_do_update(index_elements=['video_id'], set_=set_), batch)
+
+    def record_samples(self, view_counts, sampled_at=None):
+        # {video_id: view_count} 를 VideoViewStats 에 한 번에 기록합니다. (commit 은 호출한 쪽에서)
+        if not view_counts: return
+        sampled_at = sampled_at or _utcnow()
+        rows = [{'video_id': video_id, 'timestamp': sampled_at, 'view_count': int(view_count)}
+                for video_id, view_count in view_counts.items()]
+        self.db.session.execute(insert(self.stats_model.__table__), rows)
+        self.db.session.execute(
+            update(self.tracked_model.__table__)
+            .where(self.tracked_model.video_id.in_(list(view_counts)))
+            .values(last_sampled_at=sampled_at))
+
+    # ▼▼▼ 표본 수집 1회 ▼▼▼
+    def due_video_ids(self, limit):
+        now = _utcnow()
+        tracked = self.tracked_model
+        due_before = now - timedelta(seconds=self.interval_seconds)
+        query = select(tracked.video_id).where(
+            ((tracked.source == 'project') | (tracked.last_seen_at >= now - SEARCH_TRACKING_WINDOW)),
+            ((tracked.last_sampled_at.is_(None)) | (tracked.last_sampled_at < due_before)),
+        ).order_by(tracked.last_sampled_at.is_(None).desc(), tracked.last_sampled_at).limit(limit)
+        return [row[0] for row in self.db.session.execute(query)]
+
+    def sample_once(self):
+        video_ids = self.due_video_ids(self.max_batches_per_run * 50)
+        youtube = self.youtube_clients.get_service()
+        sampled = 0
+        for batch in chunked(video_ids):
+            # videos.list 1회(1 단위)를 전역 토큰 버킷에서도 차감합니다. (실제 사용량은 on_call 훅이 장부에 기록)
+            if self.quota_scheduler is not None and not self.quota_scheduler.try_consume(None, 1):
+                print("⚠️ [ViewSampler] 쿼터가 부족하여 이번 표본 수집을 중단합니다.")
+                break
+            try:
+                response = self.youtube_clients.execute(youtube.videos().list(part='statistics', id=','.join(batch)))
+            except Exception:
+                if self.quota_scheduler is not None: self.quota_scheduler.refund(None, 1)
+                raise
+            view_counts = {item['id']: item.get('statistics', {}).get('viewCount', 0) for item in response.get('items', [])}
+            self.record_samples(view_counts)
+            # 삭제/비공개된 영상은 다시 조회하지 않도록 표본 시각만 갱신합니다.
+            missing = set(batch) - set(view_counts)
+            if missing:
+                self.db.session.execute(update(self.tracked_model.__table__)
+                                        .where(self.tracked_model.video_id.in_(list(missing)))
+                                        .values(last_sampled_at=_utcnow()))
+            self.db.session.commit()
+            sampled += len(view_counts)
+        return sampled
+
+    # ▼▼▼ 보존/다운샘플링 ▼▼▼
+    def _bucket(self, column, unit):
+        if self.db.engine.dialect.name == 'sqlite':
+            return func.strftime('%Y-%m-%d %H' if unit == 'hour' else '%Y-%m-%d', column)
+        return func.date_trunc(unit, column)
+
+    def _downsample(self, start, end, unit):
+        stats = self.stats_model
+        keep_ids = select(func.max(stats.id)).where(stats.timestamp >= start, stats.timestamp < end) \
+            .group_by(stats.video_id, self._bucket(stats.timestamp, unit))
+        result = self.db.session.execute(
+            delete(stats.__table__).where(stats.timestamp >= start, stats.timestamp < end, stats.id.not_in(keep_ids)))
+        return result.rowcount or 0
+
+    def compact(self):
+        now = _utcnow()
+        stats, tracked = self.stats_model, self.tracked_model
+        removed = self.db.session.execute(delete(stats.__table__).where(stats.timestamp < now - RETENTION)).rowcount or 0
+        removed += self._downsample(now - HOURLY_WINDOW, now - RAW_WINDOW, 'hour')
+        removed += self._downsample(now - RETENTION, now - HOURLY_WINDOW, 'day')
+        # 오랫동안 검색에 나오지 않은 영상은 추적 목록에서도 뺍니다.
+        self.db.session.execute(delete(tracked.__table__).where(
+            tracked.source == 'search', tracked.last_seen_at < now - RETENTION))
+        self.db.session.commit()
+        return removed
+
+    # ▼▼▼ 백그라운드 실행 (gunicorn 워커 중 파일 잠금을 얻은 하나만 실제로 수집) ▼▼▼
+    def _acquire_leader_lock(self, lock_dir):
+        if fcntl is None: return True
+        os.makedirs(lock_dir, exist_ok=True)
+        self._lock_file = open(os.path.join(lock_dir, 'view-sampler.lock'), 'a+')
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            self._lock_file.close()
+            return False
+
+    def run_forever(self, lock_dir=None):
+        while not self._stop.is_set():
+            if lock_dir is None or self._acquire_leader_lock(lock_dir):
+                break
+            self._stop.wait(60)  # 다른 워커가 수집 중이면 주기적으로 다시 시도
+        last_compact = None
+        while not self._stop.is_set():
+            started = time.monotonic()
+            with self.app.app_context():
+                try:
+                    sampled = self.sample_once()
+                    if last_compact is None or started - last_compact > 6 * 3600:
+                        removed = self.compact()
+                        last_compact = started
+                        print(f"✅ [ViewSampler] 오래된 표본 {removed}개 정리")
+                    if sampled: print(f"✅ [ViewSampler] 조회수 표본 {sampled}개 기록")
+                except Exception as e:
+                    self.db.session.rollback()
+                    print(f"❌ [ViewSampler] Error: {e}")
+                finally:
+                    self.db.session.remove()
+            self._stop.wait(self.loop_wait_seconds())
+
+    def loop_wait_seconds(self):
+        return max(60, self.interval_seconds / 6)
+
+    def start_background(self, lock_dir=None):
+        if self._thread is not None: return
+        self._thread = threading.Thread(target=self.run_forever, args=(lock_dir,), name='view-sampler', daemon=True)
+        self._thread.start()
+
+    def reset(self):
+        # fork 된 자식 프로세스용: 부모의 수집 스레드는 자식에 없으므로 다시 시작할 수 있게 상태를 비웁니다.
+        lock_file, self._lock_file = getattr(self, '_lock_file', None), None
+        if lock_file is not None: lock_file.close()  # 자식의 복사본만 닫음 (부모의 잠금은 유지)
+        self._thread = None
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
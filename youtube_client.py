@@ -0,0 +1,163 @@
+# ===================================================================
+#                youtube_client.py (YouTube API 클라이언트 재사용)
+# ===================================================================
+# build('youtube', 'v3') 는 호출될 때마다 370KB 짜리 discovery 문서를 다시
+# 읽고 파싱한 뒤, 새 httplib2 커넥션을 만듭니다. 이 모듈은 서비스 객체를
+# 프로세스당 한 번만 만들고, HTTP 전송 계층은 스레드마다 하나씩(keep-alive)
+# 재사용하도록 관리합니다. (httplib2.Http 는 스레드 안전하지 않음)
+# googleapiclient.discovery / httplib2 는 서비스 객체를 처음 만들 때 import 합니다. (워커 기동 시간 단축)
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def default_http_factory():
+    from googleapiclient.http import build_http
+    return build_http()
+
+
+class ThreadLocalHttp:
+    """httplib2.Http 처럼 동작하지만, 실제 요청은 스레드별 Http 인스턴스로 보냅니다."""
+
+    def __init__(self, http_factory=default_http_factory):
+        self._http_factory = http_factory
+        self._local = threading.local()
+
+    def _get(self):
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._http_factory()
+            self._local.http = http
+        return http
+
+    def request(self, *args, **kwargs):
+        return self._get().request(*args, **kwargs)
+
+    def forget_connections(self):
+        # fork 된 자식용: 부모가 만든 스레드별 커넥션을 닫지 않고 버립니다. (소켓은 부모가 계속 사용)
+        self._local = threading.local()
+
+    def close(self):
+        # 현재 스레드의 커넥션만 닫습니다. 다음 요청 시 새로 만들어집니다.
+        http = getattr(self._local, 'http', None)
+        if http is not None:
+            http.close()
+            self._local.http = None
+
+    def __getattr__(self, name):
+        # redirect_codes, timeout 등 나머지 속성은 현재 스레드의 Http 로 위임
+        return getattr(self._get(), name)
+
+
+class YouTubeClientManager:
+    """프로세스 전역 YouTube Data API 서비스 객체를 지연 생성하여 공유합니다."""
+
+    def __init__(self, api_key, service_name='youtube', version='v3', http_factory=default_http_factory, discovery_doc=None,
+                 max_workers=8, call_timeout=15, on_call=None, on_timing=None):
+        self.api_key = api_key
+        self.service_name = service_name
+        self.version = version
+        self.max_workers = max_workers
+        self.call_timeout = call_timeout
+        self.on_call = on_call  # 호출 직전에 methodId('youtube.search.list')로 불리는 훅 (쿼터 기록용)
+        self.on_timing = on_timing  # 호출이 끝나면 (methodId, 걸린 초)로 불리는 훅 (요청 스레드에서, 지표 기록용)
+        self._http_factory = http_factory
+        self._discovery_doc = discovery_doc
+        self._service = None
+        self._http = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _load_discovery_doc(self):
+        # 라이브러리에 포함된 정적 discovery 문서를 한 번만 읽어 둡니다.
+        if self._discovery_doc is None:
+            from googleapiclient.discovery_cache import get_static_doc
+            doc = get_static_doc(self.service_name, self.version)
+            if doc is None:
+                raise RuntimeError(f"{self.service_name} {self.version} discovery 문서를 찾을 수 없습니다.")
+            self._discovery_doc = json.loads(doc)
+        return self._discovery_doc
+
+    def get_service(self):
+        if self._service is None:
+            with self._lock:
+                if self._service is None:
+                    from googleapiclient.discovery import build_from_document
+                    self._http = ThreadLocalHttp(self._http_factory)
+                    self._service = build_from_document(
+                        self._load_discovery_doc(),
+                        http=self._http,
+                        developerKey=self.api_key,
+                    )
+        return self._service
+
+    # ▼▼▼ [신규] 서로 의존하지 않는 API 호출을 동시에 실행하기 위한 스레드 풀 ▼▼▼
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='youtube-api')
+        return self._executor
+
+    @staticmethod
+    def _method_id(api_request):
+        return getattr(api_request, 'methodId', None) or 'unknown'
+
+    def _notify(self, api_request):
+        if self.on_call is not None:
+            self.on_call(self._method_id(api_request))
+
+    def _report_timing(self, timing):
+        if self.on_timing is not None and timing[1] is not None:
+            self.on_timing(*timing)
+
+    def execute(self, api_request):
+        # 현재 스레드에서 바로 실행합니다. (on_call 훅을 거치기 위해 .execute() 대신 사용)
+        self._notify(api_request)
+        start = time.perf_counter()
+        try:
+            return api_request.execute()
+        finally:
+            self._report_timing((self._method_id(api_request), time.perf_counter() - start))
+
+    def submit(self, api_request):
+        # googleapiclient 요청 객체(HttpRequest)를 풀에서 실행하고 Future 를 돌려줍니다.
+        # on_call 훅은 요청 스레드에서 호출되므로 current_user 등을 그대로 쓸 수 있습니다.
+        self._notify(api_request)
+        timing = [self._method_id(api_request), None]  # 풀 스레드가 실제 호출 시간을 채우고, result() 에서 보고
+
+        def run():
+            start = time.perf_counter()
+            try:
+                return api_request.execute()
+            finally:
+                timing[1] = time.perf_counter() - start
+
+        future = self._get_executor().submit(run)
+        future.timing = timing
+        return future
+
+    def result(self, future, timeout=None):
+        # 호출별 타임아웃. 초과 시 concurrent.futures.TimeoutError 가 발생합니다.
+        try:
+            return future.result(timeout=self.call_timeout if timeout is None else timeout)
+        finally:
+            timing = getattr(future, 'timing', None)
+            if timing is not None: self._report_timing(timing)
+
+    def reset(self):
+        # API 키나 전송 계층(http_factory)을 바꿨을 때 서비스 객체까지 새로 만들도록 합니다.
+        with self._lock:
+            self._service = None
+            self._http = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def after_fork(self):
+        # fork 된 자식용: 부모(gunicorn master)가 만들어 둔 서비스 객체(파싱한 discovery 문서)는 그대로 쓰고,
+        # 스레드별 HTTP 커넥션과 스레드 풀, 잠금만 새로 만듭니다. (부모의 풀 스레드는 자식에 없음)
+        self._lock = threading.Lock()
+        self._executor = None
+        if self._http is not None: self._http.forget_connections()